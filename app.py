@@ -1,4 +1,4 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, session, send_from_directory
+from flask import Flask, render_template, request, redirect, url_for, flash, session, send_from_directory, jsonify
 from flask_wtf.csrf import CSRFProtect
 from datetime import datetime
 import os
@@ -11,9 +11,12 @@ from services.course_service import CourseService
 from services.validation_service import ValidationError
 from services.course_status_service import CourseStatusService
 from services.auth_service import AuthService
+from scripts.storage_layout import locate_artifact, static_artifact_path
+from scripts.pdf_jobs import pdf_filename, PENDING as PDF_PENDING, FAILED as PDF_FAILED
+from models.course import Course, Unit, format_value, html_date
 
 # Importar formulários
-from forms import LoginForm, CourseForm, CourseStatusForm, DeleteCourseForm
+from forms import LoginForm, CourseForm, CourseStatusForm, BulkCourseStatusForm, DeleteCourseForm
 
 # Configurar aplicação Flask
 app = Flask(__name__)
@@ -79,6 +82,11 @@ auth_service = AuthService()
 app.template_folder = 'templates'
 app.static_folder = 'static'
 
+@app.template_global()
+def artifact_url(kind, filename):
+    """URL de uma capa ('cover') ou logo de parceiro ('logo') no layout em shards"""
+    return url_for('static', filename=static_artifact_path(kind, filename))
+
 
 
 # Simulação de banco de dados para cursos
@@ -233,17 +241,19 @@ def course_success(course_id):
             flash('Curso não encontrado', 'error')
             return redirect(url_for('index'))
         
-        # Obter arquivos gerados
-        csv_file = course.get('csv_file')
-        pdf_file = course.get('pdf_file')
+        # Obter arquivos gerados (o PDF pode ainda estar em geração)
+        csv_file = course.get('csv_file') or course.get('source_file')
+        pdf_file = pdf_filename(course)
+        pdf_status = course_service.get_pdf_status(course)
         
         logger.info(f"✅ Renderizando página de sucesso para: {course.get('titulo', 'Curso sem título')}")
-        logger.info(f"📄 Arquivos: CSV={csv_file}, PDF={pdf_file}")
+        logger.info(f"📄 Arquivos: CSV={csv_file}, PDF={pdf_file} ({pdf_status})")
         
         return render_template('course_success.html', 
                                course=course, 
                                csv_file=csv_file, 
-                               pdf_file=pdf_file)
+                               pdf_file=pdf_file,
+                               pdf_status=pdf_status)
     except Exception as e:
         logger.error(f"Erro ao buscar curso {course_id}: {str(e)}")
         flash('Erro ao carregar curso', 'error')
@@ -257,15 +267,60 @@ def public_courses():
         if 'pythonanywhere' in request.host:
             logger.info("Acessando lista pública de cursos via PythonAnywhere")
         
-        # Usar o serviço para listar cursos
-        courses = course_service.list_courses()
+        # Usar o serviço para listar apenas a página pedida
+        # Cursos com inscrições encerradas ficam ocultos, a menos que sejam pedidos
+        filters = _list_filters(default_period='vigentes')
+        pagination = course_service.list_courses_page(page=request.args.get('page', 1, type=int),
+                                                      sort=request.args.get('sort', 'recent'), filters=filters)
         
-        return render_template('course_list_public.html', courses=courses)
+        return render_template('course_list_public.html', 
+                             courses=pagination['courses'], 
+                             pagination=pagination,
+                             filters=filters,
+                             filter_options=course_service.get_filter_options())
     except Exception as e:
         logger.error(f"Erro ao listar cursos públicos: {str(e)}")
         flash('Erro ao carregar lista de cursos', 'error')
         return redirect(url_for('index'))
 
+def _list_filters(include_status=False, default_period=''):
+    """Lê os filtros das listas de cursos da query string"""
+    filters = {'search': request.args.get('q', '').strip()}
+    for field in ('orgao', 'tema', 'modalidade', 'tipo_acao', 'bairro'):
+        filters[field] = request.args.get(field, '').strip()
+    # Período de inscrição ou de aulas (ver services.course_service.PERIODS); 'todos' desliga o padrão
+    filters['periodo'] = request.args.get('periodo', '').strip() or default_period
+    if include_status:
+        # Status de inserção (área administrativa): 'sim' ou 'nao' (vazio = todos)
+        filters['inserted'] = {'sim': True, 'nao': False}.get(request.args.get('inserted', ''))
+    return filters
+
+def _render_admin_course_list():
+    """Renderiza uma página da lista administrativa de cursos"""
+    filters = _list_filters(include_status=True)
+    pagination = course_service.list_courses_page(page=request.args.get('page', 1, type=int),
+                                                  sort=request.args.get('sort', 'recent'), filters=filters)
+    
+    # Obter status dos cursos inseridos
+    inserted_courses = course_status_service.get_inserted_courses()
+    
+    # Adicionar status apenas aos cursos da página
+    courses = pagination['courses']
+    for course in courses:
+        # Converter ID do curso para int para comparação correta
+        course_id = course.get('id')
+        if isinstance(course_id, str) and course_id.isdigit():
+            course_id = int(course_id)
+        course['is_inserted'] = course_id in inserted_courses
+    
+    return render_template('course_list.html', 
+                         courses=courses, 
+                         inserted_courses=inserted_courses,
+                         pagination=pagination,
+                         filters=filters,
+                         filter_options=course_service.get_filter_options(),
+                         stats=course_service.get_course_facets(inserted_courses))
+
 # -----------------------------
 # Decorator de autenticação
 # -----------------------------
@@ -290,21 +345,7 @@ def list_courses():
         if 'pythonanywhere' in request.host:
             logger.info("Acessando lista de cursos via PythonAnywhere")
         
-        # Usar o serviço para listar cursos
-        courses = course_service.list_courses()
-        
-        # Obter status dos cursos inseridos
-        inserted_courses = course_status_service.get_inserted_courses()
-        
-        # Adicionar status aos cursos
-        for course in courses:
-            # Converter ID do curso para int para comparação correta
-            course_id = course.get('id')
-            if isinstance(course_id, str) and course_id.isdigit():
-                course_id = int(course_id)
-            course['is_inserted'] = course_id in inserted_courses
-        
-        return render_template('course_list.html', courses=courses, inserted_courses=inserted_courses)
+        return _render_admin_course_list()
     except Exception as e:
         logger.error(f"Erro ao listar cursos: {str(e)}")
         flash('Erro ao carregar lista de cursos', 'error')
@@ -349,7 +390,7 @@ def duplicate_course(course_id):
                     duplicate_data = original_course_data.copy()
                     
                     # Limpar campos que não devem ser copiados
-                    fields_to_clear = ['id', 'created_at', 'csv_file', 'pdf_file', 'capa_curso']
+                    fields_to_clear = ['id', 'created_at', 'created_at_iso', 'csv_file', 'pdf_file', 'capa_curso']
                     for field in fields_to_clear:
                         duplicate_data[field] = ''
                     
@@ -394,7 +435,7 @@ def duplicate_course(course_id):
         
         # Limpar campos que não devem ser copiados na duplicação
         fields_to_clear = [
-            'id', 'created_at', 'csv_file', 'pdf_file', 'capa_curso'
+            'id', 'created_at', 'created_at_iso', 'csv_file', 'pdf_file', 'capa_curso'
         ]
         
         for field in fields_to_clear:
@@ -461,21 +502,7 @@ def admin_logout():
 def admin_dashboard():
     """Dashboard administrativo"""
     try:
-        # Usar o serviço para listar cursos
-        courses = course_service.list_courses()
-        
-        # Obter status dos cursos inseridos
-        inserted_courses = course_status_service.get_inserted_courses()
-        
-        # Adicionar status aos cursos
-        for course in courses:
-            # Converter ID do curso para int para comparação correta
-            course_id = course.get('id')
-            if isinstance(course_id, str) and course_id.isdigit():
-                course_id = int(course_id)
-            course['is_inserted'] = course_id in inserted_courses
-        
-        return render_template('course_list.html', courses=courses, inserted_courses=inserted_courses)
+        return _render_admin_course_list()
     except Exception as e:
         logger.error(f"Erro no dashboard admin: {str(e)}")
         flash('Erro ao carregar dashboard', 'error')
@@ -543,62 +570,26 @@ def _prepare_course_for_edit_form(course):
         # Se não temos descricao_original, usar a descricao atual como original
         course['descricao_original'] = course['descricao']
     
-    # Converter datas para o formato HTML (YYYY-MM-DD)
-    if 'inicio_inscricoes' in course and course['inicio_inscricoes']:
-        try:
-            # Tentar primeiro com separador '-'
-            if '-' in course['inicio_inscricoes']:
-                parts = course['inicio_inscricoes'].split('-')
-            # Tentar com separador '/' se não encontrar '-'
-            else:
-                parts = course['inicio_inscricoes'].split('/')
-                
-            if len(parts) == 3:
-                # Se estiver no formato DD-MM-AAAA ou DD/MM/AAAA
-                if len(parts[2]) == 4:  # Ano tem 4 dígitos
-                    course['inicio_inscricoes_data'] = f'{parts[2]}-{parts[1]}-{parts[0]}'
-                # Se estiver no formato AAAA-MM-DD ou AAAA/MM/DD
-                elif len(parts[0]) == 4:  # Ano tem 4 dígitos
-                    course['inicio_inscricoes_data'] = f'{parts[0]}-{parts[1]}-{parts[2]}'
-        except Exception as e:
-            logger.warning(f"Erro ao converter data de início: {e}")
-            course['inicio_inscricoes_data'] = ''
-    else:
-        course['inicio_inscricoes_data'] = ''
+    # Interpretar o registro uma única vez (datas, vagas e unidades)
+    parsed = Course.from_row(course)
     
-    if 'fim_inscricoes' in course and course['fim_inscricoes']:
-        try:
-            # Tentar primeiro com separador '-'
-            if '-' in course['fim_inscricoes']:
-                parts = course['fim_inscricoes'].split('-')
-            # Tentar com separador '/' se não encontrar '-'
-            else:
-                parts = course['fim_inscricoes'].split('/')
-                
-            if len(parts) == 3:
-                # Se estiver no formato DD-MM-AAAA ou DD/MM/AAAA
-                if len(parts[2]) == 4:  # Ano tem 4 dígitos
-                    course['fim_inscricoes_data'] = f'{parts[2]}-{parts[1]}-{parts[0]}'
-                # Se estiver no formato AAAA-MM-DD ou AAAA/MM/DD
-                elif len(parts[0]) == 4:  # Ano tem 4 dígitos
-                    course['fim_inscricoes_data'] = f'{parts[0]}-{parts[1]}-{parts[2]}'
-        except Exception as e:
-            logger.warning(f"Erro ao converter data de fim: {e}")
-            course['fim_inscricoes_data'] = ''
-    else:
-        course['fim_inscricoes_data'] = ''
+    # Converter datas para o formato HTML (YYYY-MM-DD)
+    course['inicio_inscricoes_data'] = html_date(parsed.inicio_inscricoes)
+    course['fim_inscricoes_data'] = html_date(parsed.fim_inscricoes)
     
     # Mapear campos de modalidade e unidades
     if course.get('modalidade') == 'Presencial' or course.get('modalidade') == 'Híbrido':
-        # Processar dados de múltiplas unidades separados por |
-        enderecos = course.get('endereco_unidade', '').split('|') if course.get('endereco_unidade') else ['']
-        bairros = course.get('bairro_unidade', '').split('|') if course.get('bairro_unidade') else ['']
-        vagas = course.get('vagas_unidade', '').split('|') if course.get('vagas_unidade') else ['']
-        inicio_aulas = course.get('inicio_aulas_data', '').split('|') if course.get('inicio_aulas_data') else ['']
-        fim_aulas = course.get('fim_aulas_data', '').split('|') if course.get('fim_aulas_data') else ['']
-        horario_inicio = course.get('horario_inicio', '').split('|') if course.get('horario_inicio') else ['']
-        horario_fim = course.get('horario_fim', '').split('|') if course.get('horario_fim') else ['']
-        dias_aula = course.get('dias_aula', '').split('|') if course.get('dias_aula') else ['']
+        # Dados de múltiplas unidades (ao menos uma unidade para o formulário)
+        units = parsed.units or [Unit()]
+        enderecos = [unit.endereco for unit in units]
+        bairros = [unit.bairro for unit in units]
+        vagas = [format_value(unit.vagas) for unit in units]
+        inicio_aulas = [html_date(unit.inicio_aulas) for unit in units]
+        fim_aulas = [html_date(unit.fim_aulas) for unit in units]
+        horario_inicio = [unit.horario_inicio for unit in units]
+        horario_fim = [unit.horario_fim for unit in units]
+        # Os dias de aula valem para todas as unidades
+        dias_aula = [parsed.dias_aula for _ in units]
         
         # Campos de unidade presencial (primeira unidade para compatibilidade)
         course['endereco_unidade'] = enderecos[0] if enderecos else ''
@@ -608,7 +599,7 @@ def _prepare_course_for_edit_form(course):
         course['fim_aulas_data'] = fim_aulas[0] if fim_aulas else ''
         course['horario_inicio'] = horario_inicio[0] if horario_inicio else ''
         course['horario_fim'] = horario_fim[0] if horario_fim else ''
-        course['dias_aula'] = dias_aula[0] if dias_aula else ''
+        course['dias_aula'] = parsed.dias_aula
         
         # Arrays para múltiplas unidades
         course['enderecos_unidades'] = enderecos
@@ -674,6 +665,35 @@ def course_edit_success(course_id):
         flash('Erro ao carregar curso', 'error')
         return redirect(url_for('list_courses'))
 
+@app.route('/course_history/<int:course_id>')
+@login_required
+def course_history(course_id):
+    """Histórico de versões de um curso (trilha de auditoria)"""
+    try:
+        versions = course_service.get_course_history(course_id)
+        if not versions:
+            flash('Nenhum histórico registrado para este curso', 'error')
+            return redirect(url_for('list_courses'))
+        
+        # Versão completa pedida (?version=N) e diferença entre duas versões (?from=N&to=M)
+        version = request.args.get('version', type=int)
+        from_version = request.args.get('from', type=int)
+        diff = None
+        if from_version:
+            diff = course_service.diff_course_versions(course_id, from_version, request.args.get('to', type=int))
+        
+        return render_template('course_history.html',
+                               course_id=course_id,
+                               versions=versions,
+                               version=version,
+                               version_data=course_service.get_course_version(course_id, version) if version else None,
+                               diff=diff,
+                               status_events=course_status_service.get_status_events(course_id))
+    except Exception as e:
+        logger.error(f"Erro ao carregar histórico do curso {course_id}: {str(e)}")
+        flash('Erro ao carregar histórico do curso', 'error')
+        return redirect(url_for('list_courses'))
+
 @app.route('/delete_course/<int:course_id>', methods=['POST'])
 @login_required
 def delete_course(course_id):
@@ -708,13 +728,13 @@ def toggle_course_status(course_id):
             action = form.action.data
             
             if action == 'mark_inserted':
-                success = course_status_service.mark_as_inserted(course_id)
+                success = course_status_service.mark_course_as_inserted(course_id, session.get('admin_username'))
                 if success:
                     flash('Curso marcado como inserido!', 'success')
                 else:
                     flash('Erro ao marcar curso como inserido', 'error')
             elif action == 'unmark_inserted':
-                success = course_status_service.unmark_as_inserted(course_id)
+                success = course_status_service.unmark_course_as_inserted(course_id, session.get('admin_username'))
                 if success:
                     flash('Curso desmarcado como inserido!', 'success')
                 else:
@@ -730,20 +750,78 @@ def toggle_course_status(course_id):
     
     return redirect(url_for('list_courses'))
 
+# Ações aceitas nas rotas de status: ação -> inserido
+STATUS_ACTIONS = {'mark_inserted': True, 'unmark_inserted': False}
+
+@app.route('/course_status/bulk', methods=['POST'])
+@login_required
+def bulk_course_status():
+    """
+    Altera o status de inserção de vários cursos em uma única gravação
+    
+    Recebe course_ids (separados por vírgula) e action (uma para todos ou uma
+    por ID) e responde em JSON com os cursos cujo status mudou e com os IDs
+    rejeitados (inválidos ou de cursos que não existem), que não são gravados.
+    """
+    form = BulkCourseStatusForm()
+    if not form.validate_on_submit():
+        return jsonify({'error': 'Erro de validação CSRF ou dados ausentes'}), 400
+    
+    course_ids = [value.strip() for value in form.course_ids.data.split(',') if value.strip()]
+    actions = [value.strip() for value in form.action.data.split(',')]
+    if len(actions) == 1:
+        actions = actions * len(course_ids)
+    if not course_ids or len(actions) != len(course_ids) \
+            or not all(action in STATUS_ACTIONS for action in actions):
+        return jsonify({'error': 'IDs ou ações inválidos'}), 400
+    
+    try:
+        existing = course_service.existing_course_ids(
+            int(course_id) for course_id in course_ids if course_id.isdigit()
+        )
+        updates = {int(course_id): STATUS_ACTIONS[action] for course_id, action in zip(course_ids, actions)
+                   if course_id.isdigit() and int(course_id) in existing}
+        changed = course_status_service.set_courses_status(updates, session.get('admin_username'))
+    except Exception as e:
+        logger.error(f"Erro ao alterar status em lote: {str(e)}")
+        return jsonify({'error': 'Erro ao alterar status dos cursos'}), 500
+    
+    rejected = [course_id for course_id in course_ids if not course_id.isdigit() or int(course_id) not in existing]
+    return jsonify({
+        'updated': [{'id': course_id, 'is_inserted': inserted} for course_id, inserted in sorted(changed.items())],
+        'rejected': rejected,
+    })
+
 @app.route('/download/<filename>')
 @login_required
 def download_file(filename):
     """Rota para download de arquivos CSV e PDF"""
     try:
         if filename.endswith('.csv'):
-            directory = Config.CSV_DIR
+            path = locate_artifact('csv', filename)
+        elif filename.endswith('.pdf') and Config.PDF_RENDER_MODE == 'lazy':
+            # PDF gerado agora a partir do registro atual (ou lido do cache)
+            path = course_service.get_pdf_on_demand(filename)
+            if not path:
+                flash('Arquivo não encontrado', 'error')
+                return redirect(request.referrer or url_for('list_courses'))
+            return send_from_directory(os.path.dirname(path), os.path.basename(path),
+                                       as_attachment=True, download_name=filename)
         elif filename.endswith('.pdf'):
-            directory = Config.PDF_DIR
+            # PDFs são gerados em segundo plano: aguardar um pouco se ainda estiver pendente
+            pdf_status = course_service.wait_for_pdf(filename, Config.PDF_DOWNLOAD_WAIT)
+            if pdf_status == PDF_PENDING:
+                flash('O PDF ainda está sendo gerado. Tente novamente em instantes.', 'warning')
+                return redirect(request.referrer or url_for('list_courses'))
+            if pdf_status == PDF_FAILED:
+                flash('Não foi possível gerar o PDF deste curso. Salve o curso novamente para tentar de novo.', 'error')
+                return redirect(request.referrer or url_for('list_courses'))
+            path = locate_artifact('pdf', filename)
         else:
             flash('Tipo de arquivo não suportado', 'error')
             return redirect(url_for('index'))
         
-        return send_from_directory(directory, filename, as_attachment=True)
+        return send_from_directory(os.path.dirname(path), os.path.basename(path), as_attachment=True)
     except Exception as e:
         logger.error(f"Erro ao baixar arquivo {filename}: {str(e)}")
         flash(f'Erro ao baixar arquivo: {str(e)}', 'error')
@@ -30,6 +30,40 @@ class Config:
     PDF_DIR = 'PDF'
     ID_FILE = 'last_id.json'
     
+    # Configurações de armazenamento ('csv', 'sqlite', 'mysql' ou 'journal')
+    STORAGE_ENGINE = os.environ.get('STORAGE_ENGINE', 'csv').lower()
+    SQLITE_PATH = os.environ.get('SQLITE_PATH', 'webciclo.db')
+    
+    # Diário JSONL (STORAGE_ENGINE=journal)
+    JOURNAL_PATH = os.environ.get('JOURNAL_PATH', 'courses.jsonl')
+    JOURNAL_COMPACT_RATIO = float(os.environ.get('JOURNAL_COMPACT_RATIO', '0.5'))  # linhas mortas / total
+    JOURNAL_COMPACT_MIN_RECORDS = 100  # linhas mínimas no arquivo para compactar
+    
+    # Histórico de versões dos cursos (deltas com um registro completo a cada N versões)
+    HISTORY_DIR = os.environ.get('HISTORY_DIR', 'historico')
+    HISTORY_SNAPSHOT_INTERVAL = 10
+    
+    # Geração dos PDFs: 'eager' (a cada criação/edição) ou 'lazy' (no primeiro download,
+    # com cache pelos campos exibidos no PDF)
+    PDF_RENDER_MODE = os.environ.get('PDF_RENDER_MODE', 'eager')
+    
+    # Geração dos PDFs em segundo plano no modo 'eager' (0 = síncrona, dentro da requisição)
+    PDF_WORKERS = int(os.environ.get('PDF_WORKERS', '2'))
+    PDF_JOB_TIMEOUT = 300  # segundos até um PDF pendente contar como falha
+    PDF_DOWNLOAD_WAIT = 15  # segundos que o download aguarda um PDF pendente
+    
+    # Status de inserção: log de eventos com um snapshot do mapa a cada N eventos
+    STATUS_SNAPSHOT_INTERVAL = 100
+    
+    # Configurações do MySQL (padrões compatíveis com o docker-compose.yml)
+    MYSQL_HOST = os.environ.get('MYSQL_HOST', '127.0.0.1')
+    MYSQL_PORT = int(os.environ.get('MYSQL_PORT', '3306'))
+    MYSQL_USER = os.environ.get('MYSQL_USER', 'root')
+    MYSQL_PASSWORD = os.environ.get('MYSQL_PASSWORD', '')
+    MYSQL_DATABASE = os.environ.get('MYSQL_DATABASE', 'meu_banco')
+    MYSQL_POOL_SIZE = int(os.environ.get('MYSQL_POOL_SIZE', '5'))
+    MYSQL_POOL_TIMEOUT = 10  # segundos aguardando uma conexão livre
+    
     # Configurações de API
     GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
     GEMINI_MODEL = 'gemini-2.5-pro'  # Stable Pro version (June 2025) - TESTADO E FUNCIONANDO
@@ -38,6 +72,10 @@ class Config:
     ADMIN_USERNAME = os.environ.get('ADMIN_USERNAME')
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD')
     
+    # Configurações de listagem
+    COURSES_PER_PAGE = 20
+    CLOSING_SOON_DAYS = 7  # janela do filtro "inscrições encerrando"
+    
     # Configurações de validação
     MAX_TITLE_LENGTH = 200
     MAX_DESCRIPTION_LENGTH = 2000
@@ -77,6 +115,7 @@ class TestingConfig(Config):
     TESTING = True
     CSV_DIR = 'test_csv'
     PDF_DIR = 'test_pdf'
+    SQLITE_PATH = 'test_webciclo.db'
 
 # Configuração padrão baseada no ambiente
 config = {
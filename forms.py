@@ -299,6 +299,11 @@ class CourseStatusForm(FlaskForm):
     course_id = HiddenField('Course ID', validators=[DataRequired()])
     action = HiddenField('Action', validators=[DataRequired()])
 
+class BulkCourseStatusForm(FlaskForm):
+    """Formulário para alterar o status de inserção de vários cursos de uma vez"""
+    course_ids = HiddenField('Course IDs', validators=[DataRequired()])  # IDs separados por vírgula
+    action = HiddenField('Action', validators=[DataRequired()])  # uma ação para todos ou uma por ID, separadas por vírgula
+
 class DeleteCourseForm(FlaskForm):
     """Formulário para exclusão de curso com proteção CSRF"""
     course_id = HiddenField('Course ID', validators=[DataRequired()])
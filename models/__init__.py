@@ -0,0 +1,6 @@
+# models/__init__.py
+# Modelos de dados do WebCiclo
+
+from models.course import Course, Unit
+
+__all__ = ['Course', 'Unit']
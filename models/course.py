@@ -0,0 +1,402 @@
+# models/course.py
+# Modelos tipados de curso e unidade, com conversão de/para o registro CSV
+
+import re
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Dict, List, Optional, Union
+
+# Formato dos timestamps de criação e atualização
+TIMESTAMP_FORMAT = '%d-%m-%Y %H:%M:%S'
+
+# Timestamps gravados também em ISO 8601 (ordenáveis como texto): coluna de exibição -> coluna ISO
+SORTABLE_TIMESTAMPS = {'created_at': 'created_at_iso', 'updated_at': 'updated_at_iso'}
+
+# Formatos de data aceitos nos registros (o primeiro de cada tupla é o gravado)
+INSCRICAO_DATE_FORMATS = ('%Y/%m/%d', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+AULA_DATE_FORMATS = ('%Y-%m-%d', '%Y/%m/%d', '%d/%m/%Y', '%d-%m-%Y')
+
+# Posição do ano, mês e dia (e separador) dos formatos de data lidos sem strptime
+_DATE_LAYOUTS = {
+    '%Y/%m/%d': ('/', 0, 1, 2),
+    '%Y-%m-%d': ('-', 0, 1, 2),
+    '%d/%m/%Y': ('/', 2, 1, 0),
+    '%d-%m-%Y': ('-', 2, 1, 0),
+}
+
+# Separador dos campos com um valor por unidade
+MULTI_VALUE_SEPARATOR = '|'
+
+# Atributo da unidade -> coluna do CSV (valores separados por '|')
+UNIT_COLUMNS = (
+    ('endereco', 'endereco_unidade'),
+    ('bairro', 'bairro_unidade'),
+    ('vagas', 'vagas_unidade'),
+    ('inicio_aulas', 'inicio_aulas_data'),
+    ('fim_aulas', 'fim_aulas_data'),
+    ('horario_inicio', 'horario_inicio'),
+    ('horario_fim', 'horario_fim'),
+)
+
+# Coluna que define a quantidade de unidades (as demais podem ter menos valores)
+UNIT_COUNT_COLUMN = 'endereco_unidade'
+_UNIT_COUNT_POSITION = [column for _, column in UNIT_COLUMNS].index(UNIT_COUNT_COLUMN)
+
+# Colunas simples (texto) mapeadas para atributos do curso; dias_aula guarda
+# os dias da semana do curso inteiro (separados por '|'), não um por unidade
+TEXT_COLUMNS = ('titulo', 'tipo_acao', 'orgao', 'tema', 'modalidade', 'dias_aula')
+
+# Quantidade de vagas com separador de milhar ('1.000', '12,500')
+_THOUSANDS_PATTERN = re.compile(r'\d{1,3}(?:[.,]\d{3})+')
+
+# Colunas representadas por atributos tipados (as demais ficam em Course.extra)
+_MODELLED_COLUMNS = frozenset(
+    ('id', 'inicio_inscricoes', 'fim_inscricoes', 'created_at', 'updated_at')
+    + tuple(SORTABLE_TIMESTAMPS.values()) + TEXT_COLUMNS + tuple(column for _, column in UNIT_COLUMNS)
+)
+
+# Colunas sempre presentes no registro gerado, mesmo vazias
+_REQUIRED_COLUMNS = ('id', 'titulo')
+
+# Ordem das colunas de cada layout de CSV já visto, compartilhada entre os cursos
+_layouts = {}
+
+# Quantidade de registros do catálogo com as unidades mantidas já interpretadas (ver units_of)
+COURSE_CACHE_SIZE = 1024
+_parsed = OrderedDict()  # id(registro) -> (registro, unidades)
+_parsed_lock = threading.Lock()
+
+def split_values(text: Optional[str]) -> List[str]:
+    """
+    Separa um campo com um valor por unidade
+
+    Args:
+        text: Valores separados por '|'
+
+    Returns:
+        List[str]: Valores (lista vazia para texto vazio)
+    """
+    return text.split(MULTI_VALUE_SEPARATOR) if text else []
+
+def parse_vagas(text: Optional[str]) -> Union[int, str, None]:
+    """
+    Converte a quantidade de vagas para inteiro
+
+    Separadores de milhar ('1.000', '1,000') são aceitos; qualquer outro
+    texto (ex.: '1,5') é mantido como está para não perder informação.
+    """
+    if not text:
+        return None
+    stripped = text.strip()
+    if stripped.isdigit():
+        return int(stripped)
+    if _THOUSANDS_PATTERN.fullmatch(stripped):
+        return int(stripped.replace(',', '').replace('.', ''))
+    return text
+
+def parse_date(text: Optional[str], formats: tuple = AULA_DATE_FORMATS) -> Union[date, str, None]:
+    """
+    Converte uma data do registro para date
+
+    Args:
+        text: Data em um dos formatos aceitos
+        formats: Formatos tentados, em ordem
+
+    Returns:
+        date, o texto original (se não for uma data reconhecida) ou None
+    """
+    stripped = text.strip() if text else ''
+    if not stripped:
+        return None
+    for fmt in formats:
+        parsed = _fast_date(stripped, fmt)
+        if parsed is not None:
+            return parsed
+        try:
+            return datetime.strptime(stripped, fmt).date()
+        except ValueError:
+            continue
+    return text
+
+def _fast_date(text: str, fmt: str) -> Optional[date]:
+    """
+    Lê datas numéricas simples (ex.: 2025/01/31) sem strptime
+
+    Returns:
+        date ou None se o texto não tem a forma do formato (strptime decide)
+    """
+    layout = _DATE_LAYOUTS.get(fmt)
+    if layout is None:
+        return None
+    separator, year, month, day = layout
+    parts = text.split(separator)
+    if len(parts) != 3 or len(parts[year]) != 4 or len(parts[month]) > 2 or len(parts[day]) > 2:
+        return None
+    if not (parts[0].isdigit() and parts[1].isdigit() and parts[2].isdigit()):
+        return None
+    try:
+        return date(int(parts[year]), int(parts[month]), int(parts[day]))
+    except ValueError:
+        return None
+
+def parse_timestamp(text: Optional[str]) -> Union[datetime, str, None]:
+    """Converte o timestamp de criação/atualização (DD-MM-AAAA HH:MM:SS)"""
+    if not text:
+        return None
+    day, _, time_text = text.partition(' ')
+    parsed = _fast_date(day, '%d-%m-%Y')
+    clock = time_text.split(':')
+    if parsed is not None and len(clock) == 3 and all(len(part) == 2 and part.isdigit() for part in clock):
+        try:
+            return datetime(parsed.year, parsed.month, parsed.day, *(int(part) for part in clock))
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(text, TIMESTAMP_FORMAT)
+    except ValueError:
+        return text
+
+def sortable_timestamp(value: Optional[str]) -> str:
+    """
+    Converte o timestamp de exibição (DD-MM-AAAA HH:MM:SS) para ISO 8601,
+    que ordena corretamente como texto
+
+    Args:
+        value: Timestamp no formato de exibição
+
+    Returns:
+        str: Timestamp ISO ou o valor original se não puder ser convertido
+    """
+    parsed = parse_timestamp(value)
+    return parsed.isoformat() if isinstance(parsed, datetime) else (value or '')
+
+def record_timestamp(record, field: str) -> str:
+    """
+    Timestamp ISO de um registro (created_at ou updated_at)
+
+    Usa a coluna ISO gravada junto ao texto de exibição e, em registros
+    antigos que não a têm, converte o texto de exibição.
+    """
+    return record.get(SORTABLE_TIMESTAMPS[field]) or sortable_timestamp(record.get(field))
+
+def format_value(value, date_format: str = AULA_DATE_FORMATS[0]) -> str:
+    """Converte um valor tipado de volta para o texto gravado no CSV"""
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime(TIMESTAMP_FORMAT)
+    if isinstance(value, date):
+        return value.strftime(date_format)
+    return str(value)
+
+def html_date(value) -> str:
+    """Data no formato dos campos <input type="date"> (AAAA-MM-DD)"""
+    if isinstance(value, date):
+        return value.isoformat()
+    return value or ''
+
+
+class Unit:
+    """Unidade (local e turma) de um curso"""
+
+    __slots__ = tuple(attr for attr, _ in UNIT_COLUMNS)
+
+    def __init__(self, endereco: str = '', bairro: str = '', vagas: Union[int, str, None] = None,
+                 inicio_aulas: Union[date, str, None] = None, fim_aulas: Union[date, str, None] = None,
+                 horario_inicio: str = '', horario_fim: str = ''):
+        self.endereco = endereco
+        self.bairro = bairro
+        self.vagas = vagas
+        self.inicio_aulas = inicio_aulas
+        self.fim_aulas = fim_aulas
+        self.horario_inicio = horario_inicio
+        self.horario_fim = horario_fim
+
+    def __repr__(self):
+        return f"Unit(endereco={self.endereco!r}, vagas={self.vagas!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, Unit):
+            return NotImplemented
+        return all(getattr(self, attr) == getattr(other, attr) for attr in self.__slots__)
+
+
+def total_vagas(units) -> int:
+    """Soma das vagas numéricas de uma lista de unidades"""
+    return sum(unit.vagas for unit in units if isinstance(unit.vagas, int))
+
+def parse_units(row) -> List[Unit]:
+    """
+    Interpreta as unidades de um registro (campos separados por '|')
+
+    Args:
+        row: Mapeamento coluna -> texto
+
+    Returns:
+        List[Unit]: Uma unidade por endereço (UNIT_COUNT_COLUMN); sem
+            endereços, a coluna com mais valores define a quantidade. Colunas
+            com menos valores deixam os atributos seguintes vazios.
+    """
+    columns = [split_values(row.get(column)) for _, column in UNIT_COLUMNS]
+    count = len(columns[_UNIT_COUNT_POSITION]) or max(map(len, columns))
+    for values in columns:
+        if len(values) < count:
+            values.extend([''] * (count - len(values)))
+    return [
+        Unit(endereco, bairro, parse_vagas(vagas), parse_date(inicio), parse_date(fim), horario_inicio, horario_fim)
+        for endereco, bairro, vagas, inicio, fim, horario_inicio, horario_fim in zip(*columns)
+    ]
+
+
+class Course:
+    """
+    Curso com os campos já interpretados: datas como date, vagas como int e
+    os campos separados por '|' agrupados em uma lista de unidades
+
+    Cada registro é interpretado uma única vez (from_row); to_row() devolve o
+    registro no formato do CSV, com as colunas na ordem original. Colunas sem
+    atributo próprio ficam em extra, como texto. Colunas cujo valor não foi
+    alterado voltam com o texto original (ex.: datas em formatos antigos),
+    então interpretar e regravar um registro não o reescreve.
+    """
+
+    __slots__ = ('id', 'titulo', 'tipo_acao', 'orgao', 'tema', 'modalidade', 'dias_aula',
+                 'inicio_inscricoes', 'fim_inscricoes', 'created_at', 'updated_at',
+                 'units', 'extra', '_layout', '_source')
+
+    def __init__(self, id: Optional[int] = None, titulo: str = '', tipo_acao: str = '', orgao: str = '',
+                 tema: str = '', modalidade: str = '', dias_aula: str = '', inicio_inscricoes=None,
+                 fim_inscricoes=None, created_at=None, updated_at=None, units: List[Unit] = None,
+                 extra: Dict[str, str] = None):
+        self.id = id
+        self.titulo = titulo
+        self.tipo_acao = tipo_acao
+        self.orgao = orgao
+        self.tema = tema
+        self.modalidade = modalidade
+        self.dias_aula = dias_aula
+        self.inicio_inscricoes = inicio_inscricoes
+        self.fim_inscricoes = fim_inscricoes
+        self.created_at = created_at
+        self.updated_at = updated_at
+        self.units = units if units is not None else []
+        self.extra = extra if extra is not None else {}
+        self._layout = ()
+        self._source = None
+
+    def __repr__(self):
+        return f"Course(id={self.id!r}, titulo={self.titulo!r}, units={len(self.units)})"
+
+    @property
+    def total_vagas(self) -> int:
+        """Soma das vagas numéricas de todas as unidades"""
+        return total_vagas(self.units)
+
+    @classmethod
+    def from_row(cls, row) -> 'Course':
+        """
+        Interpreta um registro no formato do CSV
+
+        Args:
+            row: Mapeamento coluna -> texto (linha do CSV ou registro do catálogo)
+
+        Returns:
+            Course: Curso tipado
+        """
+        course_id = str(row.get('id') or '')
+        course = cls(
+            id=int(course_id) if course_id.isdigit() else (course_id or None),
+            inicio_inscricoes=parse_date(row.get('inicio_inscricoes'), INSCRICAO_DATE_FORMATS),
+            fim_inscricoes=parse_date(row.get('fim_inscricoes'), INSCRICAO_DATE_FORMATS),
+            created_at=parse_timestamp(row.get('created_at')),
+            updated_at=parse_timestamp(row.get('updated_at')),
+            **{column: row.get(column) or '' for column in TEXT_COLUMNS},
+        )
+
+        course.units = parse_units(row)
+
+        course.extra = {key: value for key, value in row.items() if key not in _MODELLED_COLUMNS}
+        layout = tuple(row.keys())
+        course._layout = _layouts.setdefault(layout, layout)
+        course._source = dict(row)
+        return course
+
+    def to_row(self) -> Dict[str, str]:
+        """
+        Converte o curso para o registro no formato do CSV
+
+        Returns:
+            Dict[str, str]: Colunas na ordem do registro original (colunas
+                novas ao final); colunas não alteradas desde from_row mantêm
+                o texto original
+        """
+        values = self._values()
+        if self._source is not None:
+            original = Course.from_row(self._source)._values()
+            for key, value in values.items():
+                if key in self._source and value == original.get(key):
+                    values[key] = self._source[key]
+
+        row = {key: values[key] for key in self._layout if key in values}
+        for key, value in values.items():
+            if key not in row and (value or key in _REQUIRED_COLUMNS):
+                row[key] = value
+        return row
+
+    def _values(self) -> Dict[str, str]:
+        """Texto de cada coluna no formato gravado (datas e vagas normalizadas)"""
+        values = {
+            'id': format_value(self.id),
+            'inicio_inscricoes': format_value(self.inicio_inscricoes, INSCRICAO_DATE_FORMATS[0]),
+            'fim_inscricoes': format_value(self.fim_inscricoes, INSCRICAO_DATE_FORMATS[0]),
+            'created_at': format_value(self.created_at),
+            'updated_at': format_value(self.updated_at),
+        }
+        for field, iso_column in SORTABLE_TIMESTAMPS.items():
+            value = getattr(self, field)
+            values[iso_column] = value.isoformat() if isinstance(value, datetime) else ''
+        for column in TEXT_COLUMNS:
+            values[column] = getattr(self, column)
+        for attr, column in UNIT_COLUMNS:
+            parts = [format_value(getattr(unit, attr)) for unit in self.units]
+            # Unidades sem valor no fim da lista não geram separadores extras
+            while parts and not parts[-1]:
+                parts.pop()
+            values[column] = MULTI_VALUE_SEPARATOR.join(parts)
+        values.update(self.extra)
+        return values
+
+
+def units_of(record) -> tuple:
+    """
+    Unidades tipadas de um registro do catálogo, compartilhadas entre os consumidores
+
+    Os índices do catálogo (contadores, intervalos, colunas) recebem os
+    mesmos registros a cada recarga: o primeiro interpreta as unidades com
+    parse_units e os demais as reaproveitam, em vez de separar os campos '|'
+    de novo. Os COURSE_CACHE_SIZE registros mais recentes ficam guardados
+    junto com o próprio registro, para que a identidade não seja
+    reaproveitada por outro objeto. Dicionários comuns (que podem ser
+    alterados) são sempre interpretados de novo.
+
+    Args:
+        record: Registro do catálogo (somente leitura) ou dicionário do curso
+
+    Returns:
+        tuple: Unidades (Unit) do curso, que não devem ser alteradas
+    """
+    if isinstance(record, dict):
+        return tuple(parse_units(record))
+    key = id(record)
+    with _parsed_lock:
+        cached = _parsed.get(key)
+        if cached is not None and cached[0] is record:
+            _parsed.move_to_end(key)
+            return cached[1]
+    units = tuple(parse_units(record))
+    with _parsed_lock:
+        _parsed[key] = (record, units)
+        while len(_parsed) > COURSE_CACHE_SIZE:
+            _parsed.popitem(last=False)
+    return units
@@ -1,2 +1,31 @@
 # repositories/__init__.py
 # Módulo de repositórios do WebCiclo
+
+from config import Config
+
+def create_course_repository(engine: str = None):
+    """
+    Cria o repositório de cursos conforme o mecanismo configurado
+    
+    Args:
+        engine: 'csv', 'sqlite', 'mysql' ou 'journal' (padrão: Config.STORAGE_ENGINE)
+        
+    Returns:
+        CourseRepository: Instância do repositório
+    """
+    engine = (engine or Config.STORAGE_ENGINE).lower()
+    
+    if engine == 'csv':
+        from repositories.course_repository import CourseRepository
+        return CourseRepository()
+    if engine == 'sqlite':
+        from repositories.sqlite_course_repository import SQLiteCourseRepository
+        return SQLiteCourseRepository()
+    if engine == 'mysql':
+        from repositories.mysql_course_repository import MySQLCourseRepository
+        return MySQLCourseRepository()
+    if engine == 'journal':
+        from repositories.journal_course_repository import JournalCourseRepository
+        return JournalCourseRepository()
+    
+    raise ValueError(f"Mecanismo de armazenamento desconhecido: {engine}")
@@ -2,13 +2,61 @@
 # Repositório para gerenciamento de dados de cursos
 
 import os
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from datetime import date, datetime
 from config import Config
 from scripts.csv_generator import generate_csv
-from scripts.pdf_generator import generate_pdf
-from scripts.csv_reader import read_csv_files, get_course_by_id
-from scripts.id_manager import get_next_id
+from scripts.pdf_jobs import get_pdf_queue, pdf_filename, READY, FAILED, MISSING
+from scripts.pdf_cache import get_pdf_cache, pdf_content_hash
+from scripts.csv_reader import get_catalog_snapshot, get_catalog_index
+from scripts.id_manager import get_next_id, reconcile_last_id
+from scripts.course_index import unregister_course, get_course_manifest, register_course_artifacts, rebuild_index
+from scripts.storage_layout import locate_artifact, writable_path, generated_course_id
+from scripts.content_hash import record_content_hash
+from scripts.search_index import SearchIndex
+from scripts.field_index import FieldIndex
+from scripts.catalog_stats import CatalogStats
+from scripts.catalog_columns import CatalogColumns, COLUMN_FILTERS, VECTORIZED
+from scripts.interval_index import IntervalIndex, INTERVAL_FILTERS, EXCLUDE_CLOSED_FILTER
+from scripts.sort_index import SortIndex
+from scripts.course_history import get_course_history
+from models.course import TIMESTAMP_FORMAT, record_timestamp
+
+# Ordenações disponíveis: nome -> (campo, decrescente)
+SORT_OPTIONS = {
+    'recent': ('created_at', True),
+    'updated': ('updated_at', True),
+    'titulo': ('titulo', False),
+    'orgao': ('orgao', False),
+    'inscricoes': ('fim_inscricoes', False),
+}
+
+# Campos aceitos como filtro de igualdade
+FILTER_FIELDS = ('modalidade', 'orgao', 'tema', 'tipo_acao')
+
+# Filtros por conjunto de IDs (ex.: status de inserção resolvido pelo CourseStatusService)
+ID_FILTERS = ('ids', 'exclude_ids')
+
+def clean_filters(filters: Optional[Dict]) -> Dict:
+    """
+    Remove filtros vazios, mantendo apenas os campos reconhecidos
+    
+    'ids' restringe o resultado aos IDs informados (um conjunto vazio não
+    retorna nenhum curso); 'exclude_ids' remove os IDs informados. 'bairro'
+    (bairro de uma das unidades) é resolvido pelo catálogo em colunas
+    (COLUMN_FILTERS); os filtros de período (INTERVAL_FILTERS, ex.: 'open_on'
+    com um date) e 'exclude_closed_before' (date: oculta inscrições já
+    encerradas) pelo índice de intervalos.
+    """
+    if not filters:
+        return {}
+    accepted = FILTER_FIELDS + COLUMN_FILTERS + tuple(INTERVAL_FILTERS) + (EXCLUDE_CLOSED_FILTER, 'search')
+    cleaned = {key: value for key, value in filters.items() if value and key in accepted}
+    if filters.get('ids') is not None:
+        cleaned['ids'] = {str(course_id) for course_id in filters['ids']}
+    if filters.get('exclude_ids'):
+        cleaned['exclude_ids'] = {str(course_id) for course_id in filters['exclude_ids']}
+    return cleaned
 
 class CourseRepository:
     """Repositório para operações com dados de cursos"""
@@ -16,7 +64,12 @@ class CourseRepository:
     def __init__(self):
         self.csv_dir = Config.CSV_DIR
         self.pdf_dir = Config.PDF_DIR
+        self.history = get_course_history(Config.HISTORY_DIR, Config.HISTORY_SNAPSHOT_INTERVAL)
+        self.pdf_jobs = get_pdf_queue(Config.PDF_WORKERS, Config.PDF_JOB_TIMEOUT)
+        self.pdf_on_demand = Config.PDF_RENDER_MODE == 'lazy'
+        self.pdf_cache = get_pdf_cache()
         self._ensure_directories()
+        self._reconcile_ids()
     
     def _ensure_directories(self):
         """Garante que os diretórios necessários existam"""
@@ -28,50 +81,59 @@ class CourseRepository:
         """
         Salva um curso e gera os arquivos correspondentes
         
+        O CSV é gerado na requisição; o PDF é agendado na fila de PDFs (ou,
+        com PDF_RENDER_MODE='lazy', gerado apenas no download) e o retorno
+        traz pdf_status ('pending' enquanto a geração não termina).
+        
         Args:
             course_data: Dados do curso
             
         Returns:
-            Dict: Dados do curso com ID e timestamps atualizados
+            Dict: Dados do curso com ID, timestamps e pdf_status
         """
         # Obter próximo ID
-        course_data['id'] = get_next_id()
-        course_data['created_at'] = datetime.now().strftime('%d-%m-%Y %H:%M:%S')
+        course_data['id'] = self._next_id()
+        now = datetime.now()
+        course_data['created_at'] = now.strftime(TIMESTAMP_FORMAT)
+        course_data['created_at_iso'] = now.isoformat(timespec='seconds')
         
-        # Gerar arquivos CSV e PDF
+        # Gerar o CSV (o PDF, com o mesmo nome base, é gerado em segundo plano)
         try:
             csv_path = generate_csv(course_data)
-            pdf_path = generate_pdf(course_data)
             
             course_data['csv_file'] = os.path.basename(csv_path)
-            course_data['pdf_file'] = os.path.basename(pdf_path)
+            course_data['pdf_file'] = pdf_filename(course_data)
             
-            print(f"Arquivos gerados com sucesso para curso {course_data['id']}: CSV={csv_path}, PDF={pdf_path}")
+            print(f"CSV gerado com sucesso para curso {course_data['id']}: {csv_path}")
             
         except Exception as e:
             # Log detalhado do erro
-            print(f"ERRO ao gerar arquivos para curso {course_data['id']}: {str(e)}")
+            print(f"ERRO ao gerar CSV para curso {course_data['id']}: {str(e)}")
             print(f"Tipo do erro: {type(e).__name__}")
             import traceback
             print(f"Traceback: {traceback.format_exc()}")
-            
-            # Tentar gerar apenas CSV se PDF falhar
-            try:
-                csv_path = generate_csv(course_data)
-                course_data['csv_file'] = os.path.basename(csv_path)
-                course_data['pdf_file'] = None
-                print(f"CSV gerado com sucesso, PDF falhou: {csv_path}")
-            except Exception as csv_error:
-                print(f"ERRO ao gerar CSV também: {str(csv_error)}")
-                course_data['csv_file'] = None
-                course_data['pdf_file'] = None
+            course_data['csv_file'] = None
+            course_data['pdf_file'] = None
+        
+        if course_data.get('csv_file'):
+            self._register_artifacts(course_data, {'csv': record_content_hash(course_data),
+                                                   'pdf': pdf_content_hash(course_data)})
+        self._store_course(course_data)
+        self._record_version(course_data['id'], course_data, 'create')
         
+        course_data['pdf_status'] = self._schedule_pdf(course_data)
         return course_data
     
     def update_course(self, course_id: int, course_data: Dict) -> Dict:
         """
         Atualiza um curso existente
         
+        Os arquivos são regenerados apenas se o seu conteúdo mudou: o hash
+        canônico do registro (CSV) e o dos campos exibidos no PDF são
+        comparados com os registrados no manifesto na última geração. Salvar
+        o formulário sem alterações não grava nada; alterações em campos que
+        não aparecem no PDF regeneram apenas o CSV.
+        
         Args:
             course_id: ID do curso
             course_data: Novos dados do curso
@@ -86,49 +148,405 @@ class CourseRepository:
         
         # Manter dados originais importantes
         course_data['id'] = course_id
-        course_data['created_at'] = existing_course.get('created_at', datetime.now().strftime('%d-%m-%Y %H:%M:%S'))
-        course_data['updated_at'] = datetime.now().strftime('%d-%m-%Y %H:%M:%S')
+        now = datetime.now()
+        course_data['created_at'] = existing_course.get('created_at', now.strftime(TIMESTAMP_FORMAT))
+        course_data['created_at_iso'] = record_timestamp(existing_course, 'created_at') or now.isoformat(timespec='seconds')
+        
+        # Comparar o conteúdo com o da última geração dos arquivos (manifestos
+        # antigos, sem os hashes, usam o registro atual)
+        manifest = self._course_manifest(course_id)
+        stored = manifest.get('content') or {
+            'csv': record_content_hash(existing_course),
+            'pdf': pdf_content_hash(existing_course),
+        }
+        csv_hash = record_content_hash(course_data)
+        pdf_hash = pdf_content_hash(course_data)
+        old_csv = manifest.get('csv') or existing_course.get('csv_file') or existing_course.get('source_file')
+        old_pdf = manifest.get('pdf') or pdf_filename(existing_course)
+        csv_changed = csv_hash != stored.get('csv') or not old_csv or not os.path.exists(locate_artifact('csv', old_csv))
+        pdf_changed = pdf_hash != stored.get('pdf')
+        status = self.pdf_status(existing_course)
+        
+        if not csv_changed:
+            # Conteúdo igual: manter o registro e os arquivos. O PDF só é
+            # reagendado se falhou ou não existe; um trabalho pendente segue na fila
+            course = dict(existing_course)
+            course['csv_file'] = old_csv
+            course['pdf_file'] = old_pdf
+            reschedule = pdf_changed or status in (FAILED, MISSING)
+            course['pdf_status'] = self._schedule_pdf(course) if reschedule else status
+            if pdf_changed:
+                self._update_artifacts(course_id, content={'pdf': pdf_hash})
+            print(f"Curso {course_id} sem alterações de conteúdo: CSV mantido, PDF {'agendado' if reschedule else 'mantido'}")
+            return course
         
-        # Remover arquivos antigos antes de gerar novos (para evitar arquivos órfãos)
-        self._cleanup_old_course_files(course_id, existing_course)
+        # O CSV muda de nome: um PDF que não está pronto não pode acompanhá-lo
+        pdf_changed = pdf_changed or status != READY
         
-        # Gerar novos arquivos
+        course_data['updated_at'] = now.strftime(TIMESTAMP_FORMAT)
+        course_data['updated_at_iso'] = now.isoformat(timespec='seconds')
+        
+        # Remover os arquivos que serão regenerados (para evitar arquivos órfãos)
+        self._delete_artifacts(manifest, ('csv', 'pdf') if pdf_changed else ('csv',))
+        
+        # Gerar novo CSV (o PDF, se mudou, é gerado em segundo plano)
         try:
             csv_path = generate_csv(course_data)
-            pdf_path = generate_pdf(course_data)
             
             course_data['csv_file'] = os.path.basename(csv_path)
-            course_data['pdf_file'] = os.path.basename(pdf_path)
+            course_data['pdf_file'] = pdf_filename({'csv_file': course_data['csv_file']})
+            if not pdf_changed:
+                self._rename_pdf(old_pdf, course_data['pdf_file'])
             
-            print(f"Arquivos atualizados para curso {course_id}: CSV={csv_path}, PDF={pdf_path}")
+            print(f"CSV atualizado para curso {course_id}: {csv_path}")
             
         except Exception as e:
             print(f"Erro ao gerar arquivos para curso {course_id}: {str(e)}")
             course_data['csv_file'] = existing_course.get('csv_file')
             course_data['pdf_file'] = existing_course.get('pdf_file')
         
+        if course_data.get('csv_file'):
+            self._register_artifacts(course_data, {'csv': csv_hash, 'pdf': pdf_hash})
+        self._store_course(course_data)
+        self._record_version(course_id, course_data, 'update')
+        
+        course_data['pdf_status'] = self._schedule_pdf(course_data) if pdf_changed else READY
         return course_data
     
-    def find_by_id(self, course_id: int) -> Optional[Dict]:
+    def _rename_pdf(self, old_filename: Optional[str], new_filename: str):
+        """Acompanha a mudança de nome do CSV com o PDF existente, sem regenerá-lo"""
+        if not old_filename or old_filename == new_filename:
+            return
+        old_path = locate_artifact('pdf', old_filename)
+        if os.path.exists(old_path):
+            os.replace(old_path, writable_path('pdf', new_filename))
+    
+    def _schedule_pdf(self, course_data: Dict) -> str:
         """
-        Busca um curso pelo ID
+        Agenda a geração do PDF do curso na fila de PDFs
+        
+        Quando o PDF fica pronto, o manifesto é atualizado com o hash do
+        arquivo. No modo sob demanda nada é gerado aqui.
+        
+        Returns:
+            str: Situação do PDF (ver scripts/pdf_jobs.py)
+        """
+        filename = course_data.get('pdf_file')
+        if not filename:
+            return MISSING
+        if self.pdf_on_demand:
+            return READY
+        course_id = course_data['id']
+        try:
+            return self.pdf_jobs.submit(
+                course_data, filename,
+                on_ready=lambda: self._update_artifacts(course_id, pdf=filename)
+            )
+        except Exception as e:
+            print(f"Erro ao agendar PDF do curso {course_id}: {str(e)}")
+            return MISSING
+    
+    def pdf_status(self, course: Dict) -> str:
+        """
+        Situação do PDF de um curso
         
         Args:
-            course_id: ID do curso
+            course: Dados do curso
+            
+        Returns:
+            str: 'pending', 'ready', 'failed' ou 'missing'
+        """
+        filename = pdf_filename(course)
+        if not filename:
+            return MISSING
+        return READY if self.pdf_on_demand else self.pdf_jobs.status(filename)
+    
+    def render_pdf(self, filename: str) -> Optional[str]:
+        """
+        PDF de um curso gerado a partir do registro atual (modo sob demanda)
+        
+        O resultado fica em cache pelo hash dos campos exibidos no PDF, então
+        apenas o primeiro download após uma alteração desses campos gera o
+        arquivo.
+        
+        Args:
+            filename: Nome do PDF pedido (<data>_<id>_<título>.pdf)
             
         Returns:
-            Dict ou None: Dados do curso ou None se não encontrado
+            str ou None: Caminho do PDF, ou None se o nome não corresponde ao
+                PDF atual de um curso
+        """
+        course_id = generated_course_id(filename)
+        course = self.find_by_id(course_id) if course_id is not None else None
+        if not course or pdf_filename(course) != filename:
+            return None
+        return self.pdf_cache.get(course)
+    
+    def wait_for_pdf(self, filename: str, timeout: float) -> str:
+        """
+        Aguarda a geração de um PDF pendente
+        
+        Args:
+            filename: Nome do PDF
+            timeout: Tempo máximo de espera, em segundos
+            
+        Returns:
+            str: Situação do PDF ao final da espera
+        """
+        return self.pdf_jobs.wait(filename, timeout)
+    
+    def _record_version(self, course_id: int, course_data: Optional[Dict], action: str):
+        """Registra a versão no histórico (falhas não impedem a gravação do curso)"""
+        try:
+            self.history.record(course_id, course_data, action)
+        except Exception as e:
+            print(f"Erro ao registrar histórico do curso {course_id}: {str(e)}")
+    
+    def _reconcile_ids(self):
+        """Alinha o contador de IDs com os cursos existentes (uma vez, na inicialização)"""
+        reconcile_last_id()
+    
+    def _next_id(self) -> int:
+        """Obtém o próximo ID de curso do mecanismo de armazenamento"""
+        return get_next_id()
+    
+    def _store_course(self, course_data: Dict):
+        """
+        Persiste o registro do curso no mecanismo de armazenamento
+        
+        No armazenamento em CSV o próprio arquivo gerado é o registro, então
+        não há nada adicional a gravar.
         """
-        return get_course_by_id(course_id)
+        pass
+    
+    def _remove_course(self, course_id: int):
+        """Remove o registro do curso do mecanismo de armazenamento"""
+        unregister_course(course_id)
+    
+    def _catalog_snapshot(self) -> tuple:
+        """Snapshot imutável do catálogo (mais recente primeiro)"""
+        return get_catalog_snapshot()
+    
+    def _catalog_index(self, name: str, factory):
+        """Índice derivado do catálogo, mantido incrementalmente a cada recarga"""
+        return get_catalog_index(name, factory)
+    
+    def _search_index(self) -> SearchIndex:
+        """Índice invertido de busca textual"""
+        return self._catalog_index('search', SearchIndex)
+    
+    def _field_index(self) -> FieldIndex:
+        """Índices hash dos campos filtráveis"""
+        return self._catalog_index('fields', lambda: FieldIndex(FILTER_FIELDS))
+    
+    def _column_index(self) -> CatalogColumns:
+        """Catálogo em colunas (filtros vetorizados e contagens)"""
+        return self._catalog_index('columns', CatalogColumns)
+    
+    def _interval_index(self) -> IntervalIndex:
+        """Índice de intervalos dos períodos de inscrição e de aulas"""
+        return self._catalog_index('intervals', IntervalIndex)
     
     def find_all(self) -> List[Dict]:
         """
-        Lista todos os cursos
+        Lista todos os cursos a partir do cache do catálogo
         
         Returns:
             List[Dict]: Lista de todos os cursos
         """
-        return read_csv_files()
+        # Cópias rasas para que os chamadores possam alterar os dicionários
+        return [dict(course) for course in self._catalog_snapshot()]
+    
+    def _sort_index(self, sort: str) -> SortIndex:
+        """Ordenações pré-calculadas do catálogo (valida o nome da ordenação)"""
+        if sort not in SORT_OPTIONS:
+            raise ValueError(f"Ordenação inválida: {sort}")
+        return self._catalog_index('sort', lambda: SortIndex(SORT_OPTIONS))
+    
+    def _filter_keys(self, filters: Dict) -> tuple:
+        """
+        Resolve os filtros por interseção de conjuntos nos índices
+        
+        Cada filtro (campo, busca textual, IDs) produz um conjunto de
+        documentos e somente a interseção é mantida. Os filtros de exclusão
+        ('exclude_ids' e 'exclude_closed_before') são devolvidos à parte: sem
+        outros filtros, o resultado é o catálogo inteiro menos esses
+        documentos, e nada precisa ser copiado.
+        
+        O filtro de bairro, e os de campo quando o NumPy está disponível, são
+        resolvidos juntos em uma única máscara sobre o catálogo em colunas; os
+        filtros de período, por buscas binárias no índice de intervalos.
+        
+        Returns:
+            tuple: (documentos aceitos, ou None para todos; documentos excluídos)
+        """
+        index = self._field_index()
+        doc_sets = []
+        
+        use_columns = any(filters.get(name) for name in COLUMN_FILTERS) or (
+            VECTORIZED and any(filters.get(field) for field in FILTER_FIELDS))
+        if use_columns:
+            doc_sets.append(self._column_index().matching_keys(filters))
+        else:
+            field_matches = index.matching_keys(filters)
+            if field_matches is not None:
+                doc_sets.append(field_matches)
+        interval_matches = self._interval_index().matching_keys(filters)
+        if interval_matches is not None:
+            doc_sets.append(interval_matches)
+        if filters.get('search'):
+            doc_sets.append(self._search_index().matching_keys(filters['search']))
+        if 'ids' in filters:
+            doc_sets.append(index.keys_for_ids(filters['ids']))
+        
+        keys = None
+        if doc_sets:
+            doc_sets.sort(key=len)
+            keys = set(doc_sets[0])
+            for docs in doc_sets[1:]:
+                keys &= docs
+        
+        exclude = set()
+        if filters.get('exclude_ids'):
+            exclude |= index.keys_for_ids(filters['exclude_ids'])
+        if filters.get(EXCLUDE_CLOSED_FILTER):
+            exclude |= self._interval_index().ended_before(filters[EXCLUDE_CLOSED_FILTER])
+        return keys, exclude
+    
+    def _filtered(self, filters: Dict, sort: str = 'recent') -> List:
+        """
+        Cursos que atendem aos filtros, na ordem pedida
+        
+        A ordenação pré-calculada é percorrida pulando os documentos que não
+        atendem aos filtros (ou, para poucos resultados, apenas eles são
+        ordenados): nenhum filtro ordena o catálogo inteiro.
+        
+        Returns:
+            List: Registros somente leitura na ordem pedida
+        """
+        keys, exclude = self._filter_keys(filters)
+        return self._sort_index(sort).select(sort, keys, exclude)[0]
+    
+    def iter_courses(self, sort: str = 'recent', filters: Dict = None) -> Iterator[Dict]:
+        """
+        Percorre os cursos sob demanda, sem materializar a lista completa
+        
+        Args:
+            sort: Nome da ordenação (ver SORT_OPTIONS)
+            filters: Filtros por campo (FILTER_FIELDS), 'search' para busca textual e ID_FILTERS
+            
+        Yields:
+            Dict: Cópia dos dados de cada curso
+        """
+        filters = clean_filters(filters)
+        ordered = self._filtered(filters, sort) if filters else self._sort_index(sort).ordered(sort)
+        for course in ordered:
+            yield dict(course)
+    
+    def find_page(self, offset: int = 0, limit: int = 20, sort: str = 'recent',
+                  filters: Dict = None, cursor: str = None) -> Dict:
+        """
+        Retorna uma página de cursos
+        
+        Com filtros, o total vem do tamanho dos conjuntos de documentos e a
+        página é montada percorrendo a ordenação até completá-la: o custo
+        acompanha a posição da página e não o tamanho do catálogo.
+        
+        Args:
+            offset: Posição inicial (ignorado quando cursor é informado)
+            limit: Quantidade máxima de cursos na página
+            sort: Nome da ordenação (ver SORT_OPTIONS)
+            filters: Filtros por campo (FILTER_FIELDS), 'search' para busca textual e ID_FILTERS
+            cursor: ID do último curso da página anterior
+            
+        Returns:
+            Dict: courses, total, offset, limit, has_next e next_cursor
+        """
+        filters = clean_filters(filters)
+        sort_index = self._sort_index(sort)
+        offset = max(int(offset or 0), 0)
+        anchor = self._cursor_position(sort_index, sort, cursor)
+        
+        if filters:
+            keys, exclude = self._filter_keys(filters)
+            if keys is None:
+                total = len(sort_index) - len(exclude)
+            else:
+                total = len(keys) - len(exclude & keys) if exclude else len(keys)
+            page, start = sort_index.select(sort, keys, exclude, offset, limit, after=anchor)
+        else:
+            # A página é uma fatia direta da ordenação: custo proporcional ao tamanho da página
+            start = anchor + 1 if anchor is not None else offset
+            page = sort_index.page(sort, start, limit)
+            total = len(sort_index)
+        has_next = start + limit < total
+        offset = start
+        
+        courses = [dict(course) for course in page]
+        return {
+            'courses': courses,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'has_next': has_next,
+            'next_cursor': str(courses[-1].get('id')) if courses and has_next else None,
+        }
+    
+    def _cursor_position(self, sort_index: SortIndex, sort: str, cursor) -> Optional[int]:
+        """Posição do curso do cursor na ordenação completa (None se não existir)"""
+        if cursor is None:
+            return None
+        index = self._field_index()
+        records = index.records(index.keys_for_ids([cursor]))
+        return sort_index.position(sort, records[0]) if records else None
+    
+    def existing_ids(self, course_ids: Iterable[int]) -> Set[int]:
+        """
+        IDs de cursos existentes entre os informados
+        
+        Args:
+            course_ids: IDs dos cursos
+            
+        Returns:
+            Set[int]: Apenas os IDs que correspondem a um curso do catálogo
+        """
+        index = self._field_index()
+        return {int(course['id']) for course in index.records(index.keys_for_ids(course_ids))}
+    
+    def distinct_values(self, field: str) -> List[str]:
+        """
+        Valores distintos (não vazios) de um campo, em ordem alfabética
+        
+        Args:
+            field: Nome do campo
+            
+        Returns:
+            List[str]: Valores distintos
+        """
+        if field in FILTER_FIELDS:
+            return self._field_index().values(field)
+        if field == 'bairro':
+            return self._column_index().values('bairro')
+        return sorted({course.get(field) for course in self._catalog_snapshot() if course.get(field)})
+    
+    def get_facet_counts(self, inserted_ids: Iterable = (), today: date = None) -> Dict:
+        """
+        Contadores agregados do catálogo, mantidos incrementalmente
+        
+        Args:
+            inserted_ids: IDs marcados como inseridos (CourseStatusService)
+            today: Dia usado para contar as inscrições abertas (padrão: hoje)
+            
+        Returns:
+            Dict: total, inserted, gratuitos, pagos, total_vagas, inscricoes_abertas
+                e contagens por modalidade, orgao e tema
+        """
+        columns = self._column_index()
+        facets = self._catalog_index('stats', CatalogStats).snapshot(inserted_ids)
+        facets['total'] = columns.count({})
+        facets['total_vagas'] = columns.sum_vagas({})
+        facets['inscricoes_abertas'] = self._interval_index().count_open(today or date.today())
+        return facets
     
     def delete_course(self, course_id: int) -> bool:
         """
@@ -144,70 +562,70 @@ class CourseRepository:
         if not course:
             return False
         
-        # Excluir arquivos CSV e PDF usando o ID do curso para busca mais precisa
-        course_id_str = str(course_id)
+        # Excluir apenas os arquivos listados no manifesto do curso
+        self._delete_artifacts(self._course_manifest(course_id))
         
-        # Excluir arquivos CSV (buscar por ID no nome do arquivo)
-        csv_files = [f for f in os.listdir(self.csv_dir) if f"_{course_id_str}_" in f or f.startswith(f"{course_id_str}_")]
-        for csv_file in csv_files:
-            try:
-                os.remove(os.path.join(self.csv_dir, csv_file))
-                print(f"Arquivo CSV excluído: {csv_file}")
-            except Exception as e:
-                print(f"Erro ao excluir arquivo CSV {csv_file}: {str(e)}")
+        self._remove_course(course_id)
+        self._record_version(course_id, None, 'delete')
         
-        # Excluir arquivos PDF (buscar por ID no nome do arquivo)
-        pdf_files = [f for f in os.listdir(self.pdf_dir) if f"_{course_id_str}_" in f or f.startswith(f"{course_id_str}_")]
-        for pdf_file in pdf_files:
-            try:
-                os.remove(os.path.join(self.pdf_dir, pdf_file))
-                print(f"Arquivo PDF excluído: {pdf_file}")
-            except Exception as e:
-                print(f"Erro ao excluir arquivo PDF {pdf_file}: {str(e)}")
-        
-        # Fallback: tentar excluir por nome do arquivo também (para compatibilidade com arquivos antigos)
-        titulo_formatado = course['titulo'].replace(' ', '_').replace('/', '_').replace('\\', '_')
+        return True
+    
+    def list_versions(self, course_id: int) -> List[Dict]:
+        """
+        Versões registradas de um curso (trilha de auditoria)
         
-        # Buscar arquivos antigos sem ID no nome
-        old_csv_files = [f for f in os.listdir(self.csv_dir) if titulo_formatado in f and f"_{course_id_str}_" not in f]
-        for csv_file in old_csv_files:
-            try:
-                os.remove(os.path.join(self.csv_dir, csv_file))
-                print(f"Arquivo CSV antigo excluído: {csv_file}")
-            except Exception as e:
-                print(f"Erro ao excluir arquivo CSV antigo {csv_file}: {str(e)}")
+        Args:
+            course_id: ID do curso
+            
+        Returns:
+            List[Dict]: version, at, action e changes (campo -> (valor anterior, valor novo)),
+                da mais antiga para a mais recente
+        """
+        return self.history.versions(course_id)
+    
+    def get_version(self, course_id: int, version: int = None) -> Optional[Dict]:
+        """
+        Dados de um curso em uma versão do histórico
         
-        old_pdf_files = [f for f in os.listdir(self.pdf_dir) if titulo_formatado in f and f"_{course_id_str}_" not in f]
-        for pdf_file in old_pdf_files:
-            try:
-                os.remove(os.path.join(self.pdf_dir, pdf_file))
-                print(f"Arquivo PDF antigo excluído: {pdf_file}")
-            except Exception as e:
-                print(f"Erro ao excluir arquivo PDF antigo {pdf_file}: {str(e)}")
+        Args:
+            course_id: ID do curso
+            version: Número da versão (padrão: a mais recente)
+            
+        Returns:
+            Dict ou None: Dados do curso na versão
+        """
+        return self.history.get_version(course_id, version)
+    
+    def diff_versions(self, course_id: int, from_version: int, to_version: int = None) -> Dict:
+        """
+        Diferenças entre duas versões de um curso
         
-        return True
+        Args:
+            course_id: ID do curso
+            from_version: Versão de origem
+            to_version: Versão de destino (padrão: a mais recente)
+            
+        Returns:
+            Dict: Campo -> (valor antigo, valor novo)
+        """
+        return self.history.diff(course_id, from_version, to_version)
     
     def search_courses(self, query: str) -> List[Dict]:
         """
-        Busca cursos por texto
+        Busca cursos por texto no título, descrição e tema
+        
+        Usa o índice invertido: acentos são ignorados ("programacao" encontra
+        "programação"), plurais são reduzidos ao singular, todos os termos são
+        obrigatórios e o último termo (ou qualquer termo terminado em '*') é
+        buscado como prefixo.
         
         Args:
             query: Texto de busca
             
         Returns:
-            List[Dict]: Lista de cursos que correspondem à busca
+            List[Dict]: Cursos encontrados, do mais para o menos relevante
         """
-        all_courses = self.find_all()
-        query_lower = query.lower()
-        
-        matching_courses = []
-        for course in all_courses:
-            # Buscar no título, descrição e tema
-            searchable_text = f"{course.get('titulo', '')} {course.get('descricao', '')} {course.get('tema', '')}".lower()
-            if query_lower in searchable_text:
-                matching_courses.append(course)
-        
-        return matching_courses
+        return [dict(course) for course in self._search_index().search(query)]
     
     def get_courses_by_modality(self, modality: str) -> List[Dict]:
         """
@@ -219,8 +637,7 @@ class CourseRepository:
         Returns:
             List[Dict]: Lista de cursos da modalidade especificada
         """
-        all_courses = self.find_all()
-        return [course for course in all_courses if course.get('modalidade') == modality]
+        return [dict(course) for course in self._filtered({'modalidade': modality})]
     
     def get_courses_by_orgao(self, orgao: str) -> List[Dict]:
         """
@@ -232,8 +649,7 @@ class CourseRepository:
         Returns:
             List[Dict]: Lista de cursos do órgão especificado
         """
-        all_courses = self.find_all()
-        return [course for course in all_courses if course.get('orgao') == orgao]
+        return [dict(course) for course in self._filtered({'orgao': orgao})]
     
     def find_by_id(self, course_id: int) -> Optional[Dict]:
         """
@@ -252,62 +668,73 @@ class CourseRepository:
             print(f"Erro ao buscar curso por ID {course_id}: {str(e)}")
             return None
     
-    def _cleanup_old_course_files(self, course_id: int, existing_course: Dict):
+    def _course_manifest(self, course_id: int) -> Dict:
+        """
+        Obtém o manifesto de arquivos de um curso
+        
+        Cursos sem manifesto (ex.: índice perdido) fazem o índice ser
+        reconstruído a partir do catálogo uma única vez.
+        """
+        manifest = get_course_manifest(course_id)
+        if manifest is None:
+            rebuild_index(self._catalog_snapshot())
+            manifest = get_course_manifest(course_id)
+        return manifest or {}
+    
+    def _delete_artifacts(self, manifest: Dict, kinds: tuple = ('csv', 'pdf')):
+        """
+        Exclui os arquivos de um manifesto
+        
+        Capas e logos de parceiros podem ser compartilhados entre cursos e não
+        são excluídos aqui; os que deixarem de ser usados aparecem em
+        scripts/find_orphaned_files.py.
+        
+        Args:
+            manifest: Manifesto do curso
+            kinds: Tipos de artefato a excluir
+        """
+        for kind in kinds:
+            filename = manifest.get(kind)
+            if not filename:
+                continue
+            if kind == 'pdf':
+                # Um PDF ainda em geração não deve reaparecer depois da exclusão
+                self.pdf_jobs.cancel(filename)
+            path = locate_artifact(kind, filename)
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+                    print(f"Arquivo {kind.upper()} excluído: {filename}")
+            except Exception as e:
+                print(f"Erro ao excluir arquivo {kind.upper()} {filename}: {str(e)}")
+    
+    def _register_artifacts(self, course_data: Dict, content: Dict = None):
         """
-        Remove arquivos antigos de um curso antes de gerar novos
+        Registra no manifesto os arquivos gerados e enviados do curso
+        
+        Args:
+            course_data: Dados do curso (csv_file, pdf_file, capa_curso e parceiro_logo)
+            content: Hash do conteúdo de origem por tipo ('csv', 'pdf')
+        """
+        self._update_artifacts(
+            course_data['id'],
+            content=content,
+            csv=course_data.get('csv_file'),
+            pdf=course_data.get('pdf_file'),
+            cover=course_data.get('capa_curso'),
+            logo=course_data.get('parceiro_logo'),
+        )
+    
+    def _update_artifacts(self, course_id: int, content: Dict = None, **artifacts):
+        """
+        Atualiza o manifesto do curso (uma única gravação)
+        
+        No armazenamento em arquivos o manifesto fica em course_index.json.
         
         Args:
             course_id: ID do curso
-            existing_course: Dados do curso existente
+            content: Hash do conteúdo de origem por tipo ('csv', 'pdf')
+            **artifacts: Nome do arquivo por tipo (None remove o tipo)
         """
-        try:
-            course_id_str = str(course_id)
-            
-            # Buscar e remover arquivos CSV antigos
-            old_csv_files = []
-            
-            # Buscar por ID no nome do arquivo (formato novo)
-            for f in os.listdir(self.csv_dir):
-                if f"_{course_id_str}_" in f and f.endswith('.csv'):
-                    old_csv_files.append(f)
-            
-            # Buscar por nome do título (formato antigo - compatibilidade)
-            if existing_course.get('titulo'):
-                titulo_formatado = existing_course['titulo'].replace(' ', '_').replace('/', '_').replace('\\', '_')
-                for f in os.listdir(self.csv_dir):
-                    if titulo_formatado in f and f.endswith('.csv') and f"_{course_id_str}_" not in f:
-                        old_csv_files.append(f)
-            
-            # Remover arquivos CSV antigos
-            for csv_file in old_csv_files:
-                try:
-                    os.remove(os.path.join(self.csv_dir, csv_file))
-                    print(f"Arquivo CSV antigo removido: {csv_file}")
-                except Exception as e:
-                    print(f"Erro ao remover arquivo CSV antigo {csv_file}: {str(e)}")
-            
-            # Buscar e remover arquivos PDF antigos
-            old_pdf_files = []
-            
-            # Buscar por ID no nome do arquivo (formato novo)
-            for f in os.listdir(self.pdf_dir):
-                if f"_{course_id_str}_" in f and f.endswith('.pdf'):
-                    old_pdf_files.append(f)
-            
-            # Buscar por nome do título (formato antigo - compatibilidade)
-            if existing_course.get('titulo'):
-                titulo_formatado = existing_course['titulo'].replace(' ', '_').replace('/', '_').replace('\\', '_')
-                for f in os.listdir(self.pdf_dir):
-                    if titulo_formatado in f and f.endswith('.pdf') and f"_{course_id_str}_" not in f:
-                        old_pdf_files.append(f)
-            
-            # Remover arquivos PDF antigos
-            for pdf_file in old_pdf_files:
-                try:
-                    os.remove(os.path.join(self.pdf_dir, pdf_file))
-                    print(f"Arquivo PDF antigo removido: {pdf_file}")
-                except Exception as e:
-                    print(f"Erro ao remover arquivo PDF antigo {pdf_file}: {str(e)}")
-                    
-        except Exception as e:
-            print(f"Erro na limpeza de arquivos antigos para curso {course_id}: {str(e)}")
\ No newline at end of file
+        register_course_artifacts(course_id, content=content, **artifacts)
+
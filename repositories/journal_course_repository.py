@@ -0,0 +1,90 @@
+# repositories/journal_course_repository.py
+# Repositório de cursos armazenado em um diário JSONL somente de acréscimo
+
+from typing import Dict, Iterable, Optional
+from config import Config
+from repositories.course_repository import CourseRepository
+from scripts.course_journal import get_course_journal
+from scripts.id_manager import reconcile_last_id
+
+class JournalCourseRepository(CourseRepository):
+    """
+    Repositório de cursos em diário JSONL (ver scripts/course_journal.py)
+
+    O diário é o registro oficial dos cursos: cada gravação é um append e
+    cada leitura por ID um seek. Listagens, filtros, busca e contadores usam
+    os mesmos índices em memória do armazenamento em CSV, alimentados pelo
+    diário. Os arquivos CSV e PDF continuam sendo gerados como artefatos
+    derivados para download; os IDs vêm do contador em last_id.json.
+    """
+
+    def __init__(self, journal_path: str = None):
+        self.journal = get_course_journal(
+            journal_path or Config.JOURNAL_PATH,
+            compact_ratio=Config.JOURNAL_COMPACT_RATIO,
+            compact_min_records=Config.JOURNAL_COMPACT_MIN_RECORDS,
+        )
+        super().__init__()
+
+    def _reconcile_ids(self):
+        """Garante que o contador de IDs não reutilize IDs já gravados no diário"""
+        reconcile_last_id([self.journal.max_id()])
+
+    @staticmethod
+    def _journal_record(course_data: Dict) -> Dict:
+        """Registro gravado no diário"""
+        record = dict(course_data)
+        # Manter compatibilidade com os templates, que usam source_file para download
+        if record.get('csv_file'):
+            record['source_file'] = record['csv_file']
+        return record
+
+    def _store_course(self, course_data: Dict):
+        """Acrescenta a nova versão do curso ao diário"""
+        self.journal.append(self._journal_record(course_data))
+
+    def _remove_course(self, course_id: int):
+        """Registra a exclusão do curso no diário"""
+        super()._remove_course(course_id)
+        self.journal.delete(course_id)
+
+    def _catalog_snapshot(self) -> tuple:
+        """Snapshot do catálogo mantido pelo diário"""
+        return self.journal.get_snapshot()
+
+    def _catalog_index(self, name: str, factory):
+        """Índice derivado mantido pelo diário"""
+        return self.journal.get_index(name, factory)
+
+    def import_courses(self, courses: Iterable[Dict]) -> int:
+        """
+        Importa cursos em um único append, preservando os IDs (ex.: migração do CSV)
+
+        Args:
+            courses: Cursos a importar
+
+        Returns:
+            int: Quantidade de cursos importados
+        """
+        records = [self._journal_record(course) for course in courses if str(course.get('id', '')).isdigit()]
+        if not records:
+            return 0
+        self.journal.append_many(records)
+        self._reconcile_ids()
+        return len(records)
+
+    def find_by_id(self, course_id: int) -> Optional[Dict]:
+        """
+        Busca um curso pelo ID (uma leitura posicionada no diário)
+
+        Args:
+            course_id: ID do curso
+
+        Returns:
+            Dict ou None: Dados do curso se encontrado
+        """
+        try:
+            return self.journal.read(course_id)
+        except Exception as e:
+            print(f"Erro ao buscar curso por ID {course_id}: {str(e)}")
+            return None
@@ -0,0 +1,161 @@
+# repositories/mysql_course_repository.py
+# Repositório de cursos armazenado em MySQL (compartilhado entre workers e hosts)
+
+import threading
+from contextlib import contextmanager
+from config import Config
+from repositories.sql_course_repository import SQLCourseRepository, COURSE_COLUMNS
+from scripts.id_manager import get_current_id
+
+try:
+    from mysql.connector import pooling
+except ImportError:  # Dependência opcional, necessária apenas com STORAGE_ENGINE=mysql
+    pooling = None
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS courses (
+        id INT UNSIGNED NOT NULL PRIMARY KEY,
+        titulo VARCHAR(255) NOT NULL DEFAULT '',
+        orgao VARCHAR(255) NOT NULL DEFAULT '',
+        modalidade VARCHAR(50) NOT NULL DEFAULT '',
+        tema VARCHAR(255) NOT NULL DEFAULT '',
+        tipo_acao VARCHAR(100) NOT NULL DEFAULT '',
+        curso_gratuito VARCHAR(10) NOT NULL DEFAULT '',
+        total_vagas INT UNSIGNED NOT NULL DEFAULT 0,
+        inicio_inscricoes VARCHAR(10) NOT NULL DEFAULT '',
+        fim_inscricoes VARCHAR(10) NOT NULL DEFAULT '',
+        inicio_aulas VARCHAR(10) NOT NULL DEFAULT '',
+        fim_aulas VARCHAR(10) NOT NULL DEFAULT '',
+        bairros VARCHAR(1024) NOT NULL DEFAULT '',
+        created_at VARCHAR(32) NOT NULL DEFAULT '',
+        updated_at VARCHAR(32) NOT NULL DEFAULT '',
+        search_text MEDIUMTEXT NOT NULL,
+        data MEDIUMTEXT NOT NULL,
+        INDEX idx_courses_orgao (orgao),
+        INDEX idx_courses_modalidade (modalidade),
+        INDEX idx_courses_tema (tema),
+        INDEX idx_courses_tipo_acao (tipo_acao),
+        INDEX idx_courses_created_at (created_at),
+        INDEX idx_courses_updated_at (updated_at),
+        INDEX idx_courses_inscricoes (inicio_inscricoes, fim_inscricoes),
+        INDEX idx_courses_fim_inscricoes (fim_inscricoes),
+        INDEX idx_courses_aulas (inicio_aulas, fim_aulas)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS course_artifacts (
+        id INT UNSIGNED NOT NULL PRIMARY KEY,
+        manifest MEDIUMTEXT NOT NULL
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS course_id_sequence (
+        name VARCHAR(32) NOT NULL PRIMARY KEY,
+        value INT UNSIGNED NOT NULL
+    ) ENGINE=InnoDB
+    """,
+)
+
+class MySQLCourseRepository(SQLCourseRepository):
+    """
+    Repositório de cursos em MySQL
+
+    Usa um pool de conexões limitado (Config.MYSQL_POOL_SIZE) e comandos
+    preparados no servidor. Permite que vários workers WSGI, inclusive em
+    hosts diferentes, compartilhem o mesmo catálogo.
+    """
+
+    placeholder = '%s'
+    row_lock = ' FOR UPDATE'
+
+    def __init__(self, pool_size: int = None):
+        if pooling is None:
+            raise ImportError(
+                "O pacote 'mysql-connector-python' é necessário para STORAGE_ENGINE=mysql"
+            )
+        super().__init__()
+        pool_size = pool_size or Config.MYSQL_POOL_SIZE
+        self._pool = pooling.MySQLConnectionPool(
+            pool_name='webciclo',
+            pool_size=pool_size,
+            host=Config.MYSQL_HOST,
+            port=Config.MYSQL_PORT,
+            user=Config.MYSQL_USER,
+            password=Config.MYSQL_PASSWORD,
+            database=Config.MYSQL_DATABASE,
+            charset='utf8mb4',
+            autocommit=False,
+        )
+        # O pool do conector falha quando esgotado; o semáforo faz as
+        # requisições excedentes aguardarem uma conexão livre
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._create_schema()
+
+    @contextmanager
+    def _cursor(self, write: bool = False, batch: bool = False):
+        """
+        Fornece um cursor de uma conexão do pool
+
+        Consultas usam comandos preparados; importações em lote usam o cursor
+        comum, cujo executemany agrupa as linhas em um único INSERT.
+        """
+        if not self._slots.acquire(timeout=Config.MYSQL_POOL_TIMEOUT):
+            raise TimeoutError("Nenhuma conexão MySQL disponível no pool")
+        try:
+            conn = self._pool.get_connection()
+            try:
+                cursor = conn.cursor(prepared=not batch)
+                try:
+                    yield cursor
+                    if write:
+                        conn.commit()
+                    else:
+                        # Encerrar o snapshot de leitura para enxergar gravações de outros workers
+                        conn.rollback()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    cursor.close()
+            finally:
+                # Devolve a conexão ao pool
+                conn.close()
+        finally:
+            self._slots.release()
+
+    def _upsert_sql(self) -> str:
+        """Comando que insere ou substitui um curso"""
+        columns = ', '.join(COURSE_COLUMNS)
+        values = ', '.join('%s' for _ in COURSE_COLUMNS)
+        updates = ', '.join(f'{column} = VALUES({column})' for column in COURSE_COLUMNS if column != 'id')
+        return f'INSERT INTO courses ({columns}) VALUES ({values}) ON DUPLICATE KEY UPDATE {updates}'
+
+    def _upsert_manifest_sql(self) -> str:
+        """Comando que insere ou substitui o manifesto de um curso"""
+        return 'INSERT INTO course_artifacts (id, manifest) VALUES (%s, %s) ON DUPLICATE KEY UPDATE manifest = VALUES(manifest)'
+
+    def _create_schema(self):
+        """Cria tabelas, índices e a sequência de IDs se ainda não existirem"""
+        with self._cursor(write=True, batch=True) as cursor:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            # Iniciar a sequência após o maior ID já usado (banco ou last_id.json)
+            cursor.execute('SELECT COALESCE(MAX(id), 0) FROM courses')
+            max_id = cursor.fetchone()[0]
+            cursor.execute(
+                "INSERT IGNORE INTO course_id_sequence (name, value) VALUES ('courses', %s)",
+                (max(max_id, get_current_id()),)
+            )
+
+    def _next_id(self) -> int:
+        """
+        Obtém o próximo ID a partir da sequência do banco
+
+        LAST_INSERT_ID(expr) torna o incremento atômico e o valor é lido na
+        mesma conexão, sem corrida entre workers.
+        """
+        with self._cursor(write=True) as cursor:
+            cursor.execute("UPDATE course_id_sequence SET value = LAST_INSERT_ID(value + 1) WHERE name = 'courses'")
+            cursor.execute('SELECT LAST_INSERT_ID()')
+            return int(cursor.fetchone()[0])
@@ -0,0 +1,489 @@
+# repositories/sql_course_repository.py
+# Base comum para os repositórios de cursos em banco de dados SQL
+
+import json
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+from repositories.course_repository import CourseRepository, SORT_OPTIONS, FILTER_FIELDS, clean_filters
+from scripts.search_index import fold_text
+from scripts.catalog_stats import FACET_FIELDS, total_vagas
+from scripts.interval_index import INTERVAL_FILTERS, EXCLUDE_CLOSED_FILTER, course_window
+from scripts.course_index import artifact_file_hashes, manifest_from_course, update_manifest
+from models.course import record_timestamp, units_of
+
+# Colunas gravadas para cada curso (o registro completo fica em "data")
+COURSE_COLUMNS = ('id', 'titulo', 'orgao', 'modalidade', 'tema', 'tipo_acao', 'curso_gratuito', 'total_vagas',
+                  'inicio_inscricoes', 'fim_inscricoes', 'inicio_aulas', 'fim_aulas', 'bairros',
+                  'created_at', 'updated_at', 'search_text', 'data')
+
+# Colunas (início, fim) de cada período indexado
+WINDOW_COLUMNS = {
+    'inscricoes': ('inicio_inscricoes', 'fim_inscricoes'),
+    'aulas': ('inicio_aulas', 'fim_aulas'),
+}
+
+# Quantidade de linhas por lote nas importações
+IMPORT_BATCH_SIZE = 500
+
+# Quantidade de linhas lidas por vez ao percorrer o catálogo
+FETCH_BATCH_SIZE = 200
+
+def _iso_window(course: Dict, window: str) -> tuple:
+    """Início e fim de um período em ISO (AAAA-MM-DD), ou ('', '') se o período não está completo"""
+    interval = course_window(course, window)
+    return (interval[0].isoformat(), interval[1].isoformat()) if interval else ('', '')
+
+def _bairros(course: Dict) -> str:
+    """Bairros das unidades delimitados por '|' ('|Centro|Torre|'), para busca com LIKE"""
+    bairros = [unit.bairro.strip() for unit in units_of(course) if unit.bairro.strip()]
+    return f"|{'|'.join(bairros)}|" if bairros else ''
+
+def _search_text(course: Dict) -> str:
+    """Texto pesquisável do curso (título, descrição e tema), sem acentos e em minúsculas"""
+    return fold_text(f"{course.get('titulo', '')} {course.get('descricao', '')} {course.get('tema', '')}")
+
+def _escape_like(value: str) -> str:
+    """Escapa os curingas do operador LIKE usando '!' como caractere de escape"""
+    return value.replace('!', '!!').replace('%', '!%').replace('_', '!_')
+
+def _search_clause(query: str) -> tuple:
+    """
+    Monta a condição de busca textual: cada palavra deve aparecer (AND),
+    comparando o texto sem acentos
+    """
+    words = fold_text(query).split() or ['']
+    clause = ' AND '.join("search_text LIKE ? ESCAPE '!'" for _ in words)
+    return clause, [f'%{_escape_like(word)}%' for word in words]
+
+class SQLCourseRepository(CourseRepository):
+    """
+    Base dos repositórios de cursos em banco SQL
+
+    O banco é o registro oficial dos cursos; os arquivos CSV e PDF de cada
+    curso continuam sendo gerados como artefatos derivados para download.
+    O manifesto desses arquivos e os hashes de conteúdo ficam na tabela
+    course_artifacts, então todos os hosts que compartilham o banco veem o
+    mesmo manifesto (course_index.json é usado apenas pelo armazenamento em
+    CSV). As subclasses definem a conexão (_cursor), o esquema, a sequência
+    de IDs e o dialeto (marcador de parâmetro, trava de linha e comandos de
+    upsert).
+    """
+
+    # Marcador de parâmetro do driver (sqlite3 usa '?', MySQL usa '%s')
+    placeholder = '?'
+
+    # Sufixo do SELECT que trava a linha lida até o fim da transação (MySQL:
+    # ' FOR UPDATE'; no SQLite a transação BEGIN IMMEDIATE já é exclusiva)
+    row_lock = ''
+
+    @contextmanager
+    def _cursor(self, write: bool = False, batch: bool = False):
+        """Fornece um cursor; com write=True o bloco roda em uma transação"""
+        raise NotImplementedError
+
+    def _upsert_sql(self) -> str:
+        """Comando que insere ou substitui um curso"""
+        raise NotImplementedError
+
+    def _upsert_manifest_sql(self) -> str:
+        """Comando que insere ou substitui o manifesto de um curso (id, manifest)"""
+        raise NotImplementedError
+
+    def _reconcile_ids(self):
+        """A sequência de IDs vive no banco; não há contador em arquivo a reconciliar"""
+        pass
+
+    def _sql(self, statement: str) -> str:
+        """Adapta os marcadores '?' do comando ao driver em uso"""
+        return statement if self.placeholder == '?' else statement.replace('?', self.placeholder)
+
+    def _row_params(self, course_data: Dict) -> tuple:
+        """Monta os parâmetros de gravação de um curso"""
+        record = dict(course_data)
+        # Manter compatibilidade com os templates, que usam source_file para download
+        if record.get('csv_file'):
+            record['source_file'] = record['csv_file']
+        return (
+            int(record['id']),
+            record.get('titulo') or '',
+            record.get('orgao') or '',
+            record.get('modalidade') or '',
+            record.get('tema') or '',
+            record.get('tipo_acao') or '',
+            record.get('curso_gratuito') or '',
+            total_vagas(record),
+            *_iso_window(record, 'inscricoes'),
+            *_iso_window(record, 'aulas'),
+            _bairros(record),
+            record_timestamp(record, 'created_at'),
+            record_timestamp(record, 'updated_at'),
+            _search_text(record),
+            json.dumps(record, ensure_ascii=False),
+        )
+
+    def _bump_sequence(self, cursor, min_value: int):
+        """Garante que a sequência de IDs seja pelo menos min_value"""
+        cursor.execute(
+            self._sql("UPDATE course_id_sequence SET value = CASE WHEN value < ? THEN ? ELSE value END WHERE name = 'courses'"),
+            (min_value, min_value)
+        )
+
+    def _store_course(self, course_data: Dict):
+        """Grava (insere ou substitui) o registro do curso no banco"""
+        with self._cursor(write=True) as cursor:
+            cursor.execute(self._upsert_sql(), self._row_params(course_data))
+
+    def _remove_course(self, course_id: int):
+        """Remove o registro e o manifesto do curso do banco"""
+        with self._cursor(write=True) as cursor:
+            cursor.execute(self._sql('DELETE FROM courses WHERE id = ?'), (int(course_id),))
+            cursor.execute(self._sql('DELETE FROM course_artifacts WHERE id = ?'), (int(course_id),))
+
+    def _catalog_snapshot(self) -> tuple:
+        """Snapshot do catálogo lido do banco (mais recente primeiro)"""
+        return tuple(self.iter_courses())
+
+    def _course_manifest(self, course_id: int) -> Dict:
+        """
+        Obtém o manifesto de arquivos de um curso gravado no banco
+
+        Cursos sem manifesto (ex.: importados do CSV) usam o montado a partir
+        do próprio registro, sem hashes.
+        """
+        with self._cursor() as cursor:
+            cursor.execute(self._sql('SELECT manifest FROM course_artifacts WHERE id = ?'), (int(course_id),))
+            row = cursor.fetchone()
+        if row:
+            return json.loads(row[0])
+        course = self.find_by_id(course_id)
+        return manifest_from_course(course) if course and course.get('source_file') else {}
+
+    def _update_artifacts(self, course_id: int, content: Dict = None, **artifacts):
+        """
+        Atualiza o manifesto do curso no banco
+
+        O manifesto é lido e regravado na mesma transação, com a linha
+        travada: gravações simultâneas de outros workers ou hosts não se
+        perdem. Os hashes dos arquivos são calculados antes da transação.
+
+        Args:
+            course_id: ID do curso
+            content: Hash do conteúdo de origem por tipo ('csv', 'pdf')
+            **artifacts: Nome do arquivo por tipo (None remove o tipo)
+        """
+        file_hashes = artifact_file_hashes(artifacts)
+        with self._cursor(write=True) as cursor:
+            cursor.execute(
+                self._sql(f'SELECT manifest FROM course_artifacts WHERE id = ?{self.row_lock}'), (int(course_id),)
+            )
+            row = cursor.fetchone()
+            manifest = update_manifest(json.loads(row[0]) if row else {}, artifacts, file_hashes, content)
+            cursor.execute(self._upsert_manifest_sql(), (int(course_id), json.dumps(manifest, ensure_ascii=False)))
+
+    def _query(self, where: str = '', params: tuple = ()) -> List[Dict]:
+        """Executa uma consulta e devolve os cursos (mais recente primeiro)"""
+        sql = self._sql(f'SELECT data FROM courses {where} ORDER BY created_at DESC, id DESC')
+        with self._cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def _where(self, filters: Dict) -> tuple:
+        """Monta a cláusula WHERE (sem a palavra-chave) e os parâmetros dos filtros"""
+        clauses = []
+        params = []
+        for field in FILTER_FIELDS:
+            if filters.get(field):
+                clauses.append(f'{field} = ?')
+                params.append(filters[field])
+        if filters.get('bairro'):
+            clauses.append("bairros LIKE ? ESCAPE '!'")
+            params.append(f"%|{_escape_like(filters['bairro'])}|%")
+        for name, (window, query) in INTERVAL_FILTERS.items():
+            value = filters.get(name)
+            if not value:
+                continue
+            start, end = WINDOW_COLUMNS[window]
+            if query == 'covering':
+                clauses.append(f"{start} <> '' AND {start} <= ? AND {end} >= ?")
+                params.extend([value.isoformat()] * 2)
+            else:
+                column = start if query == 'starting' else end
+                clauses.append(f"{column} <> '' AND {column} BETWEEN ? AND ?")
+                params.extend([value[0].isoformat(), value[1].isoformat()])
+        if filters.get(EXCLUDE_CLOSED_FILTER):
+            clauses.append("(fim_inscricoes = '' OR fim_inscricoes >= ?)")
+            params.append(filters[EXCLUDE_CLOSED_FILTER].isoformat())
+        if filters.get('search'):
+            clause, search_params = _search_clause(filters['search'])
+            clauses.append(clause)
+            params.extend(search_params)
+        if 'ids' in filters:
+            ids = sorted(int(course_id) for course_id in filters['ids'] if course_id.isdigit())
+            clauses.append(f"id IN ({', '.join('?' for _ in ids)})" if ids else '1 = 0')
+            params.extend(ids)
+        if filters.get('exclude_ids'):
+            ids = sorted(int(course_id) for course_id in filters['exclude_ids'] if course_id.isdigit())
+            if ids:
+                clauses.append(f"id NOT IN ({', '.join('?' for _ in ids)})")
+                params.extend(ids)
+        return ' AND '.join(clauses), params
+
+    def _order_by(self, sort: str) -> tuple:
+        """Retorna a coluna de ordenação e a direção ('DESC' ou 'ASC')"""
+        if sort not in SORT_OPTIONS:
+            raise ValueError(f"Ordenação inválida: {sort}")
+        column, descending = SORT_OPTIONS[sort]
+        return column, 'DESC' if descending else 'ASC'
+
+    def iter_courses(self, sort: str = 'recent', filters: Dict = None) -> Iterator[Dict]:
+        """
+        Percorre os cursos sob demanda, lendo o resultado em blocos
+
+        Cada bloco de FETCH_BATCH_SIZE cursos é uma consulta própria, que
+        continua após (valor, id) do último curso do bloco anterior; a
+        conexão volta ao pool entre os blocos, então um consumidor lento não
+        a retém até o fim da iteração.
+
+        Args:
+            sort: Nome da ordenação (ver SORT_OPTIONS)
+            filters: Filtros por campo (FILTER_FIELDS), 'search' para busca textual e ID_FILTERS
+
+        Yields:
+            Dict: Dados de cada curso
+        """
+        where, params = self._where(clean_filters(filters))
+        column, direction = self._order_by(sort)
+        comparison = '<' if direction == 'DESC' else '>'
+        keyset = f'({column} {comparison} ? OR ({column} = ? AND id {comparison} ?))'
+        last = None
+        while True:
+            batch_where, batch_params = where, list(params)
+            if last is not None:
+                batch_where = f'{where} AND {keyset}' if where else keyset
+                batch_params += [last[0], last[0], last[1]]
+            sql = (f'SELECT {column}, id, data FROM courses {"WHERE " + batch_where if batch_where else ""} '
+                   f'ORDER BY {column} {direction}, id {direction} LIMIT ?')
+            with self._cursor() as cursor:
+                cursor.execute(self._sql(sql), tuple(batch_params) + (FETCH_BATCH_SIZE,))
+                rows = cursor.fetchall()
+            for row in rows:
+                yield json.loads(row[2])
+            if len(rows) < FETCH_BATCH_SIZE:
+                break
+            last = rows[-1][:2]
+
+    def find_page(self, offset: int = 0, limit: int = 20, sort: str = 'recent',
+                  filters: Dict = None, cursor: str = None) -> Dict:
+        """
+        Retorna uma página de cursos usando LIMIT/OFFSET ou paginação por chave
+
+        Args:
+            offset: Posição inicial (ignorado quando cursor é informado)
+            limit: Quantidade máxima de cursos na página
+            sort: Nome da ordenação (ver SORT_OPTIONS)
+            filters: Filtros por campo (FILTER_FIELDS), 'search' para busca textual e ID_FILTERS
+            cursor: ID do último curso da página anterior
+
+        Returns:
+            Dict: courses, total, offset, limit, has_next e next_cursor
+        """
+        where, params = self._where(clean_filters(filters))
+        column, direction = self._order_by(sort)
+        offset = max(int(offset or 0), 0)
+
+        with self._cursor() as db:
+            db.execute(self._sql(f'SELECT COUNT(*) FROM courses {"WHERE " + where if where else ""}'), tuple(params))
+            total = db.fetchone()[0]
+
+            page_where, page_params = where, list(params)
+            anchor = None
+            if cursor is not None and str(cursor).isdigit():
+                db.execute(self._sql(f'SELECT {column}, id FROM courses WHERE id = ?'), (int(cursor),))
+                anchor = db.fetchone()
+            if anchor is not None:
+                # Paginação por chave: continua após (valor, id) do cursor
+                comparison = '<' if direction == 'DESC' else '>'
+                keyset = f'({column} {comparison} ? OR ({column} = ? AND id {comparison} ?))'
+                page_where = f'{where} AND {keyset}' if where else keyset
+                page_params += [anchor[0], anchor[0], anchor[1]]
+
+                db.execute(
+                    self._sql(f'SELECT COUNT(*) FROM courses WHERE {page_where}'), tuple(page_params)
+                )
+                offset = total - db.fetchone()[0]
+                sql = f'SELECT data FROM courses WHERE {page_where} ORDER BY {column} {direction}, id {direction} LIMIT ?'
+                db.execute(self._sql(sql), tuple(page_params) + (limit + 1,))
+            else:
+                sql = (f'SELECT data FROM courses {"WHERE " + where if where else ""} '
+                       f'ORDER BY {column} {direction}, id {direction} LIMIT ? OFFSET ?')
+                db.execute(self._sql(sql), tuple(params) + (limit + 1, offset))
+            rows = db.fetchall()
+
+        has_next = len(rows) > limit
+        courses = [json.loads(row[0]) for row in rows[:limit]]
+        return {
+            'courses': courses,
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'has_next': has_next,
+            'next_cursor': str(courses[-1].get('id')) if courses and has_next else None,
+        }
+
+    def distinct_values(self, field: str) -> List[str]:
+        """
+        Valores distintos (não vazios) de uma coluna indexada, em ordem alfabética
+
+        Args:
+            field: Nome da coluna (ver FILTER_FIELDS)
+
+        Returns:
+            List[str]: Valores distintos
+        """
+        if field == 'bairro':
+            with self._cursor() as cursor:
+                cursor.execute("SELECT DISTINCT bairros FROM courses WHERE bairros <> ''")
+                return sorted({bairro for row in cursor.fetchall() for bairro in row[0].split('|') if bairro})
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Campo inválido: {field}")
+        with self._cursor() as cursor:
+            cursor.execute(f"SELECT DISTINCT {field} FROM courses WHERE {field} <> '' ORDER BY {field}")
+            return [row[0] for row in cursor.fetchall()]
+
+    def get_facet_counts(self, inserted_ids: Iterable = (), today: date = None) -> Dict:
+        """
+        Contadores agregados do catálogo, calculados com agregações no banco
+
+        Args:
+            inserted_ids: IDs marcados como inseridos (CourseStatusService)
+            today: Dia usado para contar as inscrições abertas (padrão: hoje)
+
+        Returns:
+            Dict: total, inserted, gratuitos, pagos, total_vagas, inscricoes_abertas
+                e contagens por modalidade, orgao e tema
+        """
+        ids = sorted({int(course_id) for course_id in inserted_ids if str(course_id).isdigit()})
+        today = (today or date.today()).isoformat()
+        with self._cursor() as cursor:
+            cursor.execute(self._sql(
+                "SELECT COUNT(*), COALESCE(SUM(total_vagas), 0), "
+                "COALESCE(SUM(CASE WHEN curso_gratuito = 'sim' THEN 1 ELSE 0 END), 0), "
+                "COALESCE(SUM(CASE WHEN curso_gratuito = 'nao' THEN 1 ELSE 0 END), 0), "
+                "COALESCE(SUM(CASE WHEN inicio_inscricoes <> '' AND inicio_inscricoes <= ? "
+                "AND fim_inscricoes >= ? THEN 1 ELSE 0 END), 0) FROM courses"
+            ), (today, today))
+            total, vagas, gratuitos, pagos, abertas = cursor.fetchone()
+            facets = {
+                'total': int(total),
+                'inserted': 0,
+                'gratuitos': int(gratuitos),
+                'pagos': int(pagos),
+                'total_vagas': int(vagas),
+                'inscricoes_abertas': int(abertas),
+            }
+            if ids:
+                cursor.execute(self._sql(f"SELECT COUNT(*) FROM courses WHERE id IN ({', '.join('?' for _ in ids)})"), tuple(ids))
+                facets['inserted'] = int(cursor.fetchone()[0])
+            for field in FACET_FIELDS:
+                cursor.execute(f"SELECT {field}, COUNT(*) FROM courses WHERE {field} <> '' GROUP BY {field} ORDER BY {field}")
+                facets[field] = {value: int(count) for value, count in cursor.fetchall()}
+        return facets
+
+    def import_courses(self, courses: Iterable[Dict]) -> int:
+        """
+        Importa cursos em lotes, preservando os IDs (ex.: migração do CSV)
+
+        Args:
+            courses: Cursos a importar
+
+        Returns:
+            int: Quantidade de cursos importados
+        """
+        params = [self._row_params(course) for course in courses if str(course.get('id', '')).isdigit()]
+        if not params:
+            return 0
+
+        with self._cursor(write=True, batch=True) as cursor:
+            for start in range(0, len(params), IMPORT_BATCH_SIZE):
+                cursor.executemany(self._upsert_sql(), params[start:start + IMPORT_BATCH_SIZE])
+            # Garantir que a sequência não reutilize IDs importados
+            self._bump_sequence(cursor, max(row[0] for row in params))
+        return len(params)
+
+    def find_by_id(self, course_id: int) -> Optional[Dict]:
+        """
+        Busca um curso pelo ID (chave primária)
+
+        Args:
+            course_id: ID do curso
+
+        Returns:
+            Dict ou None: Dados do curso se encontrado
+        """
+        try:
+            with self._cursor() as cursor:
+                cursor.execute(self._sql('SELECT data FROM courses WHERE id = ?'), (int(course_id),))
+                row = cursor.fetchone()
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            print(f"Erro ao buscar curso por ID {course_id}: {str(e)}")
+            return None
+
+    def existing_ids(self, course_ids: Iterable[int]) -> Set[int]:
+        """IDs de cursos existentes entre os informados (uma consulta)"""
+        ids = sorted({int(course_id) for course_id in course_ids})
+        if not ids:
+            return set()
+        with self._cursor() as cursor:
+            cursor.execute(self._sql(f"SELECT id FROM courses WHERE id IN ({', '.join('?' for _ in ids)})"), tuple(ids))
+            return {int(row[0]) for row in cursor.fetchall()}
+
+    def find_all(self) -> List[Dict]:
+        """
+        Lista todos os cursos
+
+        Returns:
+            List[Dict]: Lista de todos os cursos
+        """
+        return self._query()
+
+    def search_courses(self, query: str) -> List[Dict]:
+        """
+        Busca cursos por texto no título, descrição e tema
+
+        Acentos são ignorados e todas as palavras da consulta são obrigatórias.
+
+        Args:
+            query: Texto de busca
+
+        Returns:
+            List[Dict]: Lista de cursos que correspondem à busca
+        """
+        clause, params = _search_clause(query)
+        return self._query(f'WHERE {clause}', tuple(params))
+
+    def get_courses_by_modality(self, modality: str) -> List[Dict]:
+        """
+        Busca cursos por modalidade
+
+        Args:
+            modality: Modalidade do curso
+
+        Returns:
+            List[Dict]: Lista de cursos da modalidade especificada
+        """
+        return self._query('WHERE modalidade = ?', (modality,))
+
+    def get_courses_by_orgao(self, orgao: str) -> List[Dict]:
+        """
+        Busca cursos por órgão responsável
+
+        Args:
+            orgao: Órgão responsável
+
+        Returns:
+            List[Dict]: Lista de cursos do órgão especificado
+        """
+        return self._query('WHERE orgao = ?', (orgao,))
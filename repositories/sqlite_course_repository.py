@@ -0,0 +1,122 @@
+# repositories/sqlite_course_repository.py
+# Repositório de cursos armazenado em SQLite
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from config import Config
+from repositories.sql_course_repository import SQLCourseRepository, COURSE_COLUMNS
+from scripts.id_manager import get_current_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS courses (
+    id INTEGER PRIMARY KEY,
+    titulo TEXT NOT NULL DEFAULT '',
+    orgao TEXT NOT NULL DEFAULT '',
+    modalidade TEXT NOT NULL DEFAULT '',
+    tema TEXT NOT NULL DEFAULT '',
+    tipo_acao TEXT NOT NULL DEFAULT '',
+    curso_gratuito TEXT NOT NULL DEFAULT '',
+    total_vagas INTEGER NOT NULL DEFAULT 0,
+    inicio_inscricoes TEXT NOT NULL DEFAULT '',
+    fim_inscricoes TEXT NOT NULL DEFAULT '',
+    inicio_aulas TEXT NOT NULL DEFAULT '',
+    fim_aulas TEXT NOT NULL DEFAULT '',
+    bairros TEXT NOT NULL DEFAULT '',
+    created_at TEXT NOT NULL DEFAULT '',
+    updated_at TEXT NOT NULL DEFAULT '',
+    search_text TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_courses_orgao ON courses (orgao);
+CREATE INDEX IF NOT EXISTS idx_courses_modalidade ON courses (modalidade);
+CREATE INDEX IF NOT EXISTS idx_courses_tema ON courses (tema);
+CREATE INDEX IF NOT EXISTS idx_courses_tipo_acao ON courses (tipo_acao);
+CREATE INDEX IF NOT EXISTS idx_courses_created_at ON courses (created_at);
+CREATE INDEX IF NOT EXISTS idx_courses_updated_at ON courses (updated_at);
+CREATE INDEX IF NOT EXISTS idx_courses_inscricoes ON courses (inicio_inscricoes, fim_inscricoes);
+CREATE INDEX IF NOT EXISTS idx_courses_fim_inscricoes ON courses (fim_inscricoes);
+CREATE INDEX IF NOT EXISTS idx_courses_aulas ON courses (inicio_aulas, fim_aulas);
+CREATE TABLE IF NOT EXISTS course_artifacts (
+    id INTEGER PRIMARY KEY,
+    manifest TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS course_id_sequence (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+class SQLiteCourseRepository(SQLCourseRepository):
+    """Repositório de cursos em SQLite (modo WAL)"""
+
+    placeholder = '?'
+
+    def __init__(self, db_path: str = None):
+        super().__init__()
+        self.db_path = db_path or Config.SQLITE_PATH
+        self._local = threading.local()
+        self._create_schema()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Retorna a conexão da thread atual (uma conexão por thread)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # isolation_level=None: transações controladas explicitamente
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _cursor(self, write: bool = False, batch: bool = False):
+        """Fornece um cursor; escritas rodam em transação BEGIN IMMEDIATE"""
+        conn = self._connection()
+        cursor = conn.cursor()
+        if not write:
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+            return
+
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            yield cursor
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+        else:
+            cursor.execute('COMMIT')
+        finally:
+            cursor.close()
+
+    def _upsert_sql(self) -> str:
+        """Comando que insere ou substitui um curso"""
+        columns = ', '.join(COURSE_COLUMNS)
+        values = ', '.join('?' for _ in COURSE_COLUMNS)
+        return f'INSERT OR REPLACE INTO courses ({columns}) VALUES ({values})'
+
+    def _upsert_manifest_sql(self) -> str:
+        """Comando que insere ou substitui o manifesto de um curso"""
+        return 'INSERT OR REPLACE INTO course_artifacts (id, manifest) VALUES (?, ?)'
+
+    def _create_schema(self):
+        """Cria tabelas, índices e a sequência de IDs se ainda não existirem"""
+        self._connection().executescript(SCHEMA)
+        with self._cursor(write=True) as cursor:
+            # Iniciar a sequência após o maior ID já usado (banco ou last_id.json)
+            cursor.execute('SELECT COALESCE(MAX(id), 0) FROM courses')
+            max_id = cursor.fetchone()[0]
+            cursor.execute(
+                "INSERT OR IGNORE INTO course_id_sequence (name, value) VALUES ('courses', ?)",
+                (max(max_id, get_current_id()),)
+            )
+
+    def _next_id(self) -> int:
+        """Obtém o próximo ID a partir da sequência do banco"""
+        with self._cursor(write=True) as cursor:
+            cursor.execute("UPDATE course_id_sequence SET value = value + 1 WHERE name = 'courses'")
+            cursor.execute("SELECT value FROM course_id_sequence WHERE name = 'courses'")
+            return cursor.fetchone()[0]
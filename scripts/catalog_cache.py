@@ -0,0 +1,363 @@
+# catalog_cache.py
+# Cache em memória do catálogo de cursos com detecção de alterações por arquivo
+
+import csv
+import os
+import pickle
+import threading
+import time
+from scripts.catalog_encoding import encode_record
+from scripts.sort_index import SortIndex
+from scripts.file_lock import atomic_write
+
+# Versão do formato do snapshot binário; snapshots de outra versão são ignorados
+SNAPSHOT_FORMAT = 1
+
+# Diretórios com mtime mais recente que isto (em relação à varredura) são
+# relidos na próxima sincronização: o mtime tem resolução grosseira em alguns
+# sistemas de arquivos e duas alterações no mesmo intervalo não o mudariam
+RACY_WINDOW_NS = 1_000_000_000
+
+
+def parse_course_file(csv_file):
+    """
+    Lê um arquivo CSV de curso e retorna o registro mais completo.
+
+    Args:
+        csv_file (str): Caminho do arquivo CSV.
+
+    Returns:
+        dict: Dados do curso ou None se o arquivo não tiver linhas válidas.
+    """
+    with open(csv_file, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        valid_rows = []
+        for row in reader:
+            # Verificar se a linha tem todos os campos necessários
+            if row and 'id' in row and 'titulo' in row:
+                # Adicionar o nome do arquivo como referência
+                row['file_id'] = row.get('id', '')
+                row['source_file'] = os.path.basename(csv_file)
+                valid_rows.append(row)
+
+    # Se houver linhas válidas, usar apenas a última (mais completa)
+    return valid_rows[-1] if valid_rows else None
+
+
+# Ordem do snapshot (ver SortIndex): data de criação, mais recente primeiro,
+# comparando o timestamp em ISO e não o texto de exibição (DD-MM-AAAA)
+SNAPSHOT_ORDER = {'recent': ('created_at', True)}
+
+
+class CatalogCache:
+    """
+    Cache do catálogo de cursos que vive no processo.
+
+    Cada arquivo CSV é identificado por uma impressão digital (mtime, tamanho).
+    A cada leitura apenas os arquivos novos ou alterados são relidos, e o
+    resultado é entregue como um snapshot imutável (tupla de registros
+    somente leitura, ver scripts/catalog_encoding.py). A ordem do snapshot é
+    mantida por um SortIndex que, como os demais índices, recebe apenas as
+    alterações; montar o snapshot de uma nova geração não reordena o catálogo.
+
+    Para saber se algo mudou basta um stat por diretório (base e shards):
+    criar, excluir ou renomear um arquivo altera o mtime do diretório, e só
+    os diretórios alterados são listados de novo. Edições feitas no próprio
+    arquivo, sem rename (ex.: um editor externo), não mudam o diretório e são
+    percebidas na varredura completa feita a cada full_scan_interval
+    segundos; a aplicação grava os CSV com rename (ver csv_generator).
+
+    Índices derivados do catálogo (busca textual, filtros, contadores) são
+    registrados com get_index() e recebem apenas os registros removidos e
+    adicionados a cada recarga, em vez de serem reconstruídos.
+
+    Com snapshot_path, as entradas já lidas são gravadas em um snapshot
+    binário (pickle), no máximo uma vez a cada persist_interval segundos. Um
+    processo que acaba de iniciar carrega esse arquivo com uma única leitura
+    e relê apenas os CSV cuja impressão digital mudou desde então. O arquivo
+    é gerado pela própria aplicação e não deve vir de fontes externas.
+    """
+
+    def __init__(self, csv_dir, snapshot_path=None, full_scan_interval=300, persist_interval=60):
+        self.csv_dir = csv_dir
+        self.snapshot_path = snapshot_path
+        self.full_scan_interval = full_scan_interval
+        self.persist_interval = persist_interval
+        self.generation = 0
+        self._lock = threading.Lock()
+        self._entries = {}  # caminho -> (impressão digital, registro)
+        self._snapshot = ()
+        self._order = SortIndex(SNAPSHOT_ORDER)
+        self._indexes = {}  # nome -> índice derivado
+        self._persisted_generation = None  # geração gravada/carregada do snapshot binário
+        self._persisted_at = None  # time.monotonic() da última gravação do snapshot binário
+        self._dirs = {}  # diretório -> (mtime, momento da varredura, impressões digitais, subdiretórios)
+        self._full_scan_at = None
+
+    def get_snapshot(self):
+        """
+        Retorna o snapshot atual do catálogo, recarregando apenas o que mudou.
+
+        Returns:
+            tuple: Registros imutáveis dos cursos (mais recente primeiro).
+        """
+        with self._lock:
+            self._sync()
+            return self._snapshot
+
+    def get_index(self, name, factory):
+        """
+        Retorna um índice derivado do catálogo, sincronizado com o snapshot atual.
+
+        O índice é criado na primeira chamada com factory() e preenchido com
+        rebuild(registros); depois disso recebe apenas as alterações por
+        apply_changes(removidos, adicionados).
+
+        Args:
+            name (str): Nome do índice.
+            factory (callable): Cria o índice vazio.
+
+        Returns:
+            object: Instância do índice compartilhada pelo processo.
+        """
+        with self._lock:
+            self._sync()
+            index = self._indexes.get(name)
+            if index is None:
+                index = factory()
+                index.rebuild(self._snapshot)
+                self._indexes[name] = index
+            return index
+
+    def invalidate(self):
+        """Descarta todo o conteúdo do cache, forçando releitura completa"""
+        with self._lock:
+            self._entries.clear()
+            self._snapshot = ()
+            self._order.rebuild(())
+            self.generation += 1
+            self._dirs.clear()
+            # Não recarregar o snapshot binário: a próxima leitura relê os CSV
+            self._persisted_generation = self.generation
+            for index in self._indexes.values():
+                index.rebuild(())
+
+    def _sync(self):
+        """Recarrega o que mudou e propaga as alterações para os índices"""
+        if self._persisted_generation is None:
+            self._load_persisted()
+        changed, removed, added = self._refresh()
+        if changed:
+            self.generation += 1
+            self._order.apply_changes(removed, added)
+            self._snapshot = self._build_snapshot()
+            for index in self._indexes.values():
+                index.apply_changes(removed, added)
+        if self.snapshot_path and self._persisted_generation != self.generation and self._persist_due():
+            self._persist()
+
+    def _persist_due(self):
+        """Indica se o snapshot binário pode ser regravado (no máximo a cada persist_interval)"""
+        return self._persisted_at is None or time.monotonic() - self._persisted_at >= self.persist_interval
+
+    def _load_persisted(self):
+        """
+        Carrega o snapshot binário gravado por este ou outro processo.
+
+        Snapshots de outro formato ou de outro diretório são ignorados; as
+        entradas carregadas ainda passam pela comparação de impressões
+        digitais em _refresh(), então um snapshot antigo só custa releituras.
+        """
+        self._persisted_generation = self.generation
+        if not self.snapshot_path:
+            return
+        try:
+            with open(self.snapshot_path, 'rb') as f:
+                data = pickle.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"Snapshot do catálogo ignorado ({self.snapshot_path}): {str(e)}")
+            return
+        if not isinstance(data, dict) or data.get('format') != SNAPSHOT_FORMAT or data.get('csv_dir') != self.csv_dir:
+            return
+
+        self._entries = {
+            path: (tuple(fingerprint), encode_record(course) if course else None)
+            for path, (fingerprint, course) in data['entries'].items()
+        }
+        self.generation = max(self.generation, data['generation'])
+        self._persisted_generation = self.generation
+        self._order.rebuild(record for _, record in self._entries.values() if record is not None)
+        self._snapshot = self._build_snapshot()
+        for index in self._indexes.values():
+            index.rebuild(self._snapshot)
+
+    def _persist(self):
+        """Grava as entradas atuais no snapshot binário, versionado pela geração"""
+        data = {
+            'format': SNAPSHOT_FORMAT,
+            'csv_dir': self.csv_dir,
+            'generation': self.generation,
+            'entries': {
+                path: (fingerprint, dict(record) if record is not None else None)
+                for path, (fingerprint, record) in self._entries.items()
+            },
+        }
+        try:
+            atomic_write(self.snapshot_path, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+            self._persisted_generation = self.generation
+            self._persisted_at = time.monotonic()
+        except OSError as e:
+            print(f"Erro ao gravar snapshot do catálogo: {str(e)}")
+
+    def _scan_fingerprints(self):
+        """
+        Lista os arquivos CSV com suas impressões digitais.
+
+        Percorre o diretório base (layout antigo) e um nível de subdiretórios
+        (shards, ver scripts/storage_layout.py), reaproveitando a listagem dos
+        diretórios cujo mtime não mudou desde a varredura anterior.
+
+        Returns:
+            dict: Impressões digitais por caminho, ou None se nenhum diretório
+                mudou.
+        """
+        now = time.monotonic()
+        full = self._full_scan_at is None or now - self._full_scan_at >= self.full_scan_interval
+        if full:
+            self._full_scan_at = now
+
+        base = self._scan_dir(self.csv_dir, full)
+        if base is None:
+            dirs = {}
+        else:
+            dirs = {self.csv_dir: base}
+            for shard_dir in base[3]:
+                shard = self._scan_dir(shard_dir, full)
+                if shard is not None:
+                    dirs[shard_dir] = shard
+
+        if not full and dirs.keys() == self._dirs.keys() and all(dirs[path] is self._dirs[path] for path in dirs):
+            return None
+        self._dirs = dirs
+        fingerprints = {}
+        for _, _, dir_fingerprints, _ in dirs.values():
+            fingerprints.update(dir_fingerprints)
+        return fingerprints
+
+    def _scan_dir(self, path, full=False):
+        """
+        Lista um diretório, ou reaproveita a listagem anterior se ele não mudou.
+
+        A listagem anterior só é reaproveitada se o mtime do diretório já era
+        anterior à varredura que a produziu (fora de RACY_WINDOW_NS).
+
+        Returns:
+            tuple: (mtime, momento da varredura, impressões digitais,
+                subdiretórios), ou None se o diretório não existe.
+        """
+        scanned_at = time.time_ns()
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._dirs.get(path)
+        if not full and cached is not None and cached[0] == mtime and mtime < cached[1] - RACY_WINDOW_NS:
+            return cached
+
+        fingerprints = {}
+        subdirs = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    subdirs.append(entry.path)
+                else:
+                    self._add_fingerprint(fingerprints, entry)
+        return (mtime, scanned_at, fingerprints, tuple(subdirs))
+
+    @staticmethod
+    def _add_fingerprint(fingerprints, entry):
+        """Registra a impressão digital de um arquivo CSV de curso"""
+        # Ignorar arquivos de teste e tudo que não for CSV
+        if not entry.name.endswith('.csv') or entry.name.startswith(('teste', '.')):
+            return
+        if not entry.is_file():
+            return
+        try:
+            stat = entry.stat()
+        except OSError:
+            return
+        fingerprints[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+    def _refresh(self):
+        """
+        Sincroniza o cache com o diretório.
+
+        Returns:
+            tuple: (houve alteração, registros removidos, registros adicionados).
+        """
+        fingerprints = self._scan_fingerprints()
+        if fingerprints is None:
+            return False, [], []
+        changed = False
+        removed = []
+        added = []
+
+        # Remover arquivos que deixaram de existir
+        for path in list(self._entries):
+            if path not in fingerprints:
+                old_record = self._entries.pop(path)[1]
+                if old_record is not None:
+                    removed.append(old_record)
+                changed = True
+
+        # Reler apenas arquivos novos ou com impressão digital diferente
+        for path, fingerprint in fingerprints.items():
+            cached = self._entries.get(path)
+            if cached is not None and cached[0] == fingerprint:
+                continue
+            try:
+                course = parse_course_file(path)
+            except Exception as e:
+                print(f"Erro ao ler arquivo {path}: {str(e)}")
+                course = None
+            record = encode_record(course) if course else None
+            if cached is not None and cached[1] is not None:
+                removed.append(cached[1])
+            if record is not None:
+                added.append(record)
+            self._entries[path] = (fingerprint, record)
+            changed = True
+
+        return changed, removed, added
+
+    def _build_snapshot(self):
+        """Monta o snapshot a partir da ordem mantida incrementalmente"""
+        return tuple(self._order.ordered('recent'))
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_catalog_cache(csv_dir, snapshot_path=None):
+    """
+    Retorna o cache do catálogo associado a um diretório CSV.
+
+    Args:
+        csv_dir (str): Diretório dos arquivos CSV.
+        snapshot_path (str): Snapshot binário usado na criação do cache (opcional).
+
+    Returns:
+        CatalogCache: Instância compartilhada pelo processo.
+    """
+    key = os.path.abspath(csv_dir)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = CatalogCache(key, snapshot_path)
+            _caches[key] = cache
+        return cache
@@ -0,0 +1,239 @@
+# catalog_columns.py
+# Representação colunar do catálogo para filtros e contagens vetorizados
+
+import threading
+from array import array
+from collections import Counter
+from models.course import split_values
+from scripts.catalog_encoding import get_value_dictionary
+from scripts.catalog_stats import total_vagas
+from scripts.search_index import doc_key
+
+try:
+    import numpy as np
+except ImportError:  # Dependência opcional: sem NumPy as máscaras são calculadas em Python
+    np = None
+
+# Filtros calculados como operações sobre arrays (NumPy instalado)
+VECTORIZED = np is not None
+
+# Campos guardados como códigos (tabelas de scripts/catalog_encoding.py)
+CODE_FIELDS = ('modalidade', 'orgao', 'tema', 'tipo_acao', 'bairro_unidade')
+
+# Filtros resolvidos apenas pelas colunas (além dos campos de igualdade)
+COLUMN_FILTERS = ('bairro',)
+
+# Valor das colunas sem informação (campo vazio)
+MISSING = -1
+
+
+class CatalogColumns:
+    """
+    Catálogo em colunas: uma linha por curso e, para cada campo, um array
+    de inteiros (códigos de modalidade, órgão, tema, tipo de ação e bairro;
+    total de vagas). Os períodos de inscrição e de aulas ficam no
+    IntervalIndex (scripts/interval_index.py).
+
+    Mantido pelo cache do catálogo como os demais índices (rebuild e
+    apply_changes). Linhas de cursos removidos são marcadas como livres e
+    reaproveitadas. Com NumPy os filtros viram máscaras vetorizadas sobre os
+    arrays (sem cópia, via buffer); sem NumPy a mesma máscara é calculada
+    com um laço sobre os arrays.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        """Esvazia todas as colunas"""
+        self._keys = []         # linha -> documento (None se livre)
+        self._rows = {}         # documento -> linha
+        self._records = []      # linha -> registro
+        self._free = []         # linhas livres
+        self._live = array('b')
+        self._codes = {field: array('i') for field in CODE_FIELDS}
+        self._vagas = array('i')
+        self._value_counts = {field: Counter() for field in CODE_FIELDS + COLUMN_FILTERS}
+
+    def rebuild(self, records):
+        """Reconstrói as colunas a partir de todos os registros"""
+        with self._lock:
+            self._reset()
+            for record in records:
+                self._add(record)
+
+    def apply_changes(self, removed, added):
+        """Aplica as alterações de uma recarga do catálogo"""
+        with self._lock:
+            for record in removed:
+                self._remove(record)
+            for record in added:
+                self._add(record)
+
+    def _add(self, record):
+        key = doc_key(record)
+        if key in self._rows:
+            self._remove(self._records[self._rows[key]])
+        if self._free:
+            row = self._free.pop()
+        else:
+            row = len(self._keys)
+            self._keys.append(None)
+            self._records.append(None)
+            self._live.append(0)
+            for column in self._columns():
+                column.append(MISSING)
+
+        self._keys[row] = key
+        self._records[row] = record
+        self._rows[key] = row
+        self._live[row] = 1
+        for field in CODE_FIELDS:
+            value = record.get(field) or ''
+            self._codes[field][row] = get_value_dictionary(field).encode(value) if value else MISSING
+        self._vagas[row] = total_vagas(record)
+        self._count_values(record, 1)
+
+    def _remove(self, record):
+        key = doc_key(record)
+        row = self._rows.get(key)
+        if row is None or self._records[row] is not record:
+            return
+        del self._rows[key]
+        self._keys[row] = None
+        self._records[row] = None
+        self._live[row] = 0
+        self._free.append(row)
+        self._count_values(record, -1)
+
+    def _count_values(self, record, delta):
+        """Soma delta às contagens dos valores do registro (usadas por values)"""
+        for field in CODE_FIELDS:
+            value = record.get(field) or ''
+            if value:
+                self._adjust_count(field, value, delta)
+        bairros = {part.strip() for part in split_values(record.get('bairro_unidade') or '')}
+        for bairro in bairros:
+            if bairro:
+                self._adjust_count('bairro', bairro, delta)
+
+    def _adjust_count(self, field, value, delta):
+        counts = self._value_counts[field]
+        counts[value] += delta
+        if counts[value] <= 0:
+            del counts[value]
+
+    def _columns(self):
+        return list(self._codes.values()) + [self._vagas]
+
+    # ------------------------------------------------------------------
+    # Consultas
+
+    def _conditions(self, filters):
+        """
+        Converte os filtros em condições sobre as colunas.
+
+        Returns:
+            list ou None: Pares (coluna, códigos aceitos); None se algum filtro não pode ser atendido por nenhum curso.
+        """
+        conditions = []
+        for field in ('modalidade', 'orgao', 'tema', 'tipo_acao'):
+            if filters.get(field):
+                code = get_value_dictionary(field).code_of(filters[field])
+                if code is None:
+                    return None
+                conditions.append((self._codes[field], (code,)))
+        if filters.get('bairro'):
+            # bairro_unidade guarda os bairros de todas as unidades ('A|B'):
+            # aceitar os códigos cujos valores contêm o bairro pedido
+            dictionary = get_value_dictionary('bairro_unidade')
+            codes = tuple(code for code, value in enumerate(list(dictionary.values))
+                          if filters['bairro'] in (part.strip() for part in split_values(value)))
+            if not codes:
+                return None
+            conditions.append((self._codes['bairro_unidade'], codes))
+        return conditions
+
+    def _mask(self, conditions):
+        """Máscara das linhas vivas que atendem a todas as condições"""
+        if np is not None:
+            mask = np.frombuffer(self._live, dtype=np.int8).astype(bool)
+            for column, accepted in conditions:
+                values = np.frombuffer(column, dtype=np.int32)
+                mask &= values == accepted[0] if len(accepted) == 1 else np.isin(values, accepted)
+            return mask
+
+        mask = bytearray(self._live)
+        for column, accepted in conditions:
+            accepted = set(accepted)
+            for row in range(len(mask)):
+                if mask[row] and column[row] not in accepted:
+                    mask[row] = 0
+        return mask
+
+    def _rows_matching(self, filters):
+        """Linhas que atendem aos filtros (lista vazia se nenhuma)"""
+        conditions = self._conditions(filters)
+        if conditions is None or not self._keys:
+            return []
+        mask = self._mask(conditions)
+        if np is not None:
+            return np.flatnonzero(mask).tolist()
+        return [row for row, selected in enumerate(mask) if selected]
+
+    def matching_keys(self, filters):
+        """
+        Documentos que atendem aos filtros de colunas.
+
+        Args:
+            filters (dict): Campos de igualdade (modalidade, orgao, tema,
+                tipo_acao) e 'bairro'.
+
+        Returns:
+            set: Documentos encontrados (ver doc_key).
+        """
+        with self._lock:
+            return {self._keys[row] for row in self._rows_matching(filters)}
+
+    def count(self, filters):
+        """
+        Quantidade de cursos que atendem aos filtros de colunas.
+
+        Args:
+            filters (dict): Mesmos filtros de matching_keys.
+
+        Returns:
+            int: Quantidade de cursos.
+        """
+        with self._lock:
+            conditions = self._conditions(filters)
+            if conditions is None or not self._keys:
+                return 0
+            mask = self._mask(conditions)
+            return int(mask.sum()) if np is not None else sum(mask)
+
+    def sum_vagas(self, filters):
+        """Total de vagas dos cursos que atendem aos filtros de colunas"""
+        with self._lock:
+            rows = self._rows_matching(filters)
+            if np is not None:
+                return int(np.frombuffer(self._vagas, dtype=np.int32)[rows].sum()) if rows else 0
+            return sum(self._vagas[row] for row in rows)
+
+    def values(self, field):
+        """
+        Valores distintos de um campo codificado presentes no catálogo.
+
+        Lidos das contagens por valor mantidas em _add e _remove, sem
+        percorrer as linhas. Para 'bairro' os valores de cada unidade são
+        separados.
+
+        Args:
+            field (str): Campo de CODE_FIELDS ou 'bairro'.
+
+        Returns:
+            list: Valores em ordem alfabética.
+        """
+        with self._lock:
+            return sorted(self._value_counts[field])
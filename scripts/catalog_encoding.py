@@ -0,0 +1,242 @@
+# catalog_encoding.py
+# Registros compactos do catálogo com codificação por dicionário dos campos repetitivos
+
+import random
+import threading
+import tracemalloc
+from collections.abc import Mapping
+
+# Campos com poucos valores distintos, gravados como códigos inteiros
+ENCODED_FIELDS = (
+    'orgao', 'tema', 'modalidade', 'tipo_acao', 'publico_alvo', 'bairro_unidade',
+    'curso_gratuito', 'oferece_certificado', 'oferece_bolsa', 'parceiro_externo',
+    'acessibilidade', 'aulas_assincronas', 'plataforma_digital',
+)
+
+
+class ValueDictionary:
+    """
+    Tabela de valores de um campo: valor -> código e código -> valor.
+
+    Os códigos são atribuídos na ordem em que os valores aparecem e nunca
+    mudam; valores que deixam de ser usados continuam na tabela (o número de
+    valores distintos destes campos é pequeno).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._codes = {}
+        self.values = []
+
+    def encode(self, value):
+        """Código do valor, incluindo-o na tabela se for novo"""
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def code_of(self, value):
+        """Código de um valor já conhecido (None se nunca apareceu)"""
+        return self._codes.get(value)
+
+    def __len__(self):
+        return len(self.values)
+
+
+class RecordLayout:
+    """
+    Ordem das colunas compartilhada por todos os registros com o mesmo cabeçalho.
+
+    Guarda, para cada coluna, a posição no registro e a tabela de valores
+    (None para colunas gravadas como texto).
+    """
+
+    __slots__ = ('keys', 'positions', 'dictionaries')
+
+    def __init__(self, keys, dictionaries):
+        self.keys = keys
+        self.positions = {key: i for i, key in enumerate(keys)}
+        self.dictionaries = tuple(dictionaries.get(key) for key in keys)
+
+
+class EncodedRecord(Mapping):
+    """
+    Registro somente leitura do catálogo.
+
+    Substitui o dicionário de cada curso por uma tupla de valores na ordem de
+    um RecordLayout compartilhado; os campos de ENCODED_FIELDS guardam apenas
+    o código inteiro do valor. A leitura (record['orgao'], record.get(...),
+    dict(record)) devolve os textos originais.
+    """
+
+    __slots__ = ('_layout', '_values')
+
+    def __init__(self, layout, values):
+        self._layout = layout
+        self._values = values
+
+    def __getitem__(self, key):
+        position = self._layout.positions[key]
+        value = self._values[position]
+        dictionary = self._layout.dictionaries[position]
+        return dictionary.values[value] if dictionary is not None else value
+
+    def get(self, key, default=None):
+        position = self._layout.positions.get(key)
+        if position is None:
+            return default
+        value = self._values[position]
+        dictionary = self._layout.dictionaries[position]
+        return dictionary.values[value] if dictionary is not None else value
+
+    def __iter__(self):
+        return iter(self._layout.keys)
+
+    def __len__(self):
+        return len(self._layout.keys)
+
+    def __contains__(self, key):
+        return key in self._layout.positions
+
+    def __repr__(self):
+        return f"EncodedRecord({dict(self)!r})"
+
+    def __reduce__(self):
+        # Serializar como dicionário comum: os códigos só valem neste processo
+        return (encode_record, (dict(self),))
+
+    def code(self, field):
+        """
+        Código inteiro do valor de um campo codificado.
+
+        Args:
+            field (str): Campo de ENCODED_FIELDS.
+
+        Returns:
+            int ou None: Código na tabela do campo, ou None se o registro não tem o campo.
+        """
+        position = self._layout.positions.get(field)
+        if position is None or self._layout.dictionaries[position] is None:
+            return None
+        return self._values[position]
+
+
+_dictionaries = {field: ValueDictionary() for field in ENCODED_FIELDS}
+_layouts = {}
+_layouts_lock = threading.Lock()
+
+
+def get_value_dictionary(field):
+    """
+    Tabela de valores de um campo codificado.
+
+    Args:
+        field (str): Campo de ENCODED_FIELDS.
+
+    Returns:
+        ValueDictionary: Tabela compartilhada pelo processo.
+    """
+    return _dictionaries[field]
+
+
+def _layout_for(keys):
+    """Layout compartilhado para uma ordem de colunas"""
+    layout = _layouts.get(keys)
+    if layout is None:
+        with _layouts_lock:
+            layout = _layouts.get(keys)
+            if layout is None:
+                layout = RecordLayout(keys, _dictionaries)
+                _layouts[keys] = layout
+    return layout
+
+
+def encode_record(course):
+    """
+    Converte um registro de curso para a forma compacta.
+
+    Args:
+        course (dict): Registro com valores em texto.
+
+    Returns:
+        EncodedRecord: Registro somente leitura com os campos repetitivos codificados.
+    """
+    layout = _layout_for(tuple(course))
+    values = tuple(
+        dictionary.encode(course[key]) if dictionary is not None else course[key]
+        for key, dictionary in zip(layout.keys, layout.dictionaries)
+    )
+    return EncodedRecord(layout, values)
+
+
+# ----------------------------------------------------------------------
+# Medição de memória (scripts/measure_catalog_memory.py e tests/test_catalog_memory.py)
+
+# Nomes longos como os da lista de órgãos do formulário
+SYNTHETIC_ORGAOS = [f'Secretaria Municipal de Exemplo e Desenvolvimento número {i}' for i in range(60)]
+SYNTHETIC_MODALIDADES = ['Presencial', 'Online', 'Híbrido']
+SYNTHETIC_TEMAS = ['Educação', 'Saúde', 'Tecnologia', 'Cultura', 'Gestão', 'Meio Ambiente', 'Esporte']
+SYNTHETIC_BAIRROS = ['Centro', 'Boa Viagem', 'Casa Amarela', 'Várzea', 'Ibura', 'Torre', 'Madalena']
+
+
+def _fresh(value):
+    """Cópia nova da string, como as criadas pelo csv.DictReader para cada linha"""
+    return value.encode('utf-8').decode('utf-8')
+
+
+def synthetic_rows(count):
+    """
+    Gera linhas de um catálogo sintético como as lidas do CSV.
+
+    Args:
+        count (int): Quantidade de cursos.
+
+    Yields:
+        dict: Linha de um curso (sempre as mesmas para a mesma quantidade).
+    """
+    rng = random.Random(42)
+    for course_id in range(1, count + 1):
+        modalidade = rng.choice(SYNTHETIC_MODALIDADES)
+        yield {
+            'id': str(course_id),
+            'tipo_acao': _fresh(rng.choice(['Curso', 'Oficina', 'Palestra'])),
+            'titulo': f'Curso de exemplo número {course_id}',
+            'descricao': f'Descrição do curso {course_id} ' * 4,
+            'inicio_inscricoes': '2026/10/01',
+            'fim_inscricoes': '2026/10/20',
+            'orgao': _fresh(rng.choice(SYNTHETIC_ORGAOS)),
+            'tema': _fresh(rng.choice(SYNTHETIC_TEMAS)),
+            'modalidade': _fresh(modalidade),
+            'publico_alvo': _fresh(rng.choice(['Jovens', 'Adultos', 'Servidores públicos', 'Público geral'])),
+            'bairro_unidade': _fresh(rng.choice(SYNTHETIC_BAIRROS)) if modalidade != 'Online' else '',
+            'vagas_unidade': str(rng.randint(10, 200)),
+            'curso_gratuito': _fresh('sim'),
+            'oferece_certificado': _fresh(rng.choice(['sim', 'nao'])),
+            'acessibilidade': _fresh('acessivel'),
+            'created_at': f'17-10-2026 10:{course_id % 60:02d}:00',
+        }
+
+
+def measure_catalog(build, count):
+    """
+    Mede com tracemalloc a memória retida por um catálogo sintético.
+
+    Args:
+        build (callable): Converte cada linha de synthetic_rows no registro guardado.
+        count (int): Quantidade de cursos.
+
+    Returns:
+        tuple: (catálogo montado, bytes retidos).
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    catalog = tuple(build(row) for row in synthetic_rows(count))
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return catalog, retained
@@ -0,0 +1,85 @@
+# catalog_stats.py
+# Contadores agregados do catálogo (facetas) mantidos incrementalmente
+
+import threading
+from collections import Counter
+from models.course import total_vagas as units_total_vagas, units_of
+
+# Campos com contagem por valor
+FACET_FIELDS = ('modalidade', 'orgao', 'tema')
+
+
+def total_vagas(course):
+    """
+    Soma das vagas de todas as unidades de um curso.
+
+    Args:
+        course (Mapping): Registro do curso (unidades interpretadas uma única vez, ver units_of).
+
+    Returns:
+        int: Total de vagas (valores não numéricos são ignorados).
+    """
+    return units_total_vagas(units_of(course))
+
+
+class CatalogStats:
+    """
+    Contadores do catálogo: cursos gratuitos e pagos e quantidade de cursos
+    por modalidade, órgão e tema. O total de cursos e o total de vagas vêm
+    do CatalogColumns (scripts/catalog_columns.py).
+
+    Mantido pelo CatalogCache: cada recarga soma os registros adicionados e
+    subtrai os removidos, então ler os contadores não percorre o catálogo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._facets = {field: Counter() for field in FACET_FIELDS}
+        self._ids = Counter()
+        self._gratuito = Counter()
+
+    def rebuild(self, records):
+        """Recalcula os contadores a partir de todos os registros"""
+        with self._lock:
+            for counter in self._facets.values():
+                counter.clear()
+            self._ids.clear()
+            self._gratuito.clear()
+            for record in records:
+                self._count(record, 1)
+
+    def apply_changes(self, removed, added):
+        """Aplica as alterações de uma recarga do catálogo"""
+        with self._lock:
+            for record in removed:
+                self._count(record, -1)
+            for record in added:
+                self._count(record, 1)
+
+    def _count(self, record, sign):
+        self._ids[str(record.get('id', ''))] += sign
+        self._gratuito[record.get('curso_gratuito') or ''] += sign
+        for field in FACET_FIELDS:
+            self._facets[field][record.get(field) or ''] += sign
+
+    def snapshot(self, inserted_ids=()):
+        """
+        Retorna os contadores atuais.
+
+        Args:
+            inserted_ids (iterable): IDs marcados como inseridos; apenas os que
+                existem no catálogo são contados.
+
+        Returns:
+            dict: inserted, gratuitos, pagos e as contagens por valor de
+                cada campo em FACET_FIELDS.
+        """
+        with self._lock:
+            facets = {
+                'inserted': sum(1 for course_id in inserted_ids if self._ids.get(str(course_id), 0) > 0),
+                'gratuitos': self._gratuito['sim'],
+                'pagos': self._gratuito['nao'],
+            }
+            for field, counter in self._facets.items():
+                facets[field] = {value: count for value, count in sorted(counter.items()) if value and count > 0}
+            return facets
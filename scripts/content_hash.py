@@ -0,0 +1,53 @@
+# content_hash.py
+# Hash canônico do conteúdo de um curso
+
+import hashlib
+import json
+
+# Campos de controle, fora do conteúdo do curso (datas de gravação, nomes de
+# arquivos e campos derivados pelos leitores do catálogo)
+METADATA_FIELDS = (
+    'created_at', 'created_at_iso', 'updated_at', 'updated_at_iso',
+    'csv_file', 'pdf_file', 'pdf_status', 'source_file', 'file_id',
+)
+
+
+def _canonical_value(value):
+    """Normaliza um valor: vazio e ausente são equivalentes, escalares viram texto"""
+    if value is None or value == '':
+        return None
+    if isinstance(value, (list, tuple)):
+        return [_canonical_value(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _canonical_value(item) for key, item in value.items()}
+    return str(value)
+
+
+def content_hash(record, fields=None):
+    """
+    Hash SHA-256 canônico de um registro (ou de parte dos seus campos).
+
+    A ordem das chaves não importa, campos vazios equivalem a campos
+    ausentes e números equivalem ao seu texto, então o mesmo conteúdo lido
+    de CSV, do banco ou do formulário produz o mesmo hash.
+
+    Args:
+        record (Mapping): Registro do curso.
+        fields (iterable): Campos considerados (padrão: todos).
+
+    Returns:
+        str: Hash hexadecimal.
+    """
+    keys = record.keys() if fields is None else fields
+    content = {}
+    for key in keys:
+        value = _canonical_value(record.get(key))
+        if value is not None:
+            content[key] = value
+    payload = json.dumps(content, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def record_content_hash(record):
+    """Hash do conteúdo de um curso, sem os campos de controle (METADATA_FIELDS)"""
+    return content_hash(record, [key for key in record.keys() if key not in METADATA_FIELDS])
@@ -0,0 +1,223 @@
+# course_history.py
+# Histórico de versões dos cursos com gravação por diferenças (deltas)
+
+import json
+import os
+import threading
+from datetime import datetime
+from scripts.file_lock import file_lock
+from scripts.storage_layout import SHARD_SIZE
+
+# Campos derivados pelos leitores do catálogo, fora do histórico
+IGNORED_FIELDS = ('file_id', 'source_file')
+
+
+def _changes(previous, current):
+    """Campos alterados/incluídos e campos removidos entre dois estados"""
+    changes = {key: value for key, value in current.items() if previous.get(key) != value}
+    removed = sorted(key for key in previous if key not in current)
+    return changes, removed
+
+
+class CourseHistory:
+    """
+    Histórico de versões dos cursos.
+
+    Cada curso tem um arquivo JSONL (shard por faixa de ID, como os CSV) com
+    uma linha por versão: {"version", "at", "action", "fields"} e, conforme
+    o caso, "snapshot" (registro completo) ou "changes"/"removed" (apenas os
+    campos alterados em relação à versão anterior). A primeira versão e uma
+    a cada snapshot_interval são completas, então reconstruir qualquer
+    versão aplica no máximo snapshot_interval - 1 deltas. Exclusões são
+    registradas como versões sem conteúdo.
+    """
+
+    def __init__(self, history_dir, snapshot_interval=10):
+        self.history_dir = history_dir
+        self.snapshot_interval = max(int(snapshot_interval), 1)
+
+    def _path(self, course_id):
+        course_id = int(course_id)
+        return os.path.join(self.history_dir, f"{course_id // SHARD_SIZE:04d}", f"{course_id}.jsonl")
+
+    def _read(self, course_id):
+        """Linhas do histórico de um curso (uma linha final incompleta é ignorada)"""
+        path = self._path(course_id)
+        if not os.path.exists(path):
+            return []
+        entries = []
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+        return entries
+
+    def _state(self, entries, version=None):
+        """
+        Reconstrói um curso a partir das linhas do histórico.
+
+        Args:
+            entries (list): Linhas do histórico, em ordem.
+            version (int): Versão desejada (padrão: a mais recente).
+
+        Returns:
+            dict ou None: Registro da versão, ou None se o curso estava excluído
+                ou a versão não existe.
+        """
+        if version is not None:
+            entries = [entry for entry in entries if entry['version'] <= version]
+            if not entries or entries[-1]['version'] != version:
+                return None
+        # Partir do último snapshot (ou exclusão) e aplicar os deltas seguintes
+        start = 0
+        for index in range(len(entries) - 1, -1, -1):
+            if 'snapshot' in entries[index] or entries[index]['action'] == 'delete':
+                start = index
+                break
+        state = None
+        for entry in entries[start:]:
+            if entry['action'] == 'delete':
+                state = None
+            elif 'snapshot' in entry:
+                state = dict(entry['snapshot'])
+            elif state is not None:
+                state.update(entry['changes'])
+                for key in entry['removed']:
+                    state.pop(key, None)
+        return state
+
+    def record(self, course_id, course_data, action='update'):
+        """
+        Registra uma nova versão do curso.
+
+        Args:
+            course_id (int): ID do curso.
+            course_data (dict ou None): Registro completo da nova versão (None para exclusão).
+            action (str): 'create', 'update' ou 'delete'.
+
+        Returns:
+            int ou None: Número da versão gravada, ou None se nada mudou.
+        """
+        path = self._path(course_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with file_lock(f"{path}.lock"):
+            entries = self._read(course_id)
+            previous = self._state(entries) if entries else None
+            version = entries[-1]['version'] + 1 if entries else 1
+            entry = {'version': version, 'at': datetime.now().isoformat(timespec='seconds'), 'action': action}
+
+            if course_data is None:
+                if previous is None:
+                    return None
+                entry['fields'] = []
+            else:
+                current = {key: value for key, value in course_data.items() if key not in IGNORED_FIELDS}
+                changes, removed = _changes(previous or {}, current)
+                if previous is not None and not changes and not removed:
+                    return None
+                entry['fields'] = sorted(changes) + removed
+                if previous is None or (version - 1) % self.snapshot_interval == 0:
+                    entry['snapshot'] = current
+                else:
+                    entry['changes'] = changes
+                    entry['removed'] = removed
+
+            with open(path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            return version
+
+    def versions(self, course_id):
+        """
+        Versões registradas de um curso, da mais antiga para a mais recente.
+
+        O arquivo é percorrido uma única vez, aplicando cada delta ao estado
+        anterior.
+
+        Returns:
+            list: Dicionários com version, at, action e changes (campo ->
+                (valor anterior, valor novo)).
+        """
+        result = []
+        state = None
+        for entry in self._read(course_id):
+            previous = state or {}
+            if entry['action'] == 'delete':
+                state = None
+            elif 'snapshot' in entry:
+                state = dict(entry['snapshot'])
+            elif state is not None:
+                state = dict(state)
+                state.update(entry['changes'])
+                for key in entry['removed']:
+                    state.pop(key, None)
+            current = state or {}
+            result.append({
+                'version': entry['version'],
+                'at': entry['at'],
+                'action': entry['action'],
+                'changes': {key: (previous.get(key), current.get(key)) for key in entry['fields']},
+            })
+        return result
+
+    def get_version(self, course_id, version=None):
+        """
+        Registro do curso em uma versão.
+
+        Args:
+            course_id (int): ID do curso.
+            version (int): Número da versão (padrão: a mais recente).
+
+        Returns:
+            dict ou None: Registro da versão, ou None se não existir.
+        """
+        return self._state(self._read(course_id), version)
+
+    def diff(self, course_id, from_version, to_version=None):
+        """
+        Diferenças entre duas versões de um curso.
+
+        Args:
+            course_id (int): ID do curso.
+            from_version (int): Versão de origem.
+            to_version (int): Versão de destino (padrão: a mais recente).
+
+        Returns:
+            dict: Campo -> (valor na origem, valor no destino); campos ausentes
+                em uma das versões aparecem como None.
+        """
+        entries = self._read(course_id)
+        old = self._state(entries, from_version) or {}
+        new = self._state(entries, to_version) or {}
+        return {
+            key: (old.get(key), new.get(key))
+            for key in sorted(set(old) | set(new))
+            if old.get(key) != new.get(key)
+        }
+
+
+_histories = {}
+_histories_lock = threading.Lock()
+
+
+def get_course_history(history_dir, snapshot_interval=10):
+    """
+    Retorna o histórico associado a um diretório (uma instância por processo).
+
+    Args:
+        history_dir (str): Diretório dos arquivos de histórico.
+        snapshot_interval (int): Versões entre registros completos.
+
+    Returns:
+        CourseHistory: Histórico compartilhado.
+    """
+    history_dir = os.path.abspath(history_dir)
+    with _histories_lock:
+        history = _histories.get(history_dir)
+        if history is None:
+            history = CourseHistory(history_dir, snapshot_interval)
+            _histories[history_dir] = history
+        return history
@@ -0,0 +1,323 @@
+# course_index.py
+# Índice persistente de ID do curso -> manifesto de arquivos (CSV, PDF, capa e logo)
+
+import os
+import json
+import hashlib
+import threading
+from scripts.file_lock import file_lock, atomic_write
+from scripts.storage_layout import ARTIFACT_DIRS, locate_artifact, iter_artifact_files
+
+# Arquivo para armazenar o índice (mesmo diretório do last_id.json)
+INDEX_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'course_index.json')
+
+# Arquivo de trava que serializa as alterações do índice entre workers
+LOCK_FILE = f"{INDEX_FILE}.lock"
+
+_lock = threading.Lock()
+_index = None
+_index_fingerprint = None
+_reverse = None  # (tipo, arquivo) -> {IDs}, derivado de _index
+
+def _normalize(entry):
+    """Converte entradas antigas (apenas o nome do CSV) para o formato de manifesto"""
+    if isinstance(entry, str):
+        return {'csv': entry}
+    return entry if isinstance(entry, dict) else {}
+
+def _index_file_fingerprint():
+    """Impressão digital do arquivo do índice (None se não existir)"""
+    try:
+        stat = os.stat(INDEX_FILE)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def _load_index(force=False):
+    """
+    Carrega o índice do disco apenas se o arquivo mudou desde a última leitura.
+
+    Args:
+        force (bool): Reler o arquivo mesmo sem mudança aparente (usado sob a
+            trava de arquivo, antes de alterar o índice).
+
+    Returns:
+        dict: Mapeamento de ID (str) para o manifesto do curso.
+    """
+    global _index, _index_fingerprint, _reverse
+
+    fingerprint = _index_file_fingerprint()
+
+    if _index is None or force or fingerprint != _index_fingerprint:
+        data = {}
+        if fingerprint is not None:
+            try:
+                with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                data = {}
+        _index = {course_id: _normalize(entry) for course_id, entry in data.items()}
+        _index_fingerprint = fingerprint
+        _reverse = None
+
+    return _index
+
+def _save_index(index):
+    """Grava o índice de forma atômica (arquivo temporário + rename)"""
+    global _index, _index_fingerprint, _reverse
+
+    atomic_write(INDEX_FILE, json.dumps(index, ensure_ascii=False))
+
+    _index = index
+    _index_fingerprint = _index_file_fingerprint()
+    _reverse = None
+
+def _update_index(change):
+    """
+    Aplica uma alteração ao índice sob a trava de arquivo.
+
+    O índice é relido do disco dentro da trava, então alterações feitas por
+    outros workers não se perdem.
+
+    Args:
+        change (callable): Recebe uma cópia do índice e a altera; retornar
+            False indica que nada mudou e o arquivo não é regravado.
+    """
+    with file_lock(LOCK_FILE):
+        with _lock:
+            index = dict(_load_index(force=True))
+            if change(index) is not False:
+                _save_index(index)
+
+def _file_hash(path):
+    """Hash SHA-256 do conteúdo de um arquivo (None se não existir)"""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(65536), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def lookup_course_file(course_id):
+    """
+    Obtém o nome do arquivo CSV de um curso.
+
+    Args:
+        course_id (int): ID do curso.
+
+    Returns:
+        str: Nome do arquivo CSV ou None se o ID não estiver indexado.
+    """
+    with _lock:
+        return _load_index().get(str(course_id), {}).get('csv')
+
+def get_course_manifest(course_id):
+    """
+    Obtém o manifesto de arquivos de um curso.
+
+    Args:
+        course_id (int): ID do curso.
+
+    Returns:
+        dict: Arquivos por tipo ('csv', 'pdf', 'cover', 'logo'), seus hashes
+            em 'hashes' e os hashes do conteúdo de origem em 'content', ou None
+            se o ID não estiver indexado.
+    """
+    with _lock:
+        manifest = _load_index().get(str(course_id))
+        if manifest is None:
+            return None
+        manifest = dict(manifest)
+        manifest['hashes'] = dict(manifest.get('hashes', {}))
+        manifest['content'] = dict(manifest.get('content', {}))
+        return manifest
+
+def artifact_file_hashes(artifacts):
+    """
+    Calcula o hash do conteúdo dos arquivos informados.
+
+    Args:
+        artifacts (dict): Nome do arquivo por tipo; tipos sem arquivo são ignorados.
+
+    Returns:
+        dict: Hash por tipo (None se o arquivo não existir).
+    """
+    for kind in artifacts:
+        if kind not in ARTIFACT_DIRS:
+            raise ValueError(f"Tipo de artefato inválido: {kind}")
+    return {
+        kind: _file_hash(locate_artifact(kind, os.path.basename(filename)))
+        for kind, filename in artifacts.items() if filename
+    }
+
+def update_manifest(manifest, artifacts, file_hashes, content=None):
+    """
+    Aplica arquivos e hashes a um manifesto.
+
+    Args:
+        manifest (dict): Manifesto atual (não é alterado).
+        artifacts (dict): Nome do arquivo por tipo; None ou '' remove o tipo.
+        file_hashes (dict): Hashes calculados por artifact_file_hashes.
+        content (dict): Hash do conteúdo de origem por tipo.
+
+    Returns:
+        dict: Novo manifesto.
+    """
+    manifest = dict(manifest)
+    hashes = dict(manifest.get('hashes', {}))
+    for kind, filename in artifacts.items():
+        if filename:
+            manifest[kind] = os.path.basename(filename)
+            if file_hashes[kind]:
+                hashes[kind] = file_hashes[kind]
+            else:
+                hashes.pop(kind, None)
+        else:
+            manifest.pop(kind, None)
+            hashes.pop(kind, None)
+    manifest['hashes'] = hashes
+    if content:
+        manifest['content'] = dict(manifest.get('content', {}), **content)
+    return manifest
+
+def register_course_artifacts(course_id, content=None, **artifacts):
+    """
+    Registra (ou atualiza) arquivos no manifesto de um curso.
+
+    O hash do conteúdo de cada arquivo informado é recalculado; passar None
+    (ou string vazia) remove o tipo do manifesto. Todos os arquivos de uma
+    gravação do curso devem ser registrados em uma única chamada (uma única
+    regravação do índice).
+
+    Args:
+        course_id (int): ID do curso.
+        content (dict): Hash do conteúdo de origem por tipo (ver
+            register_content_hashes), gravado junto com os arquivos.
+        **artifacts: Nome do arquivo (sem diretório) por tipo, ex.: csv=..., pdf=...
+    """
+    # Hashes dos arquivos calculados fora da trava
+    file_hashes = artifact_file_hashes(artifacts)
+
+    def change(index):
+        index[str(course_id)] = update_manifest(index.get(str(course_id), {}), artifacts, file_hashes, content)
+
+    _update_index(change)
+
+def register_content_hashes(course_id, **hashes):
+    """
+    Registra o hash do conteúdo a partir do qual cada arquivo foi gerado.
+
+    Args:
+        course_id (int): ID do curso.
+        **hashes: Hash do conteúdo por tipo, ex.: csv=..., pdf=...
+    """
+    register_course_artifacts(course_id, content=hashes)
+
+def unregister_course(course_id):
+    """
+    Remove um curso do índice.
+
+    Args:
+        course_id (int): ID do curso.
+    """
+    def change(index):
+        if index.pop(str(course_id), None) is None:
+            return False
+
+    _update_index(change)
+
+def manifest_from_course(course):
+    """
+    Monta o manifesto de um curso a partir do seu registro.
+
+    Usado para cursos sem manifesto registrado (ex.: índice perdido ou
+    cursos importados); os hashes ficam vazios.
+
+    Args:
+        course (Mapping): Registro do curso (com source_file).
+
+    Returns:
+        dict: Manifesto do curso.
+    """
+    manifest = {'csv': course['source_file'], 'hashes': {}}
+    # O PDF é gerado com o mesmo nome base do CSV
+    pdf_file = f"{os.path.splitext(course['source_file'])[0]}.pdf"
+    if os.path.exists(locate_artifact('pdf', pdf_file)):
+        manifest['pdf'] = pdf_file
+    if course.get('capa_curso'):
+        manifest['cover'] = course['capa_curso']
+    if course.get('parceiro_logo'):
+        manifest['logo'] = course['parceiro_logo']
+    return manifest
+
+def rebuild_index(courses):
+    """
+    Reconstrói o índice a partir do catálogo completo.
+
+    Manifestos já registrados para o mesmo arquivo CSV são mantidos (com
+    seus hashes); os demais são montados a partir do registro do curso.
+
+    Args:
+        courses (iterable): Registros de cursos ordenados do mais recente para
+            o mais antigo; em caso de IDs repetidos prevalece o primeiro.
+    """
+    def change(index):
+        current = dict(index)
+        index.clear()
+        for course in courses:
+            course_id = course.get('id')
+            if not course_id or not course.get('source_file') or str(course_id) in index:
+                continue
+            existing = current.get(str(course_id))
+            if existing and existing.get('csv') == course['source_file']:
+                index[str(course_id)] = existing
+            else:
+                index[str(course_id)] = manifest_from_course(course)
+        if index == current:
+            return False
+
+    _update_index(change)
+
+def _reverse_index():
+    """Índice reverso (tipo, arquivo) -> IDs dos cursos, refeito quando o índice muda"""
+    global _reverse
+
+    index = _load_index()
+    if _reverse is None:
+        reverse = {}
+        for course_id, manifest in index.items():
+            for kind in ARTIFACT_DIRS:
+                if manifest.get(kind):
+                    reverse.setdefault((kind, manifest[kind]), set()).add(course_id)
+        _reverse = reverse
+    return _reverse
+
+def get_artifact_owners(kind, filename):
+    """
+    IDs dos cursos cujo manifesto referencia um arquivo.
+
+    Args:
+        kind (str): Tipo do artefato.
+        filename (str): Nome do arquivo.
+
+    Returns:
+        set: IDs (str) dos cursos que usam o arquivo.
+    """
+    with _lock:
+        return set(_reverse_index().get((kind, filename), ()))
+
+def find_orphaned_files():
+    """
+    Lista os arquivos que não pertencem ao manifesto de nenhum curso.
+
+    Returns:
+        dict: Tipo do artefato -> nomes dos arquivos órfãos (ordem alfabética).
+    """
+    with _lock:
+        reverse = _reverse_index()
+        orphans = {}
+        for kind in ARTIFACT_DIRS:
+            orphans[kind] = sorted(name for name, _ in iter_artifact_files(kind) if (kind, name) not in reverse)
+        return orphans
@@ -0,0 +1,422 @@
+# course_journal.py
+# Armazenamento dos cursos em um diário (journal) JSONL somente de acréscimo
+
+import json
+import os
+import threading
+from scripts.catalog_cache import SNAPSHOT_ORDER
+from scripts.catalog_encoding import encode_record
+from scripts.file_lock import file_lock
+from scripts.sort_index import SortIndex
+
+
+class CourseJournal:
+    """
+    Diário de cursos: cada gravação acrescenta uma linha JSON ao final do
+    arquivo ({"id", "version", "deleted", "data"}); exclusões são registradas
+    como marcas (tombstones).
+
+    Na inicialização o arquivo é lido uma única vez, sequencialmente, montando
+    o índice em memória ID -> (posição, tamanho, versão) da linha mais recente.
+    A partir daí ler um curso custa um seek e gravar custa um append.
+
+    Linhas substituídas ou excluídas continuam no arquivo até a compactação,
+    feita por uma thread em segundo plano quando a proporção de linhas mortas
+    ultrapassa compact_ratio. A compactação regrava apenas as versões vivas em
+    um arquivo temporário e o troca atomicamente pelo original.
+
+    Expõe o mesmo protocolo do CatalogCache (get_snapshot, get_index e
+    generation), então os índices de busca, filtros e contadores funcionam
+    igualmente sobre o diário.
+    """
+
+    def __init__(self, path, compact_ratio=0.5, compact_min_records=100):
+        self.path = os.path.abspath(path)
+        self.lock_path = f"{self.path}.lock"
+        self.compact_ratio = compact_ratio
+        self.compact_min_records = compact_min_records
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._offsets = {}   # ID -> (posição, tamanho, versão) da linha viva
+        self._versions = {}  # ID -> última versão gravada (inclusive exclusões)
+        self._records = {}   # ID -> registro somente leitura
+        self._lines = 0      # linhas no arquivo (vivas e mortas)
+        self._size = 0       # bytes já lidos (até a última linha completa)
+        self._inode = None
+        self._snapshot = ()
+        self._snapshot_generation = -1
+        self._order = SortIndex(SNAPSHOT_ORDER)  # ordem do snapshot, mantida como os índices
+        self._indexes = {}   # nome -> índice derivado
+        self._compact_event = threading.Event()
+        self._compactor = None
+
+    # ------------------------------------------------------------------
+    # Leitura
+
+    def get_snapshot(self):
+        """
+        Retorna o snapshot atual do catálogo.
+
+        Returns:
+            tuple: Registros imutáveis dos cursos (mais recente primeiro).
+        """
+        with self._lock:
+            self._catch_up()
+            if self._snapshot_generation != self.generation:
+                self._snapshot = tuple(self._order.ordered('recent'))
+                self._snapshot_generation = self.generation
+            return self._snapshot
+
+    def get_index(self, name, factory):
+        """
+        Retorna um índice derivado do catálogo (ver CatalogCache.get_index).
+
+        Args:
+            name (str): Nome do índice.
+            factory (callable): Cria o índice vazio.
+
+        Returns:
+            object: Instância do índice compartilhada pelo processo.
+        """
+        with self._lock:
+            self._catch_up()
+            index = self._indexes.get(name)
+            if index is None:
+                index = factory()
+                index.rebuild(tuple(self._records.values()))
+                self._indexes[name] = index
+            return index
+
+    def read(self, course_id):
+        """
+        Lê a versão mais recente de um curso (um seek no arquivo).
+
+        Uma compactação em outro processo pode trocar o arquivo entre a
+        sincronização e a abertura: as posições só valem para o arquivo com o
+        inode já lido, então o arquivo aberto é conferido e, se for outro, o
+        diário é recarregado e a leitura repetida.
+
+        Args:
+            course_id (int): ID do curso.
+
+        Returns:
+            dict: Dados do curso ou None se não existir.
+        """
+        while True:
+            with self._lock:
+                self._catch_up()
+                entry = self._offsets.get(str(course_id))
+                if entry is None:
+                    return None
+                offset, length, _ = entry
+                try:
+                    with open(self.path, 'rb') as f:
+                        if os.fstat(f.fileno()).st_ino == self._inode:
+                            f.seek(offset)
+                            return json.loads(f.read(length))['data']
+                except FileNotFoundError:
+                    pass
+
+    def version_of(self, course_id):
+        """Última versão gravada de um curso (0 se nunca foi gravado)"""
+        with self._lock:
+            self._catch_up()
+            return self._versions.get(str(course_id), 0)
+
+    def max_id(self):
+        """Maior ID numérico já gravado no diário, inclusive excluídos"""
+        with self._lock:
+            self._catch_up()
+            return max((int(course_id) for course_id in self._versions if course_id.isdigit()), default=0)
+
+    # ------------------------------------------------------------------
+    # Gravação
+
+    def append(self, course):
+        """
+        Grava uma nova versão de um curso.
+
+        Args:
+            course (dict): Dados do curso (com 'id').
+
+        Returns:
+            int: Versão gravada.
+        """
+        return self.append_many([course])[0]
+
+    def append_many(self, courses):
+        """
+        Grava novas versões de vários cursos em um único append.
+
+        Args:
+            courses (iterable): Dados dos cursos (com 'id').
+
+        Returns:
+            list: Versões gravadas, na ordem dos cursos.
+        """
+        return self._write([(str(course['id']), False, dict(course)) for course in courses])
+
+    def delete(self, course_id):
+        """
+        Registra a exclusão de um curso.
+
+        Args:
+            course_id (int): ID do curso.
+
+        Returns:
+            bool: True se o curso existia.
+        """
+        with file_lock(self.lock_path), self._lock:
+            self._catch_up()
+            if str(course_id) not in self._offsets:
+                return False
+            self._append_locked([(str(course_id), True, None)])
+        self._schedule_compaction()
+        return True
+
+    def _write(self, entries):
+        """Acrescenta as linhas ao diário sob a trava de arquivo"""
+        if not entries:
+            return []
+        with file_lock(self.lock_path), self._lock:
+            self._catch_up()
+            versions = self._append_locked(entries)
+        self._schedule_compaction()
+        return versions
+
+    def _append_locked(self, entries):
+        """Acrescenta as linhas e aplica as alterações em memória (trava já obtida)"""
+        lines = []
+        versions = []
+        for course_id, deleted, data in entries:
+            version = self._versions.get(course_id, 0) + 1
+            self._versions[course_id] = version
+            versions.append(version)
+            lines.append((course_id, version, deleted, data,
+                          self._encode(course_id, version, deleted, data)))
+
+        with open(self.path, 'ab') as f:
+            offset = f.seek(0, os.SEEK_END)
+            if offset != self._size:
+                # Linha incompleta deixada por uma gravação interrompida: encerrá-la
+                # para que seja descartada como inválida
+                f.write(b'\n')
+                offset += 1
+                self._lines += 1
+            f.write(b''.join(line for *_, line in lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+        removed = []
+        added = []
+        for course_id, version, deleted, data, line in lines:
+            self._apply(course_id, version, deleted, data, offset, len(line), removed, added)
+            offset += len(line)
+        self._lines += len(lines)
+        self._size = offset
+        self._inode = os.stat(self.path).st_ino
+        self._publish(removed, added)
+        return versions
+
+    @staticmethod
+    def _encode(course_id, version, deleted, data):
+        """Serializa uma linha do diário"""
+        entry = {'id': course_id, 'version': version, 'deleted': deleted, 'data': data}
+        return (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+
+    # ------------------------------------------------------------------
+    # Sincronização com o arquivo
+
+    def _catch_up(self):
+        """
+        Aplica o que outros processos gravaram desde a última leitura.
+
+        Se o arquivo apenas cresceu, lê somente as linhas novas; se foi
+        substituído (compactação) ou truncado, relê tudo.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            if self._lines:
+                self._reload(None)
+            return
+
+        if stat.st_ino != self._inode or stat.st_size < self._size:
+            self._reload(stat)
+        elif stat.st_size > self._size:
+            removed = []
+            added = []
+            self._read_from(self._size, removed, added)
+            self._publish(removed, added)
+
+    def _reload(self, stat):
+        """Relê o arquivo inteiro, reaproveitando os registros que não mudaram"""
+        previous = self._records
+        self._offsets = {}
+        self._versions = {}
+        self._records = {}
+        self._lines = 0
+        self._size = 0
+        self._inode = stat.st_ino if stat else None
+
+        removed = []
+        added = []
+        if stat is not None:
+            self._read_from(0, [], [])
+
+        # Após uma compactação os dados são os mesmos: manter os registros
+        # existentes evita recalcular os índices
+        for course_id, record in list(self._records.items()):
+            old = previous.get(course_id)
+            if old is not None and dict(old) == dict(record):
+                self._records[course_id] = old
+            else:
+                if old is not None:
+                    removed.append(old)
+                added.append(record)
+        removed.extend(old for course_id, old in previous.items() if course_id not in self._records)
+        self._publish(removed, added)
+
+    def _read_from(self, start, removed, added):
+        """Lê sequencialmente as linhas completas a partir de uma posição"""
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break  # linha ainda sendo gravada
+                self._lines += 1
+                try:
+                    entry = json.loads(line)
+                    course_id = str(entry['id'])
+                    version = int(entry.get('version', 0))
+                except (ValueError, KeyError, TypeError):
+                    print(f"Linha inválida no diário {self.path} na posição {offset}")
+                    offset += len(line)
+                    continue
+                if version > self._versions.get(course_id, 0):
+                    self._versions[course_id] = version
+                    self._apply(course_id, version, entry.get('deleted'), entry.get('data'),
+                                offset, len(line), removed, added)
+                offset += len(line)
+        self._size = offset
+        if self._inode is None:
+            self._inode = os.stat(self.path).st_ino
+
+    def _apply(self, course_id, version, deleted, data, offset, length, removed, added):
+        """Atualiza o índice de posições e os registros em memória com uma linha"""
+        old = self._records.pop(course_id, None)
+        if old is not None:
+            removed.append(old)
+        if deleted or data is None:
+            self._offsets.pop(course_id, None)
+            return
+        self._offsets[course_id] = (offset, length, version)
+        record = encode_record(data)
+        self._records[course_id] = record
+        added.append(record)
+
+    def _publish(self, removed, added):
+        """Propaga as alterações para os índices derivados"""
+        if not removed and not added:
+            return
+        self.generation += 1
+        self._order.apply_changes(removed, added)
+        for index in self._indexes.values():
+            index.apply_changes(removed, added)
+
+    # ------------------------------------------------------------------
+    # Compactação
+
+    def dead_ratio(self):
+        """Proporção de linhas do arquivo que não são a versão viva de um curso"""
+        with self._lock:
+            if not self._lines:
+                return 0.0
+            return (self._lines - len(self._offsets)) / self._lines
+
+    def _should_compact(self):
+        return self._lines >= self.compact_min_records and self.dead_ratio() > self.compact_ratio
+
+    def _schedule_compaction(self):
+        """Acorda a thread de compactação quando há linhas mortas demais"""
+        with self._lock:
+            if not self._should_compact():
+                return
+            if self._compactor is None or not self._compactor.is_alive():
+                self._compactor = threading.Thread(target=self._compaction_loop,
+                                                   name='course-journal-compactor', daemon=True)
+                self._compactor.start()
+        self._compact_event.set()
+
+    def _compaction_loop(self):
+        while True:
+            self._compact_event.wait()
+            self._compact_event.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"Erro ao compactar o diário {self.path}: {str(e)}")
+
+    def compact(self, force=False):
+        """
+        Regrava o diário apenas com a versão viva de cada curso.
+
+        Args:
+            force (bool): Compactar mesmo abaixo do limite de linhas mortas.
+
+        Returns:
+            bool: True se o arquivo foi compactado.
+        """
+        with file_lock(self.lock_path), self._lock:
+            self._catch_up()
+            if not force and not self._should_compact():
+                return False
+
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            offsets = {}
+            offset = 0
+            with open(self.path, 'rb') as source, open(tmp_path, 'wb') as target:
+                for course_id, (old_offset, length, version) in sorted(self._offsets.items(),
+                                                                       key=lambda item: item[1][0]):
+                    source.seek(old_offset)
+                    target.write(source.read(length))
+                    offsets[course_id] = (offset, length, version)
+                    offset += length
+                target.flush()
+                os.fsync(target.fileno())
+            os.replace(tmp_path, self.path)
+
+            # Os registros em memória não mudam; apenas as posições
+            self._offsets = offsets
+            self._lines = len(offsets)
+            self._size = offset
+            self._inode = os.stat(self.path).st_ino
+            # Versões de cursos excluídos deixam de existir no arquivo
+            self._versions = {course_id: entry[2] for course_id, entry in offsets.items()}
+            return True
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_course_journal(path, compact_ratio=0.5, compact_min_records=100):
+    """
+    Retorna o diário de cursos associado a um arquivo.
+
+    Args:
+        path (str): Caminho do arquivo JSONL.
+        compact_ratio (float): Proporção de linhas mortas que dispara a compactação.
+        compact_min_records (int): Linhas mínimas no arquivo para compactar.
+
+    Returns:
+        CourseJournal: Instância compartilhada pelo processo.
+    """
+    key = os.path.abspath(path)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = CourseJournal(key, compact_ratio, compact_min_records)
+            _journals[key] = journal
+        return journal
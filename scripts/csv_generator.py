@@ -2,8 +2,11 @@
 # Módulo para geração de arquivos CSV a partir dos dados do curso
 
 import csv
-import os
+import io
 from datetime import datetime
+from models.course import Course
+from scripts.file_lock import atomic_write
+from scripts.storage_layout import ARTIFACT_DIRS, writable_path
 
 def generate_csv(course_data):
     """
@@ -15,27 +18,30 @@ def generate_csv(course_data):
     Returns:
         str: Caminho do arquivo CSV gerado.
     """
-    # Criar diretório CSV se não existir
-    csv_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'CSV')
+    csv_dir = ARTIFACT_DIRS['csv']
     print(f"Diretório CSV: {csv_dir}")
-    if not os.path.exists(csv_dir):
-        print(f"Criando diretório CSV: {csv_dir}")
-        os.makedirs(csv_dir)
     
     # Gerar nome do arquivo baseado na data atual, ID único e título do curso
     data_atual = datetime.now().strftime('%Y%m%d')
     titulo_formatado = course_data['titulo'].replace(' ', '_')
     course_id = course_data.get('id', 'unknown')
     filename = f"{data_atual}_{course_id}_{titulo_formatado}.csv"
-    filepath = os.path.join(csv_dir, filename)
+    # Caminho no shard do curso (diretório criado se não existir)
+    filepath = writable_path('csv', filename)
     print(f"Caminho completo do arquivo CSV: {filepath}")
     
-    # Escrever dados no arquivo CSV
-    with open(filepath, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = course_data.keys()
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        
-        writer.writeheader()
-        writer.writerow(course_data)
+    # Registro no formato do CSV gerado pelo modelo tipado (datas, vagas e
+    # unidades normalizadas, colunas na ordem de course_data)
+    row = Course.from_row(course_data).to_row()
+    
+    # Escrever dados no arquivo CSV (com rename: leitores nunca veem o arquivo
+    # pela metade e o cache do catálogo percebe a alteração pelo diretório)
+    csvfile = io.StringIO(newline='')
+    fieldnames = row.keys()
+    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+    
+    writer.writeheader()
+    writer.writerow(row)
+    atomic_write(filepath, csvfile.getvalue().encode('utf-8'))
     
-    return filepath
\ No newline at end of file
+    return filepath
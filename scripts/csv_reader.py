@@ -1,10 +1,59 @@
 # csv_reader.py
 # Módulo para leitura de arquivos CSV dos cursos
 
-import csv
 import os
-import glob
-from datetime import datetime
+import threading
+from scripts.catalog_cache import get_catalog_cache, parse_course_file
+from scripts.course_index import lookup_course_file, rebuild_index
+from scripts.storage_layout import ARTIFACT_DIRS, locate_artifact
+
+# Snapshot binário do catálogo já lido (arquivo oculto: ignorado nas varreduras do diretório)
+SNAPSHOT_FILE = os.path.join(ARTIFACT_DIRS['csv'], '.catalog_snapshot.pickle')
+
+# Geração do catálogo a partir da qual o índice de IDs foi reconstruído pela última vez
+_indexed_generation = None
+_index_lock = threading.Lock()
+
+def _csv_dir():
+    """Diretório onde os arquivos CSV estão armazenados"""
+    return ARTIFACT_DIRS['csv']
+
+def _catalog_cache():
+    """Cache do catálogo do processo, iniciado a partir do snapshot binário"""
+    return get_catalog_cache(_csv_dir(), SNAPSHOT_FILE)
+
+def get_catalog_snapshot():
+    """
+    Retorna o snapshot imutável do catálogo mantido em cache no processo.
+    
+    Apenas os diretórios cujo mtime mudou são listados de novo, e apenas os
+    arquivos cujo mtime ou tamanho mudaram são relidos do disco. Na primeira
+    chamada do processo o catálogo é carregado do snapshot binário gravado
+    pelos outros workers, em vez de interpretar cada CSV.
+    
+    Returns:
+        tuple: Registros somente leitura dos cursos (mais recente primeiro).
+    """
+    csv_dir = _csv_dir()
+    
+    if not os.path.exists(csv_dir):
+        print(f"Diretório CSV não encontrado: {csv_dir}")
+        return ()
+    
+    return _catalog_cache().get_snapshot()
+
+def get_catalog_index(name, factory):
+    """
+    Retorna um índice derivado do catálogo, sincronizado com o snapshot atual.
+    
+    Args:
+        name (str): Nome do índice.
+        factory (callable): Cria o índice vazio na primeira chamada.
+    
+    Returns:
+        object: Índice mantido incrementalmente pelo cache do catálogo.
+    """
+    return _catalog_cache().get_index(name, factory)
 
 def read_csv_files():
     """
@@ -13,78 +62,71 @@ def read_csv_files():
     Returns:
         list: Lista de dicionários contendo os dados dos cursos.
     """
-    # Diretório onde os arquivos CSV estão armazenados
-    csv_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'CSV')
+    # Cópias rasas para que os chamadores possam alterar os dicionários
+    # sem corromper o snapshot compartilhado
+    return [dict(course) for course in get_catalog_snapshot()]
+
+def _read_indexed_course(course_id_str):
+    """Lê o curso diretamente do arquivo apontado pelo índice de IDs"""
+    filename = lookup_course_file(course_id_str)
+    if not filename:
+        return None
     
-    if not os.path.exists(csv_dir):
-        print(f"Diretório CSV não encontrado: {csv_dir}")
-        return []
-    
-    courses = []
-    csv_files = glob.glob(os.path.join(csv_dir, "*.csv"))
-    
-    # Ignorar arquivos de teste
-    csv_files = [f for f in csv_files if not os.path.basename(f).startswith('teste')]
-    
-    for csv_file in csv_files:
-        try:
-            with open(csv_file, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                valid_rows = []
-                for row in reader:
-                    # Verificar se a linha tem todos os campos necessários
-                    if row and 'id' in row and 'titulo' in row:
-                        # Adicionar o nome do arquivo como referência
-                        row['file_id'] = row.get('id', '')
-                        row['source_file'] = os.path.basename(csv_file)
-                        valid_rows.append(row)
-                
-                # Se houver linhas válidas, adicionar apenas a última (mais completa)
-                if valid_rows:
-                    courses.append(valid_rows[-1])
-        except Exception as e:
-            print(f"Erro ao ler arquivo {csv_file}: {str(e)}")
-    
-    # Ordenar por data de criação (mais recente primeiro)
-    courses.sort(key=lambda x: x.get('created_at', ''), reverse=True)
-    
-    return courses
+    csv_file = locate_artifact('csv', filename)
+    try:
+        course = parse_course_file(csv_file)
+    except OSError:
+        return None
+    
+    # Conferir se o arquivo ainda pertence ao curso (índice pode estar desatualizado)
+    if course and course_id_str in (course.get('id'), course.get('file_id')):
+        return course
+    return None
+
+def refresh_course_index():
+    """
+    Reconstrói o índice de IDs se o catálogo mudou desde a última reconstrução.
+    
+    O índice é mantido pelas gravações da aplicação; só fica desatualizado
+    com arquivos alterados por fora (ex.: CSV copiados para a pasta). Por
+    isso ele é reconstruído no máximo uma vez por geração do catálogo, e IDs
+    inexistentes não causam novas reconstruções.
+    
+    Returns:
+        bool: True se o índice foi reconstruído.
+    """
+    global _indexed_generation
+    
+    cache = _catalog_cache()
+    with _index_lock:
+        snapshot = cache.get_snapshot()
+        if cache.generation == _indexed_generation:
+            return False
+        rebuild_index(snapshot)
+        _indexed_generation = cache.generation
+        return True
 
 def get_course_by_id(course_id):
     """
     Busca um curso específico pelo ID.
     
+    Usa o índice persistente de ID -> arquivo para abrir apenas um CSV. Se o
+    ID não estiver no índice e o catálogo tiver mudado desde a última
+    reconstrução, o índice é reconstruído e a busca é repetida uma única vez.
+    
     Args:
         course_id (int): ID do curso a ser buscado.
         
     Returns:
         dict: Dados do curso encontrado ou None se não encontrado.
     """
-    courses = read_csv_files()
-    
     # Converter course_id para string para comparação
     course_id_str = str(course_id)
     
-    # Imprimir informações de debug
-    print(f"Buscando curso com ID: {course_id_str}")
-    print(f"Total de cursos encontrados: {len(courses)}")
+    course = _read_indexed_course(course_id_str)
+    if course is None and refresh_course_index():
+        course = _read_indexed_course(course_id_str)
     
-    # Filtrar cursos com o ID correto
-    matching_courses = []
-    for course in courses:
-        course_id_value = course.get('id')
-        file_id_value = course.get('file_id')
-        print(f"Verificando curso: ID={course_id_value}, file_id={file_id_value}, titulo={course.get('titulo')}")
-        
-        if course_id_value == course_id_str or file_id_value == course_id_str:
-            matching_courses.append(course)
-    
-    if matching_courses:
-        # Se encontrou mais de um curso com o mesmo ID, use o mais recente
-        # (primeiro da lista, já que read_csv_files ordena por data de criação decrescente)
-        selected_course = matching_courses[0]
-        print(f"Curso encontrado: {selected_course.get('titulo')} (ID: {selected_course.get('id')})")
-        return selected_course
-    
-    print(f"Nenhum curso encontrado com ID: {course_id_str}")
-    return None
\ No newline at end of file
+    if course is None:
+        print(f"Nenhum curso encontrado com ID: {course_id_str}")
+    return course
@@ -0,0 +1,139 @@
+# field_index.py
+# Índices de igualdade (valor -> cursos) para os filtros do catálogo
+
+import threading
+from scripts.search_index import doc_key
+
+
+class FieldIndex:
+    """
+    Índices hash por campo: para cada campo, valor -> conjunto de documentos.
+
+    Como o SearchIndex, é mantido pelo CatalogCache e recebe apenas os
+    registros alterados a cada recarga. Os documentos são identificados por
+    doc_key (arquivo de origem), então os resultados dos dois índices podem
+    ser combinados por interseção de conjuntos.
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._lock = threading.Lock()
+        self._values = {field: {} for field in self.fields}  # campo -> valor -> {documentos}
+        self._records = {}       # documento -> registro
+        self._docs_by_id = {}    # ID do curso -> {documentos}
+
+    def rebuild(self, records):
+        """Reconstrói os índices a partir de todos os registros"""
+        with self._lock:
+            for values in self._values.values():
+                values.clear()
+            self._records.clear()
+            self._docs_by_id.clear()
+            for record in records:
+                self._add(record)
+
+    def apply_changes(self, removed, added):
+        """Aplica as alterações de uma recarga do catálogo"""
+        with self._lock:
+            for record in removed:
+                self._remove(record)
+            for record in added:
+                self._add(record)
+
+    def _add(self, record):
+        key = doc_key(record)
+        if key in self._records:
+            self._remove(self._records[key])
+        self._records[key] = record
+        self._docs_by_id.setdefault(str(record.get('id', '')), set()).add(key)
+        for field in self.fields:
+            self._values[field].setdefault(record.get(field) or '', set()).add(key)
+
+    def _remove(self, record):
+        key = doc_key(record)
+        if self._records.get(key) is not record:
+            return
+        del self._records[key]
+        self._discard(self._docs_by_id, str(record.get('id', '')), key)
+        for field in self.fields:
+            self._discard(self._values[field], record.get(field) or '', key)
+
+    @staticmethod
+    def _discard(mapping, value, key):
+        """Remove o documento do conjunto e descarta conjuntos vazios"""
+        docs = mapping.get(value)
+        if docs is not None:
+            docs.discard(key)
+            if not docs:
+                del mapping[value]
+
+    def matching_keys(self, filters):
+        """
+        Documentos que atendem a todos os filtros de igualdade.
+
+        Args:
+            filters (dict): Campo -> valor; campos não indexados são ignorados.
+
+        Returns:
+            set ou None: Documentos encontrados, ou None se nenhum campo indexado foi filtrado.
+        """
+        with self._lock:
+            doc_sets = [self._values[field].get(filters[field], set())
+                        for field in self.fields if filters.get(field)]
+            if not doc_sets:
+                return None
+            # Interseção começando pelo menor conjunto
+            doc_sets.sort(key=len)
+            result = set(doc_sets[0])
+            for docs in doc_sets[1:]:
+                result &= docs
+                if not result:
+                    break
+            return result
+
+    def keys_for_ids(self, course_ids):
+        """
+        Documentos correspondentes a um conjunto de IDs de curso.
+
+        Args:
+            course_ids (iterable): IDs (int ou str).
+
+        Returns:
+            set: Documentos dos cursos existentes entre os IDs informados.
+        """
+        with self._lock:
+            result = set()
+            for course_id in course_ids:
+                result.update(self._docs_by_id.get(str(course_id), ()))
+            return result
+
+    def all_keys(self):
+        """Conjunto de todos os documentos indexados"""
+        with self._lock:
+            return set(self._records)
+
+    def records(self, keys):
+        """
+        Registros dos documentos informados.
+
+        Args:
+            keys (iterable): Documentos (ver doc_key).
+
+        Returns:
+            list: Registros somente leitura, na ordem de keys.
+        """
+        with self._lock:
+            return [self._records[key] for key in keys if key in self._records]
+
+    def values(self, field):
+        """
+        Valores distintos (não vazios) de um campo indexado, em ordem alfabética.
+
+        Args:
+            field (str): Campo indexado.
+
+        Returns:
+            list: Valores distintos.
+        """
+        with self._lock:
+            return sorted(value for value in self._values[field] if value)
@@ -0,0 +1,74 @@
+# file_lock.py
+# Trava consultiva entre processos baseada em arquivo
+
+import os
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Trava entre threads do mesmo processo (flock não exclui threads do mesmo processo
+# quando cada uma abre o arquivo separadamente em todas as plataformas)
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+def _thread_lock_for(path):
+    """Retorna a trava de threads associada a um caminho"""
+    with _thread_locks_guard:
+        lock = _thread_locks.get(path)
+        if lock is None:
+            lock = threading.Lock()
+            _thread_locks[path] = lock
+        return lock
+
+@contextmanager
+def file_lock(path):
+    """
+    Mantém uma trava exclusiva sobre o arquivo `path` durante o bloco.
+
+    A trava é consultiva: protege apenas contra outros processos e threads
+    que também usem file_lock no mesmo caminho.
+
+    Args:
+        path (str): Caminho do arquivo de trava (criado se não existir).
+    """
+    path = os.path.abspath(path)
+    with _thread_lock_for(path):
+        with open(path, 'a+b') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+                else:
+                    lock_file.seek(0)
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def atomic_write(path, content, encoding='utf-8'):
+    """
+    Grava um arquivo de forma atômica (arquivo temporário + rename).
+
+    Args:
+        path (str): Caminho final do arquivo.
+        content (str ou bytes): Conteúdo a gravar; bytes são gravados em modo binário.
+        encoding (str): Codificação do arquivo (apenas para texto).
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if isinstance(content, bytes):
+        f = open(tmp_path, 'wb')
+    else:
+        f = open(tmp_path, 'w', encoding=encoding)
+    with f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# scripts/find_orphaned_files.py
+"""
+Script para listar arquivos que não pertencem ao manifesto de nenhum curso.
+Uso: python scripts/find_orphaned_files.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.course_index import find_orphaned_files, rebuild_index, ARTIFACT_DIRS
+from scripts.csv_reader import get_catalog_snapshot
+
+def main():
+    """Lista os arquivos órfãos de cada diretório de artefatos"""
+    print("🔍 Procurando arquivos órfãos")
+    print("=" * 50)
+
+    # Garantir que todos os cursos do catálogo tenham manifesto
+    rebuild_index(get_catalog_snapshot())
+
+    orphans = find_orphaned_files()
+    total = 0
+    for kind, names in orphans.items():
+        print(f"\n📁 {ARTIFACT_DIRS[kind]}: {len(names)} arquivo(s) órfão(s)")
+        for name in names:
+            print(f"   - {name}")
+        total += len(names)
+
+    print(f"\n✅ Total de arquivos órfãos: {total}")
+
+if __name__ == "__main__":
+    main()
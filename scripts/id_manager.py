@@ -3,95 +3,96 @@
 
 import os
 import json
-import glob
+from scripts.file_lock import file_lock, atomic_write
 
 # Arquivo para armazenar o último ID utilizado
 ID_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'last_id.json')
 
+# Arquivo de trava que serializa a alocação de IDs entre workers
+LOCK_FILE = f"{ID_FILE}.lock"
+
 def get_existing_ids():
     """
     Obtém todos os IDs existentes nos arquivos CSV.
-    
+
+    Usa o catálogo em cache (campos lidos com o módulo csv), portanto
+    títulos ou descrições com vírgula não afetam o resultado.
+
     Returns:
         set: Conjunto de IDs existentes.
     """
+    from scripts.csv_reader import get_catalog_snapshot
+
     existing_ids = set()
-    csv_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'CSV')
-    
-    if os.path.exists(csv_dir):
-        csv_files = glob.glob(os.path.join(csv_dir, "*.csv"))
-        for csv_file in csv_files:
-            try:
-                with open(csv_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    if len(lines) > 1:  # Se há pelo menos uma linha de dados
-                        # Pegar o ID da segunda linha (primeira linha de dados)
-                        data_line = lines[1].strip()
-                        if data_line:
-                            # Dividir por vírgula e pegar o penúltimo campo (ID)
-                            fields = data_line.split(',')
-                            if len(fields) >= 2:
-                                try:
-                                    course_id = int(fields[-2])  # Penúltimo campo
-                                    existing_ids.add(course_id)
-                                except (ValueError, IndexError):
-                                    pass
-            except Exception as e:
-                print(f"Erro ao ler arquivo {csv_file}: {str(e)}")
-    
+    for course in get_catalog_snapshot():
+        course_id = str(course.get('id', ''))
+        if course_id.isdigit():
+            existing_ids.add(int(course_id))
+
     return existing_ids
 
+def _read_last_id():
+    """Lê o último ID salvo (0 se o arquivo não existir ou for inválido)"""
+    try:
+        with open(ID_FILE, 'r') as f:
+            return int(json.load(f).get('last_id', 0))
+    except (FileNotFoundError, json.JSONDecodeError, ValueError, TypeError, AttributeError):
+        return 0
+
+def _write_last_id(last_id):
+    """Grava o último ID de forma atômica"""
+    atomic_write(ID_FILE, json.dumps({'last_id': last_id}))
+
 def get_next_id():
     """
     Obtém o próximo ID disponível para arquivos CSV e PDF.
-    Verifica se o ID já existe para evitar duplicatas.
-    
+
+    A leitura, o incremento e a gravação do contador acontecem sob uma trava
+    de arquivo, então workers concorrentes nunca recebem o mesmo ID. O custo
+    é constante: nenhum arquivo CSV é lido. A coerência com os arquivos já
+    existentes é garantida uma vez na inicialização por reconcile_last_id().
+
     Returns:
         int: O próximo ID disponível.
     """
-    # Obter IDs existentes
-    existing_ids = get_existing_ids()
-    
-    # Começar com o último ID salvo
-    last_id = 0
-    try:
-        if os.path.exists(ID_FILE):
-            with open(ID_FILE, 'r') as f:
-                try:
-                    data = json.load(f)
-                    last_id = data.get('last_id', 0)
-                except json.JSONDecodeError:
-                    pass
-    except FileNotFoundError:
-        pass
-    
-    # Encontrar o próximo ID disponível
-    next_id = last_id + 1
-    while next_id in existing_ids:
-        next_id += 1
-    
-    # Salvar o novo ID
-    with open(ID_FILE, 'w') as f:
-        json.dump({'last_id': next_id}, f)
-    
+    with file_lock(LOCK_FILE):
+        next_id = _read_last_id() + 1
+        _write_last_id(next_id)
+
     return next_id
 
+def reconcile_last_id(existing_ids=None):
+    """
+    Ajusta o contador para nunca ficar atrás do maior ID existente.
+
+    Deve ser chamada uma vez na inicialização; cobre arquivos copiados
+    manualmente para a pasta CSV ou um last_id.json perdido.
+
+    Args:
+        existing_ids (iterable): IDs já usados pelo mecanismo de armazenamento
+            (padrão: IDs dos arquivos CSV).
+
+    Returns:
+        int: O último ID após a reconciliação.
+    """
+    if existing_ids is None:
+        existing_ids = get_existing_ids()
+
+    with file_lock(LOCK_FILE):
+        last_id = _read_last_id()
+        max_existing = max(existing_ids, default=0)
+        if max_existing > last_id:
+            print(f"Ajustando last_id de {last_id} para {max_existing}")
+            last_id = max_existing
+            _write_last_id(last_id)
+
+    return last_id
+
 def get_current_id():
     """
     Obtém o ID atual sem incrementá-lo.
-    
+
     Returns:
         int: O ID atual.
     """
-    try:
-        if os.path.exists(ID_FILE):
-            with open(ID_FILE, 'r') as f:
-                try:
-                    data = json.load(f)
-                    return data.get('last_id', 0)
-                except json.JSONDecodeError:
-                    return 0
-    except FileNotFoundError:
-        return 0
-    
-    return 0
\ No newline at end of file
+    return _read_last_id()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# scripts/import_catalog.py
+"""
+Script para importar o catálogo atual em CSV para outro mecanismo de armazenamento.
+Uso: python scripts/import_catalog.py [sqlite|mysql|journal]
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from repositories import create_course_repository
+from scripts.csv_reader import read_csv_files
+
+def main():
+    """Importa todos os cursos dos arquivos CSV para o mecanismo escolhido"""
+    engine = sys.argv[1] if len(sys.argv) > 1 else 'sqlite'
+
+    print(f"📦 Importando catálogo CSV para '{engine}'")
+    print("=" * 50)
+
+    if engine == 'csv':
+        print("❌ O catálogo já está em CSV; escolha outro mecanismo.")
+        return
+
+    courses = read_csv_files()
+    print(f"Cursos encontrados nos arquivos CSV: {len(courses)}")
+
+    repository = create_course_repository(engine)
+    imported = repository.import_courses(courses)
+
+    print(f"\n✅ {imported} cursos importados com sucesso!")
+    print("\n📝 Para usar o novo armazenamento defina STORAGE_ENGINE no arquivo .env")
+
+if __name__ == "__main__":
+    main()
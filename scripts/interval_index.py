@@ -0,0 +1,277 @@
+# interval_index.py
+# Índice de intervalos sobre os períodos de inscrição e de aulas dos cursos
+
+import bisect
+import threading
+from datetime import date, timedelta
+from models.course import INSCRICAO_DATE_FORMATS, parse_date, units_of
+from scripts.search_index import doc_key
+
+# Períodos indexados de cada curso
+WINDOWS = ('inscricoes', 'aulas')
+
+# Filtros resolvidos pelo índice: nome -> (período, consulta)
+#   'covering': date, cursos cujo período contém o dia
+#   'starting'/'ending': (primeiro, último), cursos cujo período começa/termina no intervalo
+INTERVAL_FILTERS = {
+    'open_on': ('inscricoes', 'covering'),
+    'inscricoes_start': ('inscricoes', 'starting'),
+    'inscricoes_end': ('inscricoes', 'ending'),
+    'aulas_on': ('aulas', 'covering'),
+    'aulas_start': ('aulas', 'starting'),
+    'aulas_end': ('aulas', 'ending'),
+}
+
+# Filtro que remove os cursos com inscrições encerradas antes do dia informado
+EXCLUDE_CLOSED_FILTER = 'exclude_closed_before'
+
+
+def course_window(record, window):
+    """
+    Período de inscrição ou de aulas de um curso.
+
+    O período de aulas vai do primeiro início ao último término entre as
+    unidades; uma unidade só com uma das datas conta como um único dia.
+
+    Args:
+        record (Mapping): Registro do curso.
+        window (str): 'inscricoes' ou 'aulas'.
+
+    Returns:
+        tuple ou None: (início, fim) como date, ou None se o curso não tem
+            o período completo.
+    """
+    if window == 'inscricoes':
+        start = parse_date(record.get('inicio_inscricoes'), INSCRICAO_DATE_FORMATS)
+        end = parse_date(record.get('fim_inscricoes'), INSCRICAO_DATE_FORMATS)
+        if isinstance(start, date) and isinstance(end, date) and start <= end:
+            return start, end
+        return None
+    units = units_of(record)
+    starts = [unit.inicio_aulas for unit in units if isinstance(unit.inicio_aulas, date)]
+    ends = [unit.fim_aulas for unit in units if isinstance(unit.fim_aulas, date)]
+    if not starts and not ends:
+        return None
+    start, end = min(starts or ends), max(ends or starts)
+    return (start, end) if start <= end else None
+
+
+def week_range(day):
+    """Segunda-feira e domingo da semana do dia"""
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+class _Node:
+    """Nó da árvore de intervalos centrada"""
+
+    __slots__ = ('center', 'by_start', 'by_end', 'left', 'right')
+
+    def __init__(self, center, by_start, by_end):
+        self.center = center
+        self.by_start = by_start  # intervalos que contêm o centro, por início crescente
+        self.by_end = by_end      # os mesmos intervalos, por fim decrescente
+        self.left = None
+        self.right = None
+
+
+def _build_tree(items):
+    """
+    Monta a árvore de intervalos centrada.
+
+    Args:
+        items (list): Tuplas (início, fim, documento) ordenadas pelo início.
+
+    Returns:
+        _Node ou None: Raiz da árvore.
+    """
+    root = None
+    pending = [(items, None, None)]
+    while pending:
+        items, parent, side = pending.pop()
+        if not items:
+            continue
+        start, end, _ = items[len(items) // 2]
+        center = (start + end) // 2
+        left = [item for item in items if item[1] < center]
+        right = [item for item in items if item[0] > center]
+        here = [item for item in items if item[0] <= center <= item[1]]
+        node = _Node(center, here, sorted(here, key=lambda item: item[1], reverse=True))
+        if parent is None:
+            root = node
+        else:
+            setattr(parent, side, node)
+        pending.append((left, node, 'left'))
+        pending.append((right, node, 'right'))
+    return root
+
+
+class _WindowIndex:
+    """Intervalos de um período: listas ordenadas por início e por fim e árvore centrada"""
+
+    def __init__(self):
+        self.intervals = {}  # documento -> (início, fim) em dias ordinais
+        self.starts = []     # (início, documento), ordenada
+        self.ends = []       # (fim, documento), ordenada
+        self.tree = None
+        self.dirty = False
+
+    def add(self, key, interval):
+        self.intervals[key] = interval
+        bisect.insort(self.starts, (interval[0], key))
+        bisect.insort(self.ends, (interval[1], key))
+        self.dirty = True
+
+    def remove(self, key):
+        interval = self.intervals.pop(key, None)
+        if interval is None:
+            return
+        for items, value in ((self.starts, interval[0]), (self.ends, interval[1])):
+            position = bisect.bisect_left(items, (value, key))
+            if position < len(items) and items[position] == (value, key):
+                del items[position]
+        self.dirty = True
+
+    def covering(self, day):
+        """Documentos cujo intervalo contém o dia (O(log N + k))"""
+        if self.dirty:
+            items = sorted((start, end, key) for key, (start, end) in self.intervals.items())
+            self.tree = _build_tree(items)
+            self.dirty = False
+        keys = set()
+        node = self.tree
+        while node is not None:
+            if day < node.center:
+                for start, _, key in node.by_start:
+                    if start > day:
+                        break
+                    keys.add(key)
+                node = node.left
+            elif day > node.center:
+                for _, end, key in node.by_end:
+                    if end < day:
+                        break
+                    keys.add(key)
+                node = node.right
+            else:
+                keys.update(key for _, _, key in node.by_start)
+                break
+        return keys
+
+    @staticmethod
+    def between(items, first, last):
+        """Documentos com valor entre first e last, inclusive (O(log N + k))"""
+        low = bisect.bisect_left(items, (first,))
+        high = bisect.bisect_left(items, (last + 1,))
+        return {key for _, key in items[low:high]}
+
+
+class IntervalIndex:
+    """
+    Índice de intervalos dos períodos de inscrição e de aulas.
+
+    Mantido pelo cache do catálogo como os demais índices (rebuild e
+    apply_changes). Para cada período guarda os cursos ordenados pelo início
+    e pelo fim (consultas "começa entre" e "termina entre" por busca binária)
+    e uma árvore de intervalos centrada para "aberto no dia", refeita apenas
+    na primeira consulta após uma alteração. Cursos sem o período completo
+    não entram no índice daquele período.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows = {window: _WindowIndex() for window in WINDOWS}
+        self._records = {}  # documento -> registro
+
+    def rebuild(self, records):
+        """Reconstrói o índice a partir de todos os registros"""
+        with self._lock:
+            self._windows = {window: _WindowIndex() for window in WINDOWS}
+            self._records = {}
+            for record in records:
+                self._add(record)
+
+    def apply_changes(self, removed, added):
+        """Aplica as alterações de uma recarga do catálogo"""
+        with self._lock:
+            for record in removed:
+                self._remove(record)
+            for record in added:
+                self._add(record)
+
+    def _add(self, record):
+        key = doc_key(record)
+        if key in self._records:
+            self._remove(self._records[key])
+        self._records[key] = record
+        for window, index in self._windows.items():
+            interval = course_window(record, window)
+            if interval is not None:
+                index.add(key, (interval[0].toordinal(), interval[1].toordinal()))
+
+    def _remove(self, record):
+        key = doc_key(record)
+        if self._records.get(key) is not record:
+            return
+        del self._records[key]
+        for index in self._windows.values():
+            index.remove(key)
+
+    def open_on(self, day, window='inscricoes'):
+        """
+        Documentos cujo período contém o dia.
+
+        Args:
+            day (date): Dia consultado.
+            window (str): 'inscricoes' ou 'aulas'.
+
+        Returns:
+            set: Documentos encontrados (ver doc_key).
+        """
+        with self._lock:
+            return self._windows[window].covering(day.toordinal())
+
+    def starting_between(self, first, last, window='inscricoes'):
+        """Documentos cujo período começa entre first e last (inclusive)"""
+        with self._lock:
+            return _WindowIndex.between(self._windows[window].starts, first.toordinal(), last.toordinal())
+
+    def ending_between(self, first, last, window='inscricoes'):
+        """Documentos cujo período termina entre first e last (inclusive)"""
+        with self._lock:
+            return _WindowIndex.between(self._windows[window].ends, first.toordinal(), last.toordinal())
+
+    def ended_before(self, day, window='inscricoes'):
+        """Documentos cujo período terminou antes do dia"""
+        with self._lock:
+            ends = self._windows[window].ends
+            return {key for _, key in ends[:bisect.bisect_left(ends, (day.toordinal(),))]}
+
+    def matching_keys(self, filters):
+        """
+        Documentos que atendem a todos os filtros de período.
+
+        Args:
+            filters (dict): Filtros de INTERVAL_FILTERS; 'covering' recebe um
+                date e 'starting'/'ending' uma tupla (primeiro, último).
+
+        Returns:
+            set ou None: Documentos encontrados, ou None se nenhum filtro de período foi informado.
+        """
+        keys = None
+        for name, (window, query) in INTERVAL_FILTERS.items():
+            value = filters.get(name)
+            if not value:
+                continue
+            if query == 'covering':
+                docs = self.open_on(value, window)
+            elif query == 'starting':
+                docs = self.starting_between(value[0], value[1], window)
+            else:
+                docs = self.ending_between(value[0], value[1], window)
+            keys = docs if keys is None else keys & docs
+        return keys
+
+    def count_open(self, day, window='inscricoes'):
+        """Quantidade de cursos cujo período contém o dia"""
+        return len(self.open_on(day, window))
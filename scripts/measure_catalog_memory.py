@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+# scripts/measure_catalog_memory.py
+"""
+Script para medir (tracemalloc) a memória do catálogo em cache com e sem a
+codificação por dicionário dos campos repetitivos.
+Uso: python scripts/measure_catalog_memory.py [quantidade_de_cursos]
+"""
+
+import sys
+import os
+from types import MappingProxyType
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.catalog_encoding import encode_record, measure_catalog
+
+def main():
+    """Compara a memória do catálogo em dicionários com a do catálogo codificado"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+    print(f"📏 Medindo a memória de um catálogo com {count} cursos")
+    print("=" * 50)
+
+    plain, plain_bytes = measure_catalog(lambda row: MappingProxyType(row), count)
+    encoded, encoded_bytes = measure_catalog(encode_record, count)
+
+    # Os dois catálogos devem ter exatamente o mesmo conteúdo
+    assert all(dict(a) == dict(b) for a, b in zip(plain, encoded)), "Conteúdo divergente"
+
+    print(f"Dicionários:          {plain_bytes / 1024 / 1024:8.1f} MiB")
+    print(f"Codificado:           {encoded_bytes / 1024 / 1024:8.1f} MiB")
+    print(f"Proporção:            {encoded_bytes / plain_bytes:8.1%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# scripts/migrate_storage_layout.py
+"""
+Script para mover os arquivos de CSV/, PDF/, IMAGENSCURSOS/ e LOGOPARCEIROS/
+do layout antigo (diretório único) para o layout em shards.
+Uso: python scripts/migrate_storage_layout.py
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.storage_layout import ARTIFACT_DIRS, migrate_flat_files
+
+def main():
+    """Move os arquivos de cada diretório para o shard correspondente"""
+    print("📦 Migrando arquivos para o layout em shards")
+    print("=" * 50)
+
+    total = 0
+    for kind, directory in ARTIFACT_DIRS.items():
+        moved, conflicts = migrate_flat_files(kind)
+        total += moved
+        print(f"\n📁 {directory}: {moved} arquivo(s) movido(s)")
+        for filename in conflicts:
+            print(f"   ⚠️  Não movido (já existe no shard): {filename}")
+
+    print(f"\n✅ Migração concluída: {total} arquivo(s) movido(s)")
+    print("   A migração pode ser executada novamente com segurança.")
+
+if __name__ == "__main__":
+    main()
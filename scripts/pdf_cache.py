@@ -0,0 +1,85 @@
+# pdf_cache.py
+# Geração dos PDFs sob demanda, com cache pelo conteúdo exibido
+
+import os
+import threading
+import uuid
+from scripts.content_hash import content_hash
+from scripts.pdf_generator import generate_pdf, PDF_FIELDS
+from scripts.storage_layout import ARTIFACT_DIRS
+
+# Diretório oculto dentro de PDF/ (não aparece como órfão em iter_artifact_files)
+CACHE_DIR = os.path.join(ARTIFACT_DIRS['pdf'], '.cache')
+
+
+def pdf_content_hash(course):
+    """Hash dos campos exibidos no PDF (ver PDF_FIELDS)"""
+    return content_hash(course, PDF_FIELDS)
+
+
+class PDFCache:
+    """
+    Cache de PDFs gerados na hora do download.
+
+    Cada PDF é guardado em <cache_dir>/<2 primeiros dígitos>/<hash>.pdf, em
+    que hash cobre apenas os campos exibidos no PDF: edições que não mudam
+    esses campos continuam usando o mesmo arquivo, e cursos nunca baixados
+    não geram PDF. O diretório pode ser apagado a qualquer momento; os PDFs
+    são gerados novamente no próximo download.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def path_for(self, course):
+        """Caminho do PDF do curso no cache (o arquivo pode ainda não existir)"""
+        digest = pdf_content_hash(course)
+        return os.path.join(self.cache_dir, digest[:2], f"{digest}.pdf")
+
+    def get(self, course):
+        """
+        PDF do curso, gerado agora se não estiver no cache.
+
+        A geração grava em um arquivo temporário e o publica com rename, então
+        downloads simultâneos nunca veem um PDF incompleto.
+
+        Args:
+            course (Mapping): Registro atual do curso.
+
+        Returns:
+            str: Caminho do PDF.
+        """
+        path = self.path_for(course)
+        if os.path.exists(path):
+            return path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = generate_pdf(dict(course), f"{path}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_pdf_cache(cache_dir=CACHE_DIR):
+    """
+    Retorna o cache de PDFs associado a um diretório (uma instância por processo).
+
+    Args:
+        cache_dir (str): Diretório do cache.
+
+    Returns:
+        PDFCache: Cache compartilhado.
+    """
+    cache_dir = os.path.abspath(cache_dir)
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = PDFCache(cache_dir)
+            _caches[cache_dir] = cache
+        return cache
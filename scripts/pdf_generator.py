@@ -12,6 +12,7 @@ from reportlab.lib.units import inch, cm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
 from reportlab.lib.utils import simpleSplit
 import re
+from scripts.storage_layout import ARTIFACT_DIRS, writable_path
 
 def format_date_to_brazilian(date_str):
     """
@@ -145,29 +146,42 @@ def create_info_table(data, col_widths=None):
     
     return table
 
-def generate_pdf(course_data):
+# Campos do curso exibidos no PDF (o conteúdo do PDF depende apenas deles)
+PDF_FIELDS = (
+    'id', 'tipo_acao', 'titulo', 'orgao', 'tema', 'modalidade', 'created_at',
+    'descricao', 'descricao_original', 'plataforma_digital', 'aulas_assincronas',
+    'inicio_inscricoes', 'fim_inscricoes', 'inicio_aulas_data', 'fim_aulas_data',
+    'horario_inicio', 'horario_fim', 'dias_aula', 'carga_horaria', 'vagas_unidade',
+    'publico_alvo', 'oferece_certificado', 'pre_requisitos', 'acessibilidade',
+    'recursos_acessibilidade', 'curso_gratuito', 'valor_curso', 'valor_curso_inteira',
+    'valor_curso_meia', 'requisitos_meia', 'oferece_bolsa', 'valor_bolsa',
+    'requisitos_bolsa', 'endereco_unidade', 'bairro_unidade', 'parceiro_externo',
+    'parceiro_nome', 'parceiro_link', 'info_complementares',
+)
+
+def generate_pdf(course_data, filename=None):
     """
     Gera um arquivo PDF com os dados do curso.
     
     Args:
         course_data (dict): Dicionário contendo os dados do curso.
+        filename (str): Nome do arquivo (padrão: <data>_<id>_<título>.pdf) ou
+            caminho absoluto fora do layout em shards.
         
     Returns:
         str: Caminho do arquivo PDF gerado.
     """
-    # Criar diretório PDF se não existir
-    pdf_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'PDF')
+    pdf_dir = ARTIFACT_DIRS['pdf']
     print(f"Diretório PDF: {pdf_dir}")
-    if not os.path.exists(pdf_dir):
-        print(f"Criando diretório PDF: {pdf_dir}")
-        os.makedirs(pdf_dir)
     
     # Gerar nome do arquivo baseado na data atual e título do curso
-    data_atual = datetime.now().strftime('%Y%m%d')
-    titulo_formatado = course_data['titulo'].replace(' ', '_').replace('/', '_').replace('\\', '_')
-    course_id = course_data.get('id', 'unknown')
-    filename = f"{data_atual}_{course_id}_{titulo_formatado}.pdf"
-    filepath = os.path.join(pdf_dir, filename)
+    if not filename:
+        data_atual = datetime.now().strftime('%Y%m%d')
+        titulo_formatado = course_data['titulo'].replace(' ', '_').replace('/', '_').replace('\\', '_')
+        course_id = course_data.get('id', 'unknown')
+        filename = f"{data_atual}_{course_id}_{titulo_formatado}.pdf"
+    # Caminho no shard do curso (diretório criado se não existir)
+    filepath = filename if os.path.isabs(filename) else writable_path('pdf', filename)
     print(f"Caminho completo do arquivo PDF: {filepath}")
     
     # Configurar documento PDF com margens adequadas
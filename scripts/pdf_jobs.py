@@ -0,0 +1,246 @@
+# pdf_jobs.py
+# Geração dos PDFs em segundo plano, fora do caminho da requisição
+
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from scripts.file_lock import file_lock, atomic_write
+from scripts.pdf_generator import generate_pdf
+from scripts.storage_layout import ARTIFACT_DIRS, artifact_path, locate_artifact
+
+# Situações do PDF de um curso
+PENDING = 'pending'
+READY = 'ready'
+FAILED = 'failed'
+MISSING = 'missing'
+
+# Trava única dos marcadores (seções curtas: leitura, comparação e rename)
+_LOCK_FILE = os.path.join(ARTIFACT_DIRS['pdf'], '.jobs.lock')
+
+
+def pdf_filename(course):
+    """
+    Nome do PDF de um curso (mesmo nome base do CSV).
+
+    Args:
+        course (Mapping): Registro do curso.
+
+    Returns:
+        str ou None: Nome do arquivo, ou None se o curso não tem CSV.
+    """
+    if course.get('pdf_file'):
+        return course['pdf_file']
+    source = course.get('csv_file') or course.get('source_file')
+    return f"{os.path.splitext(source)[0]}.pdf" if source else None
+
+
+def _marker_path(filename):
+    """
+    Marcador do trabalho de um PDF, ao lado do arquivo final.
+
+    O marcador é um arquivo oculto ("." no início), então não aparece como
+    órfão em iter_artifact_files.
+    """
+    path = artifact_path('pdf', filename)
+    return os.path.join(os.path.dirname(path), f".{os.path.basename(path)}.job")
+
+
+def _jobs_lock():
+    """Trava entre processos dos marcadores"""
+    os.makedirs(ARTIFACT_DIRS['pdf'], exist_ok=True)
+    return file_lock(_LOCK_FILE)
+
+
+def _read_marker(filename):
+    try:
+        with open(_marker_path(filename), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _write_marker(filename, marker):
+    path = _marker_path(filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, json.dumps(marker))
+
+
+def _remove_marker(filename):
+    try:
+        os.remove(_marker_path(filename))
+    except FileNotFoundError:
+        pass
+
+
+def render_pdf(course_data, filename, token):
+    """
+    Gera um PDF e o publica se o trabalho ainda for o mais recente.
+
+    Executado nos processos do pool. O PDF é gerado em um arquivo
+    temporário e publicado com rename; se o curso foi editado ou excluído
+    durante a geração (marcador removido ou com outro token), o resultado é
+    descartado.
+
+    Args:
+        course_data (dict): Dados do curso.
+        filename (str): Nome final do PDF.
+        token (str): Identificador do trabalho.
+
+    Returns:
+        bool: True se o PDF foi publicado.
+    """
+    tmp_path = None
+    try:
+        tmp_path = generate_pdf(course_data, f"{filename}.{token}.tmp")
+        with _jobs_lock():
+            marker = _read_marker(filename)
+            if not marker or marker.get('token') != token:
+                return False
+            os.replace(tmp_path, artifact_path('pdf', filename))
+            tmp_path = None
+            _remove_marker(filename)
+        return True
+    except Exception as e:
+        print(f"Erro ao gerar PDF {filename}: {str(e)}")
+        print(traceback.format_exc())
+        with _jobs_lock():
+            marker = _read_marker(filename)
+            if marker and marker.get('token') == token:
+                _write_marker(filename, dict(marker, status=FAILED, error=str(e)))
+        return False
+    finally:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class PDFJobQueue:
+    """
+    Fila de geração de PDFs sobre um ProcessPoolExecutor limitado.
+
+    Cada trabalho deixa um marcador ao lado do PDF ({"status", "token",
+    "at"}), então a situação do PDF é visível para todos os processos da
+    aplicação: pendente enquanto o marcador existe, pronto quando o arquivo
+    existe e o marcador foi removido. Trabalhos pendentes há mais de
+    `timeout` segundos (ex.: processo encerrado no meio da geração) contam
+    como falha. Com max_workers=0, ou se o pool não puder ser usado, o PDF
+    é gerado de forma síncrona.
+    """
+
+    def __init__(self, max_workers=2, timeout=300):
+        self.max_workers = max(int(max_workers), 0)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _discard_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def submit(self, course_data, filename, on_ready=None):
+        """
+        Agenda a geração de um PDF, substituindo trabalhos anteriores do mesmo arquivo.
+
+        Args:
+            course_data (dict): Dados do curso.
+            filename (str): Nome final do PDF.
+            on_ready (callable): Chamado (no processo da aplicação) após a publicação.
+
+        Returns:
+            str: Situação do PDF após o agendamento (PENDING, ou READY/FAILED
+                quando gerado de forma síncrona).
+        """
+        token = uuid.uuid4().hex
+        with _jobs_lock():
+            _write_marker(filename, {'status': PENDING, 'token': token, 'at': time.time()})
+
+        if self.max_workers:
+            try:
+                future = self._get_executor().submit(render_pdf, dict(course_data), filename, token)
+                future.add_done_callback(lambda done: self._finished(done, filename, on_ready))
+                return PENDING
+            except Exception as e:
+                # Pool indisponível (ex.: hospedagem sem subprocessos): gerar aqui mesmo
+                print(f"Pool de PDFs indisponível, gerando {filename} de forma síncrona: {str(e)}")
+                self._discard_executor()
+
+        if render_pdf(course_data, filename, token) and on_ready:
+            on_ready()
+        return self.status(filename)
+
+    def _finished(self, future, filename, on_ready):
+        try:
+            if future.result() and on_ready:
+                on_ready()
+        except Exception as e:
+            print(f"Erro no trabalho do PDF {filename}: {str(e)}")
+
+    def cancel(self, filename):
+        """Descarta o trabalho pendente de um PDF (o resultado não será publicado)"""
+        with _jobs_lock():
+            _remove_marker(filename)
+
+    def status(self, filename):
+        """
+        Situação de um PDF.
+
+        Returns:
+            str: PENDING, READY, FAILED ou MISSING.
+        """
+        marker = _read_marker(filename)
+        if marker:
+            if marker.get('status') == PENDING and time.time() - marker.get('at', 0) < self.timeout:
+                return PENDING
+            return FAILED
+        return READY if os.path.exists(locate_artifact('pdf', filename)) else MISSING
+
+    def wait(self, filename, timeout):
+        """
+        Aguarda a conclusão de um PDF pendente.
+
+        Args:
+            filename (str): Nome do PDF.
+            timeout (float): Tempo máximo de espera, em segundos.
+
+        Returns:
+            str: Situação do PDF ao final da espera.
+        """
+        deadline = time.monotonic() + timeout
+        status = self.status(filename)
+        while status == PENDING and time.monotonic() < deadline:
+            time.sleep(0.2)
+            status = self.status(filename)
+        return status
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_pdf_queue(max_workers=2, timeout=300):
+    """
+    Retorna a fila de PDFs do processo (criada na primeira chamada).
+
+    Args:
+        max_workers (int): Processos do pool (0 = geração síncrona).
+        timeout (float): Segundos após os quais um trabalho pendente conta como falha.
+
+    Returns:
+        PDFJobQueue: Fila compartilhada.
+    """
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = PDFJobQueue(max_workers, timeout)
+        return _queue
@@ -0,0 +1,278 @@
+# search_index.py
+# Índice invertido para busca textual nos cursos (título, descrição e tema)
+
+import bisect
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+
+# Campos indexados e o peso de cada ocorrência no cálculo da relevância
+SEARCH_FIELDS = {'titulo': 2, 'tema': 1, 'descricao': 1}
+
+# Parâmetros do BM25
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+# Sufixos de plural (português) e sua forma no singular, do mais longo ao mais curto
+_PLURAL_SUFFIXES = (
+    ('coes', 'cao'),
+    ('soes', 'sao'),
+    ('oes', 'ao'),
+    ('aes', 'ao'),
+    ('ais', 'al'),
+    ('eis', 'el'),
+    ('ois', 'ol'),
+    ('uis', 'ul'),
+    ('res', 'r'),
+    ('zes', 'z'),
+    ('ns', 'm'),
+)
+
+
+def fold_text(text):
+    """
+    Normaliza o texto para comparação: remove acentos (NFKD) e usa minúsculas.
+
+    Args:
+        text (str): Texto original.
+
+    Returns:
+        str: Texto sem acentos, em minúsculas ("Programação" -> "programacao").
+    """
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def stem(token):
+    """
+    Radicalização leve: reduz plurais ao singular e advérbios em -mente.
+
+    Args:
+        token (str): Termo já normalizado por fold_text.
+
+    Returns:
+        str: Radical do termo.
+    """
+    if len(token) <= 3:
+        return token
+    if token.endswith('mente') and len(token) > 7:
+        return token[:-5]
+    for suffix, replacement in _PLURAL_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 2:
+            return token[:-len(suffix)] + replacement
+    if token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def tokenize(text):
+    """
+    Divide o texto em termos normalizados e radicalizados.
+
+    Args:
+        text (str): Texto original.
+
+    Returns:
+        list: Termos na ordem em que aparecem.
+    """
+    return [stem(token) for token in _TOKEN_RE.findall(fold_text(text))]
+
+
+def parse_query(query):
+    """
+    Interpreta uma consulta: todos os termos são obrigatórios (AND).
+
+    Um termo terminado em '*' é buscado como prefixo; o último termo também,
+    para que a busca funcione enquanto o usuário ainda digita.
+
+    Args:
+        query (str): Texto digitado.
+
+    Returns:
+        list: Pares (termo, é_prefixo).
+    """
+    words = query.split()
+    terms = []
+    for position, word in enumerate(words):
+        tokens = tokenize(word)
+        is_prefix = word.endswith('*') or position == len(words) - 1
+        for i, token in enumerate(tokens):
+            # Apenas o último termo gerado pela palavra é tratado como prefixo
+            terms.append((token, is_prefix and i == len(tokens) - 1))
+    return terms
+
+
+def doc_key(record):
+    """Identificador do documento no índice (arquivo de origem do curso)"""
+    return record.get('source_file') or str(record.get('id', ''))
+
+
+class SearchIndex:
+    """
+    Índice invertido (termo -> {documento: frequência}) com ranqueamento BM25.
+
+    Os documentos são os registros do catálogo, identificados pelo arquivo de
+    origem. O índice é mantido pelo CatalogCache: recebe apenas os registros
+    alterados a cada recarga, então uma busca custa proporcionalmente aos
+    termos consultados e aos documentos que os contêm, não ao catálogo inteiro.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings = {}   # termo -> {documento: frequência ponderada}
+        self._terms = []      # termos em ordem alfabética (busca por prefixo)
+        self._doc_terms = {}  # documento -> Counter de termos
+        self._doc_length = {}  # documento -> tamanho ponderado
+        self._records = {}    # documento -> registro
+        self._total_length = 0
+
+    def rebuild(self, records):
+        """Reconstrói o índice a partir de todos os registros"""
+        with self._lock:
+            self._postings.clear()
+            self._terms = []
+            self._doc_terms.clear()
+            self._doc_length.clear()
+            self._records.clear()
+            self._total_length = 0
+            for record in records:
+                self._add(record)
+
+    def apply_changes(self, removed, added):
+        """Aplica as alterações de uma recarga do catálogo"""
+        with self._lock:
+            for record in removed:
+                self._remove(record)
+            for record in added:
+                self._add(record)
+
+    def _add(self, record):
+        key = doc_key(record)
+        if key in self._records:
+            self._remove(self._records[key])
+
+        terms = Counter()
+        for field, weight in SEARCH_FIELDS.items():
+            for token in tokenize(record.get(field) or ''):
+                terms[token] += weight
+
+        self._records[key] = record
+        self._doc_terms[key] = terms
+        length = sum(terms.values())
+        self._doc_length[key] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            posting[key] = frequency
+
+    def _remove(self, record):
+        key = doc_key(record)
+        if self._records.get(key) is not record:
+            return
+        del self._records[key]
+        self._total_length -= self._doc_length.pop(key)
+        for term in self._doc_terms.pop(key):
+            posting = self._postings[term]
+            posting.pop(key, None)
+            if not posting:
+                del self._postings[term]
+                position = bisect.bisect_left(self._terms, term)
+                del self._terms[position]
+
+    def _expand(self, term, is_prefix):
+        """Lista os termos do índice que correspondem a um termo da consulta"""
+        if not is_prefix:
+            return [term] if term in self._postings else []
+        start = bisect.bisect_left(self._terms, term)
+        end = bisect.bisect_left(self._terms, term + '\uffff')
+        return self._terms[start:end]
+
+    def search(self, query):
+        """
+        Busca os cursos que contêm todos os termos da consulta.
+
+        Args:
+            query (str): Texto de busca.
+
+        Returns:
+            list: Registros encontrados, do mais para o menos relevante.
+        """
+        with self._lock:
+            scores = self._score(query)
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            return [self._records[key] for key, _ in ranked]
+
+    def matching_keys(self, query):
+        """
+        Conjunto de documentos que atendem à consulta, sem calcular relevância.
+
+        Args:
+            query (str): Texto de busca.
+
+        Returns:
+            set: Chaves dos documentos encontrados (ver doc_key).
+        """
+        with self._lock:
+            return self._match(query)[1]
+
+    def _match(self, query):
+        """
+        Resolve a consulta em termos do índice e documentos candidatos.
+
+        Returns:
+            tuple: (grupos de termos expandidos, documentos que contêm todos eles).
+        """
+        terms = parse_query(query)
+        if not terms:
+            return [], set()
+
+        # Cada termo da consulta vira a união das postagens dos termos expandidos
+        groups = []
+        for term, is_prefix in terms:
+            expanded = self._expand(term, is_prefix)
+            if not expanded:
+                return [], set()
+            groups.append(expanded)
+
+        def group_docs(group):
+            docs = set()
+            for indexed_term in group:
+                docs.update(self._postings[indexed_term])
+            return docs
+
+        # Interseção (AND) começando pelo grupo com menos documentos
+        doc_sets = sorted((group_docs(group) for group in groups), key=len)
+        candidates = doc_sets[0]
+        for docs in doc_sets[1:]:
+            candidates = candidates & docs
+            if not candidates:
+                break
+        return groups, candidates
+
+    def _score(self, query):
+        """Calcula a pontuação BM25 dos documentos que contêm todos os termos"""
+        groups, candidates = self._match(query)
+        if not candidates:
+            return {}
+
+        total_docs = len(self._records)
+        average_length = self._total_length / total_docs
+        scores = dict.fromkeys(candidates, 0.0)
+        for group in groups:
+            for indexed_term in group:
+                posting = self._postings[indexed_term]
+                idf = math.log(1 + (total_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for key in candidates:
+                    frequency = posting.get(key)
+                    if not frequency:
+                        continue
+                    norm = 1 - BM25_B + BM25_B * self._doc_length[key] / average_length
+                    scores[key] += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+        return scores
@@ -0,0 +1,221 @@
+# sort_index.py
+# Ordenações do catálogo mantidas incrementalmente (listas ordenadas por chave)
+
+import bisect
+import threading
+from models.course import SORTABLE_TIMESTAMPS, record_timestamp
+from scripts.interval_index import course_window
+from scripts.search_index import doc_key
+
+# Campos de data de inscrição: posição no período de inscrição (ver course_window)
+DATE_FIELDS = {'inicio_inscricoes': 0, 'fim_inscricoes': 1}
+
+# Custo de calcular a chave de ordenação de um registro, em passos do percurso
+# da ordenação pré-calculada (um teste de pertinência em conjunto por passo)
+SORT_KEY_COST = 32
+
+
+def sort_value(record, field):
+    """
+    Valor de ordenação de um campo.
+
+    Timestamps e datas de inscrição são convertidos para ISO 8601 (ordenam
+    corretamente como texto); as datas de inscrição só contam quando o
+    período está completo, como nas colunas dos repositórios SQL. Os demais
+    campos são comparados sem diferenciar maiúsculas.
+
+    Args:
+        record (Mapping): Registro do curso.
+        field (str): Campo ordenado.
+
+    Returns:
+        str: Valor comparável ('' para campos vazios).
+    """
+    if field in SORTABLE_TIMESTAMPS:
+        return record_timestamp(record, field)
+    if field in DATE_FIELDS:
+        window = course_window(record, 'inscricoes')
+        return window[DATE_FIELDS[field]].isoformat() if window else ''
+    return str(record.get(field) or '').lower()
+
+
+def sort_key(record, field):
+    """Chave completa de ordenação: (valor, ID numérico, documento)"""
+    course_id = str(record.get('id', ''))
+    return (sort_value(record, field), course_id.zfill(12), doc_key(record))
+
+
+class SortIndex:
+    """
+    Ordenações do catálogo pré-calculadas.
+
+    Para cada ordenação guarda uma lista de chaves (valor, ID, documento) em
+    ordem crescente; ordenações decrescentes percorrem a lista do fim para o
+    início. Como os demais índices do catálogo, recebe apenas os registros
+    alterados a cada recarga: cada alteração é uma busca binária e uma
+    inserção na lista, sem reordenar o catálogo. Uma página é uma fatia da
+    lista (custo proporcional ao tamanho da página) e a posição de um curso
+    é encontrada por busca binária.
+    """
+
+    def __init__(self, options):
+        # Nome da ordenação -> (campo, decrescente)
+        self.options = dict(options)
+        self._lock = threading.Lock()
+        self._orders = {name: [] for name in self.options}
+        self._records = {}  # documento -> registro
+
+    def rebuild(self, records):
+        """Reconstrói as ordenações a partir de todos os registros"""
+        with self._lock:
+            self._records = {doc_key(record): record for record in records}
+            for name, (field, _) in self.options.items():
+                self._orders[name] = sorted(sort_key(record, field) for record in self._records.values())
+
+    def apply_changes(self, removed, added):
+        """Aplica as alterações de uma recarga do catálogo"""
+        with self._lock:
+            for record in removed:
+                self._remove(record)
+            for record in added:
+                self._add(record)
+
+    def _add(self, record):
+        key = doc_key(record)
+        if key in self._records:
+            self._remove(self._records[key])
+        self._records[key] = record
+        for name, (field, _) in self.options.items():
+            bisect.insort(self._orders[name], sort_key(record, field))
+
+    def _remove(self, record):
+        key = doc_key(record)
+        if self._records.get(key) is not record:
+            return
+        del self._records[key]
+        for name, (field, _) in self.options.items():
+            order = self._orders[name]
+            entry = sort_key(record, field)
+            position = bisect.bisect_left(order, entry)
+            if position < len(order) and order[position] == entry:
+                del order[position]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._records)
+
+    def _entry_at(self, name, position):
+        """Chave na posição da ordenação (já considerando a direção)"""
+        order = self._orders[name]
+        return order[len(order) - 1 - position] if self.options[name][1] else order[position]
+
+    def page(self, name, start, limit):
+        """
+        Registros de uma fatia da ordenação.
+
+        Args:
+            name (str): Nome da ordenação.
+            start (int): Posição inicial.
+            limit (int): Quantidade máxima de registros.
+
+        Returns:
+            list: Registros somente leitura, na ordem pedida.
+        """
+        with self._lock:
+            stop = min(start + limit, len(self._records))
+            return [self._records[self._entry_at(name, position)[2]] for position in range(start, stop)]
+
+    def ordered(self, name):
+        """Todos os registros na ordem pedida (cópia feita sob a trava)"""
+        with self._lock:
+            order = self._orders[name]
+            entries = reversed(order) if self.options[name][1] else order
+            return [self._records[entry[2]] for entry in entries]
+
+    def position(self, name, record):
+        """
+        Posição de um registro na ordenação.
+
+        Returns:
+            int ou None: Posição (0 = primeiro), ou None se o registro não está no índice.
+        """
+        with self._lock:
+            field, descending = self.options[name]
+            order = self._orders[name]
+            entry = sort_key(record, field)
+            index = bisect.bisect_left(order, entry)
+            if index >= len(order) or order[index] != entry:
+                return None
+            return len(order) - 1 - index if descending else index
+
+    def select(self, name, keys=None, exclude=frozenset(), start=0, limit=None, after=None):
+        """
+        Fatia da ordenação restrita a um subconjunto de documentos (ex.: filtros).
+
+        Percorre a ordenação pré-calculada pulando os documentos fora de
+        `keys` ou em `exclude` e para assim que a fatia está completa, sem
+        calcular chaves nem ordenar. Quando `keys` é pequeno em relação ao
+        trecho que o percurso teria de atravessar, ordena apenas esses
+        documentos.
+
+        Args:
+            name (str): Nome da ordenação.
+            keys (set): Documentos aceitos (None = todos).
+            exclude (set): Documentos ignorados.
+            start (int): Quantidade de documentos aceitos a pular.
+            limit (int): Quantidade máxima de registros (None = até o fim).
+            after (int): Posição na ordenação completa; quando informada, a
+                fatia começa no primeiro documento aceito depois dela e start
+                é ignorado.
+
+        Returns:
+            tuple: (registros somente leitura na ordem pedida, quantidade de
+                documentos aceitos antes do primeiro registro).
+        """
+        with self._lock:
+            field, descending = self.options[name]
+            order = self._orders[name]
+            if keys is not None and self._sorting_is_cheaper(len(keys), len(order), start, limit, after):
+                return self._sort_keys(name, field, descending, keys, exclude, start, limit, after)
+
+            entries = reversed(order) if descending else iter(order)
+            skip = start
+            if after is not None:
+                skip = 0
+                for position, entry in enumerate(entries):
+                    if (keys is None or entry[2] in keys) and entry[2] not in exclude:
+                        skip += 1
+                    if position >= after:
+                        break
+            page = []
+            accepted = 0
+            for entry in entries:
+                if (keys is not None and entry[2] not in keys) or entry[2] in exclude:
+                    continue
+                accepted += 1
+                if after is None and accepted <= start:
+                    continue
+                page.append(self._records[entry[2]])
+                if limit is not None and len(page) >= limit:
+                    break
+            return page, skip
+
+    @staticmethod
+    def _sorting_is_cheaper(matches, size, start, limit, after):
+        """Compara o custo de ordenar os documentos com o de percorrer a ordenação"""
+        if limit is None:
+            return matches * SORT_KEY_COST < size
+        reach = (after or 0) + (start + limit) * size / max(matches, 1)
+        return matches * SORT_KEY_COST < min(reach, size)
+
+    def _sort_keys(self, name, field, descending, keys, exclude, start, limit, after):
+        """Ordena apenas os documentos pedidos (chamado com self._lock)"""
+        entries = sorted(sort_key(self._records[key], field) for key in keys
+                         if key in self._records and key not in exclude)
+        if after is not None:
+            anchor = self._entry_at(name, after)
+            start = len(entries) - bisect.bisect_left(entries, anchor) if descending else bisect.bisect_right(entries, anchor)
+        if descending:
+            entries.reverse()
+        stop = None if limit is None else start + limit
+        return [self._records[entry[2]] for entry in entries[start:stop]], start
@@ -0,0 +1,180 @@
+# storage_layout.py
+# Organização dos arquivos dos cursos em subdiretórios (shards)
+
+import os
+import re
+import hashlib
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Diretório base de cada tipo de artefato
+ARTIFACT_DIRS = {
+    'csv': os.path.join(_ROOT, 'CSV'),
+    'pdf': os.path.join(_ROOT, 'PDF'),
+    'cover': os.path.join(_ROOT, 'static', 'images', 'IMAGENSCURSOS'),
+    'logo': os.path.join(_ROOT, 'static', 'images', 'LOGOPARCEIROS'),
+}
+
+# Diretório servido pelo Flask como /static
+STATIC_DIR = os.path.join(_ROOT, 'static')
+
+# Quantidade de IDs por shard dos arquivos CSV e PDF (CSV/0000/, CSV/0001/, ...)
+SHARD_SIZE = 1000
+
+# Nome dos arquivos gerados: <data>_<id>_<título>.<ext>
+_GENERATED_NAME_RE = re.compile(r'^\d{8}_(\d+)_')
+
+
+def shard_of(kind, filename):
+    """
+    Subdiretório (shard) de um arquivo, calculado apenas a partir do nome.
+
+    Arquivos CSV e PDF gerados são agrupados por faixa de ID; capas, logos e
+    demais arquivos por um prefixo do hash do nome (256 shards).
+
+    Args:
+        kind (str): Tipo do artefato ('csv', 'pdf', 'cover' ou 'logo').
+        filename (str): Nome do arquivo.
+
+    Returns:
+        str: Nome do subdiretório.
+    """
+    if kind in ('csv', 'pdf'):
+        match = _GENERATED_NAME_RE.match(filename)
+        if match:
+            return f"{int(match.group(1)) // SHARD_SIZE:04d}"
+    return hashlib.md5(filename.encode('utf-8')).hexdigest()[:2]
+
+
+def generated_course_id(filename):
+    """
+    ID do curso no nome de um CSV ou PDF gerado (<data>_<id>_<título>.<ext>).
+
+    Args:
+        filename (str): Nome do arquivo.
+
+    Returns:
+        int ou None: ID do curso, ou None se o nome não segue o padrão.
+    """
+    match = _GENERATED_NAME_RE.match(os.path.basename(filename))
+    return int(match.group(1)) if match else None
+
+
+def artifact_path(kind, filename):
+    """
+    Caminho de um arquivo no layout em shards.
+
+    Args:
+        kind (str): Tipo do artefato.
+        filename (str): Nome do arquivo (sem diretório).
+
+    Returns:
+        str: Caminho completo (o arquivo pode ainda não existir).
+    """
+    filename = os.path.basename(filename)
+    return os.path.join(ARTIFACT_DIRS[kind], shard_of(kind, filename), filename)
+
+
+def writable_path(kind, filename):
+    """
+    Caminho onde um arquivo deve ser gravado, criando o shard se necessário.
+
+    Args:
+        kind (str): Tipo do artefato.
+        filename (str): Nome do arquivo (sem diretório).
+
+    Returns:
+        str: Caminho completo no layout em shards.
+    """
+    path = artifact_path(kind, filename)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def locate_artifact(kind, filename):
+    """
+    Caminho de um arquivo existente, aceitando também o layout antigo (plano).
+
+    Args:
+        kind (str): Tipo do artefato.
+        filename (str): Nome do arquivo (sem diretório).
+
+    Returns:
+        str: Caminho no layout em shards ou, se o arquivo ainda não foi
+            migrado, no diretório base.
+    """
+    path = artifact_path(kind, filename)
+    if os.path.exists(path):
+        return path
+    legacy_path = os.path.join(ARTIFACT_DIRS[kind], os.path.basename(filename))
+    return legacy_path if os.path.exists(legacy_path) else path
+
+
+def static_artifact_path(kind, filename):
+    """
+    Caminho relativo a /static de uma capa ou logo (para url_for('static', ...)).
+
+    Args:
+        kind (str): 'cover' ou 'logo'.
+        filename (str): Nome do arquivo.
+
+    Returns:
+        str: Caminho com '/' como separador.
+    """
+    return os.path.relpath(locate_artifact(kind, filename), STATIC_DIR).replace(os.sep, '/')
+
+
+def iter_artifact_files(kind):
+    """
+    Percorre os arquivos de um tipo, nos shards e no diretório base.
+
+    Args:
+        kind (str): Tipo do artefato.
+
+    Yields:
+        tuple: (nome do arquivo, caminho completo).
+    """
+    base_dir = ARTIFACT_DIRS[kind]
+    if not os.path.isdir(base_dir):
+        return
+    with os.scandir(base_dir) as entries:
+        for entry in entries:
+            if entry.name.startswith('.'):
+                continue
+            if entry.is_file():
+                yield entry.name, entry.path
+            elif entry.is_dir():
+                with os.scandir(entry.path) as shard_entries:
+                    for shard_entry in shard_entries:
+                        if shard_entry.is_file() and not shard_entry.name.startswith('.'):
+                            yield shard_entry.name, shard_entry.path
+
+
+def migrate_flat_files(kind):
+    """
+    Move os arquivos do diretório base (layout antigo) para os shards.
+
+    Args:
+        kind (str): Tipo do artefato.
+
+    Returns:
+        tuple: (arquivos movidos, nomes não movidos porque já existem no shard).
+    """
+    base_dir = ARTIFACT_DIRS[kind]
+    if not os.path.isdir(base_dir):
+        return 0, []
+
+    with os.scandir(base_dir) as entries:
+        flat_files = [entry.name for entry in entries if entry.is_file() and not entry.name.startswith('.')]
+
+    moved = 0
+    conflicts = []
+    for filename in flat_files:
+        target = artifact_path(kind, filename)
+        if os.path.exists(target):
+            conflicts.append(filename)
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(os.path.join(base_dir, filename), target)
+        moved += 1
+    return moved, conflicts
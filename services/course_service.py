@@ -1,20 +1,59 @@
 # services/course_service.py
 # Serviço de negócio para cursos
 
-from typing import Dict, List, Optional, Tuple
-from repositories.course_repository import CourseRepository
+import math
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from config import Config
+from repositories import create_course_repository
+from repositories.course_repository import SORT_OPTIONS
 from services.validation_service import CourseValidator, ValidationError
 from services.ai_service import AIService
 from services.file_service import FileService
+from services.course_status_service import CourseStatusService
+from models.course import Course, Unit, format_value, html_date
+from scripts.interval_index import EXCLUDE_CLOSED_FILTER, week_range
+
+# Períodos aceitos nas listas de cursos (filtro 'periodo')
+PERIODS = ('vigentes', 'abertas', 'semana', 'encerrando', 'aulas_semana', 'encerradas')
+
+def period_filters(period: Optional[str], today: date) -> Dict:
+    """
+    Converte um período nomeado nos filtros de período do repositório
+    
+    Args:
+        period: 'vigentes' (inscrições não encerradas), 'abertas' (abertas no dia),
+            'semana' (inscrições começando na semana), 'encerrando' (abertas e
+            terminando nos próximos Config.CLOSING_SOON_DAYS dias), 'aulas_semana'
+            (aulas começando na semana) ou 'encerradas'
+        today: Dia de referência
+        
+    Returns:
+        Dict: Filtros do repositório (vazio para períodos desconhecidos)
+    """
+    if period == 'vigentes':
+        return {EXCLUDE_CLOSED_FILTER: today}
+    if period == 'abertas':
+        return {'open_on': today}
+    if period == 'semana':
+        return {'inscricoes_start': week_range(today)}
+    if period == 'encerrando':
+        return {'open_on': today, 'inscricoes_end': (today, today + timedelta(days=Config.CLOSING_SOON_DAYS))}
+    if period == 'aulas_semana':
+        return {'aulas_start': week_range(today)}
+    if period == 'encerradas':
+        return {'inscricoes_end': (date.min, today - timedelta(days=1))}
+    return {}
 
 class CourseService:
     """Serviço de negócio para operações com cursos"""
     
     def __init__(self):
-        self.repository = CourseRepository()
+        self.repository = create_course_repository()
         self.validator = CourseValidator()
         self.ai_service = AIService()
         self.file_service = FileService()
+        self.status_service = CourseStatusService()
     
     def create_course(self, form_data: Dict, files: Dict = None) -> Tuple[bool, Dict, List[str]]:
         """
@@ -100,26 +139,158 @@ class CourseService:
         """Busca um curso pelo ID"""
         return self.repository.find_by_id(course_id)
     
-    def list_courses(self, search_query: str = None, modality: str = None, orgao: str = None) -> List[Dict]:
+    def existing_course_ids(self, course_ids: Iterable[int]) -> Set[int]:
+        """Filtra os IDs informados, mantendo apenas os de cursos existentes"""
+        return self.repository.existing_ids(course_ids)
+    
+    def list_courses(self, search_query: str = None, modality: str = None, orgao: str = None,
+                     tema: str = None, tipo_acao: str = None, inserted: Optional[bool] = None,
+                     bairro: str = None, periodo: str = None) -> List[Dict]:
         """
-        Lista cursos com filtros opcionais
+        Lista cursos com qualquer combinação de filtros
+        
+        Os filtros são resolvidos nos índices do repositório por interseção
+        de conjuntos antes de carregar os registros.
         
         Args:
             search_query: Texto de busca
             modality: Modalidade do curso
             orgao: Órgão responsável
+            tema: Tema do curso
+            tipo_acao: Tipo de ação
+            inserted: True/False para filtrar pelo status de inserção
+            bairro: Bairro de uma das unidades
+            periodo: Período de inscrição ou de aulas (ver PERIODS)
             
         Returns:
             List[Dict]: Lista de cursos filtrados
         """
-        if search_query:
-            return self.repository.search_courses(search_query)
-        elif modality:
-            return self.repository.get_courses_by_modality(modality)
-        elif orgao:
-            return self.repository.get_courses_by_orgao(orgao)
-        else:
-            return self.repository.find_all()
+        filters = self._resolve_filters({
+            'modalidade': modality,
+            'orgao': orgao,
+            'tema': tema,
+            'tipo_acao': tipo_acao,
+            'inserted': inserted,
+            'bairro': bairro,
+            'periodo': periodo,
+        })
+        if not filters:
+            # Somente busca textual: manter a ordenação por relevância
+            return self.repository.search_courses(search_query) if search_query else self.repository.find_all()
+        
+        filters['search'] = search_query
+        return list(self.repository.iter_courses(filters=filters))
+    
+    def _resolve_filters(self, filters: Optional[Dict]) -> Dict:
+        """
+        Converte os filtros 'inserted' (em filtros por IDs) e 'periodo' (nos
+        filtros de período com a data de hoje) e remove filtros vazios
+        
+        Args:
+            filters: Filtros recebidos (campos, 'bairro', 'search', 'inserted'
+                e 'periodo')
+            
+        Returns:
+            Dict: Filtros aceitos pelo repositório
+        """
+        filters = {key: value for key, value in (filters or {}).items() if value not in (None, '')}
+        inserted = filters.pop('inserted', None)
+        if inserted is not None:
+            inserted_ids = self.status_service.get_inserted_courses()
+            filters['ids' if inserted else 'exclude_ids'] = inserted_ids
+        filters.update(period_filters(filters.pop('periodo', None), date.today()))
+        return filters
+    
+    def list_courses_page(self, page: int = 1, per_page: int = None, sort: str = 'recent',
+                          filters: Dict = None) -> Dict:
+        """
+        Lista uma página de cursos com filtros opcionais
+        
+        Args:
+            page: Número da página (começando em 1)
+            per_page: Cursos por página (padrão: Config.COURSES_PER_PAGE)
+            sort: Ordenação (ver repositories.course_repository.SORT_OPTIONS; nomes
+                desconhecidos usam 'recent')
+            filters: Filtros por campo (modalidade, orgao, tema, tipo_acao), 'bairro', 'search',
+                'inserted' e 'periodo'
+            
+        Returns:
+            Dict: Página do repositório acrescida de 'page' e 'pages'
+        """
+        per_page = per_page or Config.COURSES_PER_PAGE
+        page = max(int(page or 1), 1)
+        if sort not in SORT_OPTIONS:
+            sort = 'recent'
+        
+        result = self.repository.find_page(offset=(page - 1) * per_page, limit=per_page, sort=sort,
+                                           filters=self._resolve_filters(filters))
+        result['page'] = page
+        result['pages'] = max(math.ceil(result['total'] / per_page), 1)
+        return result
+    
+    def get_filter_options(self) -> Dict[str, List[str]]:
+        """
+        Valores distintos usados nos filtros das listas de cursos
+        
+        Returns:
+            Dict[str, List[str]]: Órgãos, temas, modalidades e bairros existentes no catálogo
+        """
+        return {
+            'orgaos': self.repository.distinct_values('orgao'),
+            'temas': self.repository.distinct_values('tema'),
+            'modalidades': self.repository.distinct_values('modalidade'),
+            'bairros': self.repository.distinct_values('bairro'),
+        }
+    
+    def get_course_facets(self, inserted_ids: Set[int] = None) -> Dict:
+        """
+        Contadores do cabeçalho da área administrativa
+        
+        Os contadores são mantidos pelo repositório; nenhum curso é percorrido
+        para montar o resultado.
+        
+        Args:
+            inserted_ids: IDs dos cursos marcados como inseridos (padrão: CourseStatusService)
+            
+        Returns:
+            Dict: total, inserted, gratuitos, pagos, total_vagas, inscricoes_abertas
+                e contagens por modalidade, orgao e tema
+        """
+        if inserted_ids is None:
+            inserted_ids = self.status_service.get_inserted_courses()
+        return self.repository.get_facet_counts(inserted_ids)
+    
+    def get_course_history(self, course_id: int) -> List[Dict]:
+        """
+        Trilha de auditoria de um curso, da versão mais recente para a mais antiga
+        
+        Args:
+            course_id: ID do curso
+            
+        Returns:
+            List[Dict]: version, at, action e changes (campo -> (valor anterior, valor novo))
+        """
+        return list(reversed(self.repository.list_versions(course_id)))
+    
+    def get_course_version(self, course_id: int, version: int = None) -> Optional[Dict]:
+        """Dados de um curso em uma versão do histórico (padrão: a mais recente)"""
+        return self.repository.get_version(course_id, version)
+    
+    def diff_course_versions(self, course_id: int, from_version: int, to_version: int = None) -> Dict:
+        """Diferenças entre duas versões de um curso: campo -> (valor antigo, valor novo)"""
+        return self.repository.diff_versions(course_id, from_version, to_version)
+    
+    def get_pdf_status(self, course: Dict) -> str:
+        """Situação do PDF de um curso: 'pending', 'ready', 'failed' ou 'missing'"""
+        return self.repository.pdf_status(course)
+    
+    def get_pdf_on_demand(self, filename: str) -> Optional[str]:
+        """Caminho do PDF gerado (ou lido do cache) a partir do registro atual do curso"""
+        return self.repository.render_pdf(filename)
+    
+    def wait_for_pdf(self, filename: str, timeout: float) -> str:
+        """Aguarda um PDF em geração por até timeout segundos e retorna sua situação"""
+        return self.repository.wait_for_pdf(filename, timeout)
     
     def delete_course(self, course_id: int) -> Tuple[bool, str]:
         """
@@ -319,7 +490,7 @@ class CourseService:
         # Campos que NÃO devem ser copiados (ficarão em branco)
         fields_to_clear = [
             'id', 'titulo', 'descricao_original', 'descricao', 
-            'created_at', 'csv_file', 'pdf_file',
+            'created_at', 'created_at_iso', 'csv_file', 'pdf_file',
             'capa_curso'  # Logo pode ser mantido se quiserem
         ]
         
@@ -338,47 +509,24 @@ class CourseService:
         # Processar dados de múltiplas unidades (igual ao template de edição)
         modalidade = duplicate_data.get('modalidade', '').lower()
         if modalidade == 'presencial' or modalidade == 'híbrido':
-            # Processar dados de múltiplas unidades separados por |
-            enderecos = duplicate_data.get('endereco_unidade', '').split('|') if duplicate_data.get('endereco_unidade') else ['']
-            bairros = duplicate_data.get('bairro_unidade', '').split('|') if duplicate_data.get('bairro_unidade') else ['']
-            vagas = duplicate_data.get('vagas_unidade', '').split('|') if duplicate_data.get('vagas_unidade') else ['']
-            inicio_aulas = duplicate_data.get('inicio_aulas_data', '').split('|') if duplicate_data.get('inicio_aulas_data') else ['']
-            fim_aulas = duplicate_data.get('fim_aulas_data', '').split('|') if duplicate_data.get('fim_aulas_data') else ['']
-            horario_inicio = duplicate_data.get('horario_inicio', '').split('|') if duplicate_data.get('horario_inicio') else ['']
-            horario_fim = duplicate_data.get('horario_fim', '').split('|') if duplicate_data.get('horario_fim') else ['']
-            dias_aula = duplicate_data.get('dias_aula', '').split('|') if duplicate_data.get('dias_aula') else ['']
+            # Interpretar as unidades uma única vez (datas já no formato HTML)
+            parsed = Course.from_row(course_data)
+            units = parsed.units or [Unit()]
+            enderecos = [unit.endereco for unit in units]
+            bairros = [unit.bairro for unit in units]
+            inicio_aulas_converted = [html_date(unit.inicio_aulas) for unit in units]
+            fim_aulas_converted = [html_date(unit.fim_aulas) for unit in units]
             
             # Arrays para múltiplas unidades (usado pelo template)
             duplicate_data['enderecos_unidades'] = enderecos
             duplicate_data['bairros_unidades'] = bairros
-            duplicate_data['vagas_unidades'] = vagas
-            duplicate_data['inicio_aulas_unidades'] = inicio_aulas
-            duplicate_data['fim_aulas_unidades'] = fim_aulas
-            duplicate_data['horario_inicio_unidades'] = horario_inicio
-            duplicate_data['horario_fim_unidades'] = horario_fim
-            duplicate_data['dias_aula_unidades'] = dias_aula
-            
-            # Converter datas para formato HTML (YYYY-MM-DD)
-            inicio_aulas_converted = []
-            fim_aulas_converted = []
-            
-            for data in inicio_aulas:
-                if data:
-                    converted = self._convert_date_to_html_format(data)
-                    inicio_aulas_converted.append(converted)
-                else:
-                    inicio_aulas_converted.append('')
-            
-            for data in fim_aulas:
-                if data:
-                    converted = self._convert_date_to_html_format(data)
-                    fim_aulas_converted.append(converted)
-                else:
-                    fim_aulas_converted.append('')
-            
-            # Atualizar arrays com datas convertidas
+            duplicate_data['vagas_unidades'] = [format_value(unit.vagas) for unit in units]
             duplicate_data['inicio_aulas_unidades'] = inicio_aulas_converted
             duplicate_data['fim_aulas_unidades'] = fim_aulas_converted
+            duplicate_data['horario_inicio_unidades'] = [unit.horario_inicio for unit in units]
+            duplicate_data['horario_fim_unidades'] = [unit.horario_fim for unit in units]
+            # Os dias de aula valem para todas as unidades
+            duplicate_data['dias_aula_unidades'] = [parsed.dias_aula for _ in units]
             
             print(f"🔄 Preparando {len(enderecos)} unidades para duplicação:")
             for i, endereco in enumerate(enderecos):
@@ -387,43 +535,3 @@ class CourseService:
                 print(f"      Fim: {fim_aulas_converted[i] if i < len(fim_aulas_converted) else ''}")
         
         return duplicate_data 
-   
-    def _convert_date_to_html_format(self, date_string: str) -> str:
-        """
-        Converte data para formato HTML (YYYY-MM-DD)
-        
-        Args:
-            date_string: Data em formato DD/MM/YYYY ou YYYY-MM-DD
-            
-        Returns:
-            str: Data no formato YYYY-MM-DD
-        """
-        if not date_string:
-            return ''
-        
-        # Se já está no formato correto (YYYY-MM-DD)
-        import re
-        if re.match(r'^\d{4}-\d{2}-\d{2}$', date_string):
-            return date_string
-        
-        # Se está no formato DD/MM/YYYY
-        if '/' in date_string:
-            try:
-                parts = date_string.split('/')
-                if len(parts) == 3:
-                    dia, mes, ano = parts
-                    return f"{ano}-{mes.zfill(2)}-{dia.zfill(2)}"
-            except:
-                pass
-        
-        # Se está no formato DD-MM-YYYY
-        if '-' in date_string and len(date_string.split('-')[0]) <= 2:
-            try:
-                parts = date_string.split('-')
-                if len(parts) == 3:
-                    dia, mes, ano = parts
-                    return f"{ano}-{mes.zfill(2)}-{dia.zfill(2)}"
-            except:
-                pass
-        
-        return date_string
\ No newline at end of file
@@ -3,71 +3,267 @@
 
 import json
 import os
-from typing import Dict, Set
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
 from config import Config
+from scripts.file_lock import file_lock, atomic_write
+
+# Tamanho dos blocos lidos do fim do log pelo histórico (get_status_events)
+EVENT_BLOCK_SIZE = 64 * 1024
 
 class CourseStatusService:
-    """Serviço para gerenciar quais cursos já foram inseridos no sistema"""
+    """
+    Serviço para gerenciar quais cursos já foram inseridos no sistema
+    
+    Cada alteração é gravada como um evento compacto ({"id", "inserted",
+    "by", "at"}) acrescentado a course_status.log, que nunca é reescrito e
+    serve de histórico de quem marcou o quê e quando. O mapa de status é o
+    último snapshot (course_status.json, que guarda a posição do log já
+    incorporada) mais os eventos seguintes; um novo snapshot é gravado a
+    cada STATUS_SNAPSHOT_INTERVAL eventos, então uma alteração custa uma
+    linha no log em vez de reescrever o mapa inteiro.
+    
+    O status fica em memória: cada leitura só lê os bytes acrescentados ao
+    log desde a anterior, e o snapshot só é relido quando muda (inode, mtime
+    e tamanho). Alterações são feitas sob uma trava de arquivo, sobre o
+    conteúdo mais recente do disco: cliques simultâneos não perdem
+    atualizações.
+    """
     
     def __init__(self):
-        self.status_file = os.path.join(os.path.dirname(Config.CSV_DIR), 'course_status.json')
+        base_dir = os.path.dirname(Config.CSV_DIR)
+        self.status_file = os.path.join(base_dir, 'course_status.json')
+        self.log_file = os.path.join(base_dir, 'course_status.log')
+        self.lock_file = f"{self.status_file}.lock"
+        self.snapshot_interval = max(int(Config.STATUS_SNAPSHOT_INTERVAL), 1)
+        self._lock = threading.Lock()
+        self._fingerprint = None
+        self._log_inode = None
+        self._log_offset = 0
+        self._log_events = 0  # eventos do log posteriores ao snapshot
+        self._status = {}
+        self._inserted = frozenset()
         self._ensure_status_file()
     
     def _ensure_status_file(self):
         """Garante que o arquivo de status existe"""
         if not os.path.exists(self.status_file):
-            self._save_status({})
+            with file_lock(self.lock_file):
+                if not os.path.exists(self.status_file):
+                    self._save_snapshot({}, 0)
     
-    def _load_status(self) -> Dict[str, bool]:
-        """Carrega o status dos cursos do arquivo JSON"""
+    def _file_fingerprint(self):
+        """Impressão digital do snapshot de status (None se não existir)"""
+        try:
+            stat = os.stat(self.status_file)
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def _read_snapshot(self):
+        """
+        Lê o snapshot de status
+        
+        Returns:
+            tuple: (status, posição do log já incorporada). Arquivos no formato
+                antigo (apenas o mapa de status) valem como posição 0.
+        """
         try:
             with open(self.status_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                data = json.load(f)
         except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+            return {}, 0
+        if isinstance(data.get('status'), dict):
+            return data['status'], int(data.get('log_offset', 0))
+        return data, 0
+    
+    def _read_events(self, offset: int):
+        """
+        Lê os eventos do log a partir de uma posição
+        
+        Uma linha final incompleta fica para a próxima leitura.
+        
+        Returns:
+            tuple: (eventos, nova posição, inode do log ou None se não existir)
+        """
+        try:
+            f = open(self.log_file, 'rb')
+        except FileNotFoundError:
+            return [], offset, None
+        events = []
+        with f:
+            inode = os.fstat(f.fileno()).st_ino
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                try:
+                    events.append(json.loads(line))
+                except ValueError:
+                    continue
+        return events, offset, inode
     
-    def _save_status(self, status_data: Dict[str, bool]):
-        """Salva o status dos cursos no arquivo JSON"""
+    def _iter_events_reversed(self):
+        """
+        Percorre os eventos do log do último para o primeiro
+        
+        O log é lido em blocos de EVENT_BLOCK_SIZE a partir do fim, então quem
+        para no meio do percurso não lê o restante do arquivo. Uma linha final
+        incompleta (ainda sendo gravada) é ignorada.
+        
+        Yields:
+            dict: Evento do log
+        """
         try:
-            with open(self.status_file, 'w', encoding='utf-8') as f:
-                json.dump(status_data, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            print(f"Erro ao salvar status dos cursos: {str(e)}")
+            f = open(self.log_file, 'rb')
+        except FileNotFoundError:
+            return
+        with f:
+            position = f.seek(0, os.SEEK_END)
+            buffer = b''
+            trailing = True  # texto após a última quebra de linha ainda não descartado
+            while position > 0:
+                size = min(EVENT_BLOCK_SIZE, position)
+                position -= size
+                f.seek(position)
+                buffer = f.read(size) + buffer
+                if trailing:
+                    if b'\n' not in buffer:
+                        continue
+                    buffer = buffer[:buffer.rindex(b'\n')]
+                    trailing = False
+                lines = buffer.split(b'\n')
+                # A primeira linha do bloco pode continuar no bloco anterior
+                buffer = lines.pop(0) if position > 0 else b''
+                for line in reversed(lines):
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+    
+    def _load_status(self) -> Dict[str, bool]:
+        """Retorna o status dos cursos, lendo do disco apenas o que mudou"""
+        fingerprint = self._file_fingerprint()
+        with self._lock:
+            if fingerprint is None or fingerprint != self._fingerprint:
+                self._reset_from_snapshot(fingerprint)
+            events, offset, inode = self._read_events(self._log_offset)
+            if self._log_inode is not None and inode != self._log_inode:
+                # Log substituído (ex.: restaurado de um backup): recomeçar do snapshot
+                self._reset_from_snapshot(fingerprint)
+                events, offset, inode = self._read_events(self._log_offset)
+            self._log_inode = inode
+            if events:
+                self._apply_events(events)
+            self._log_offset = offset
+            return self._status
+    
+    def _reset_from_snapshot(self, fingerprint):
+        """Recarrega o status a partir do snapshot (chamado com self._lock)"""
+        status_data, offset = self._read_snapshot()
+        self._set_cache(dict(status_data))
+        self._fingerprint = fingerprint
+        self._log_inode = None
+        self._log_offset = offset
+        self._log_events = 0
+    
+    def _apply_events(self, events: List[dict]):
+        """Aplica eventos do log ao status em memória (chamado com self._lock)"""
+        status_data = dict(self._status)
+        for event in events:
+            if event.get('inserted'):
+                status_data[str(event['id'])] = True
+            else:
+                status_data.pop(str(event['id']), None)
+        self._set_cache(status_data)
+        self._log_events += len(events)
+    
+    def _set_cache(self, status_data: Dict[str, bool]):
+        """Atualiza o status em memória (chamado com self._lock)"""
+        self._status = status_data
+        self._inserted = frozenset(int(course_id) for course_id, inserted in status_data.items() if inserted)
+    
+    def _save_snapshot(self, status_data: Dict[str, bool], log_offset: int):
+        """Grava o snapshot do status (gravação atômica)"""
+        snapshot = {'log_offset': log_offset, 'status': status_data}
+        atomic_write(self.status_file, json.dumps(snapshot, ensure_ascii=False, separators=(',', ':')))
+        fingerprint = self._file_fingerprint()
+        with self._lock:
+            if self._log_offset == log_offset:
+                self._fingerprint = fingerprint
+                self._log_events = 0
     
-    def mark_course_as_inserted(self, course_id: int) -> bool:
+    def _append_events(self, events: List[dict]):
+        """Acrescenta eventos ao log (uma linha JSON por evento)"""
+        lines = ''.join(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n' for event in events)
+        with open(self.log_file, 'ab') as f:
+            f.write(lines.encode('utf-8'))
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _update_status(self, change: Callable[[Dict[str, bool]], object], admin: Optional[str] = None):
+        """
+        Aplica uma alteração ao status sob a trava do arquivo
+        
+        Args:
+            change: Função que recebe uma cópia do status atual, altera-a e
+                retorna o resultado da operação
+            admin: Usuário responsável pela alteração (registrado no log)
+            
+        Returns:
+            O valor retornado por change
+        """
+        with file_lock(self.lock_file):
+            current = self._load_status()
+            status_data = dict(current)
+            result = change(status_data)
+            
+            at = datetime.now().isoformat(timespec='seconds')
+            events = [
+                {'id': int(key), 'inserted': bool(status_data.get(key)), 'by': admin, 'at': at}
+                for key in sorted(set(current) | set(status_data), key=int)
+                if bool(current.get(key)) != bool(status_data.get(key))
+            ]
+            if events:
+                self._append_events(events)
+                self._load_status()
+                if self._log_events >= self.snapshot_interval:
+                    self._save_snapshot(self._status, self._log_offset)
+            return result
+    
+    def mark_course_as_inserted(self, course_id: int, admin: Optional[str] = None) -> bool:
         """
         Marca um curso como inserido no sistema
         
         Args:
             course_id: ID do curso
+            admin: Usuário responsável pela alteração
             
         Returns:
             bool: True se marcado com sucesso
         """
         try:
-            status_data = self._load_status()
-            status_data[str(course_id)] = True
-            self._save_status(status_data)
+            self._update_status(lambda status_data: status_data.__setitem__(str(course_id), True), admin)
             return True
         except Exception as e:
             print(f"Erro ao marcar curso {course_id} como inserido: {str(e)}")
             return False
     
-    def unmark_course_as_inserted(self, course_id: int) -> bool:
+    def unmark_course_as_inserted(self, course_id: int, admin: Optional[str] = None) -> bool:
         """
         Desmarca um curso como inserido no sistema
         
         Args:
             course_id: ID do curso
+            admin: Usuário responsável pela alteração
             
         Returns:
             bool: True se desmarcado com sucesso
         """
         try:
-            status_data = self._load_status()
-            if str(course_id) in status_data:
-                del status_data[str(course_id)]
-                self._save_status(status_data)
+            self._update_status(lambda status_data: status_data.pop(str(course_id), None), admin)
             return True
         except Exception as e:
             print(f"Erro ao desmarcar curso {course_id}: {str(e)}")
@@ -91,27 +287,74 @@ class CourseStatusService:
         Retorna o conjunto de IDs dos cursos marcados como inseridos
         
         Returns:
-            Set[int]: Conjunto de IDs dos cursos inseridos
+            Set[int]: Conjunto (somente leitura) de IDs dos cursos inseridos
         """
-        status_data = self._load_status()
-        return {int(course_id) for course_id in status_data.keys() if status_data[course_id]}
+        self._load_status()
+        return self._inserted
     
-    def toggle_course_status(self, course_id: int) -> bool:
+    def toggle_course_status(self, course_id: int, admin: Optional[str] = None) -> bool:
         """
         Alterna o status de inserção de um curso
         
+        A leitura e a gravação acontecem sob a mesma trava.
+        
         Args:
             course_id: ID do curso
+            admin: Usuário responsável pela alteração
             
         Returns:
             bool: Novo status do curso (True = inserido, False = não inserido)
         """
-        if self.is_course_inserted(course_id):
-            self.unmark_course_as_inserted(course_id)
-            return False
-        else:
-            self.mark_course_as_inserted(course_id)
+        def toggle(status_data):
+            if status_data.pop(str(course_id), False):
+                return False
+            status_data[str(course_id)] = True
             return True
+        return self._update_status(toggle, admin)
+    
+    def set_courses_status(self, updates: Dict[int, bool], admin: Optional[str] = None) -> Dict[int, bool]:
+        """
+        Altera o status de vários cursos em uma única gravação
+        
+        Args:
+            updates: ID do curso -> True (inserido) ou False (não inserido)
+            admin: Usuário responsável pela alteração
+            
+        Returns:
+            Dict[int, bool]: Apenas os cursos cujo status mudou, com o novo status
+        """
+        def apply(status_data):
+            changed = {}
+            for course_id, inserted in updates.items():
+                key = str(course_id)
+                if bool(status_data.get(key, False)) == bool(inserted):
+                    continue
+                if inserted:
+                    status_data[key] = True
+                else:
+                    del status_data[key]
+                changed[int(course_id)] = bool(inserted)
+            return changed
+        return self._update_status(apply, admin)
+    
+    def get_status_events(self, course_id: Optional[int] = None, limit: Optional[int] = None) -> List[dict]:
+        """
+        Retorna o histórico de alterações de status, do mais recente para o mais antigo
+        
+        Args:
+            course_id: Filtrar por um curso (padrão: todos)
+            limit: Quantidade máxima de eventos (padrão: todos)
+            
+        Returns:
+            List[dict]: Eventos com id, inserted, by e at
+        """
+        events = []
+        for event in self._iter_events_reversed():
+            if limit is not None and len(events) >= limit:
+                break
+            if course_id is None or event.get('id') == int(course_id):
+                events.append(event)
+        return events
     
     def get_status_summary(self) -> Dict[str, int]:
         """
@@ -124,4 +367,4 @@ class CourseStatusService:
         return {
             'total_inserted': len(inserted_courses),
             'inserted_ids': list(inserted_courses)
-        }
\ No newline at end of file
+        }
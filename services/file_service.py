@@ -3,13 +3,14 @@
 
 import os
 from config import Config
+from scripts.storage_layout import ARTIFACT_DIRS, artifact_path, writable_path
 
 class FileService:
     """Serviço para operações com arquivos"""
     
     def __init__(self):
         self.upload_folder = Config.UPLOAD_FOLDER
-        self.logo_partners_folder = Config.LOGO_PARCEIROS_FOLDER
+        self.logo_partners_folder = ARTIFACT_DIRS['logo']
         self.allowed_extensions = Config.ALLOWED_EXTENSIONS
         self.max_file_size = Config.MAX_FILE_SIZE
     
@@ -53,8 +54,8 @@ class FileService:
                 print(f"Clean name: {clean_name}")
                 print(f"Final filename: {filename}")
                 
-                # Caminho completo do arquivo
-                file_path = os.path.join(logo_dir, filename)
+                # Caminho completo do arquivo (no shard do nome)
+                file_path = writable_path('logo', filename)
                 print(f"Full file path: {file_path}")
                 
                 # Verificar se arquivo já existe
@@ -184,7 +185,7 @@ class FileService:
             print("\n2. Redimensionando imagem para 1080x1080...")
             
             # Criar pasta static/images/IMAGENSCURSOS se não existir
-            images_folder = os.path.join(os.getcwd(), 'static', 'images', 'IMAGENSCURSOS')
+            images_folder = ARTIFACT_DIRS['cover']
             if not self.ensure_directory(images_folder):
                 print(f"Erro ao criar diretório {images_folder}")
                 return None
@@ -198,17 +199,15 @@ class FileService:
             safe_title = self._sanitize_filename(course_title)
             new_filename = f"{safe_title}.jpg"  # Sempre salvar como JPEG após redimensionamento
             
-            # Caminho completo do arquivo
-            file_path = os.path.join(images_folder, new_filename)
-            
             # Verificar se arquivo já existe e adicionar sufixo se necessário
+            # (cada nome tem seu próprio shard, então o caminho é recalculado)
             counter = 1
-            original_path = file_path
-            while os.path.exists(file_path):
-                name, ext = os.path.splitext(original_path)
-                file_path = f"{name}_{counter}{ext}"
-                new_filename = os.path.basename(file_path)
+            original_filename = new_filename
+            while os.path.exists(artifact_path('cover', new_filename)) or os.path.exists(os.path.join(images_folder, new_filename)):
+                name, ext = os.path.splitext(original_filename)
+                new_filename = f"{name}_{counter}{ext}"
                 counter += 1
+            file_path = writable_path('cover', new_filename)
             
             # Redimensionar e salvar
             print(f"Salvando imagem redimensionada em: {file_path}")
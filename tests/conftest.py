@@ -0,0 +1,7 @@
+# conftest.py
+# Configuração dos testes: raiz do projeto no caminho de importação
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,61 @@
+# test_bulk_status.py
+# Rota de status de inserção em lote (/course_status/bulk)
+
+import importlib
+import pytest
+from config import Config
+from services.course_status_service import CourseStatusService
+
+
+class FakeCourseService:
+    """Catálogo com os cursos 1, 2 e 3"""
+
+    def existing_course_ids(self, course_ids):
+        return {course_id for course_id in course_ids if course_id in (1, 2, 3)}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    # O app cria os serviços na importação: manter os arquivos no diretório temporário
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Config, 'ADMIN_USERNAME', Config.ADMIN_USERNAME or 'admin')
+    monkeypatch.setattr(Config, 'ADMIN_PASSWORD', Config.ADMIN_PASSWORD or 'senha')
+    monkeypatch.setattr(Config, 'PDF_WORKERS', 0)
+    app_module = importlib.import_module('app')
+
+    monkeypatch.setattr(Config, 'CSV_DIR', str(tmp_path / 'CSV'))
+    monkeypatch.setattr(app_module, 'course_service', FakeCourseService())
+    monkeypatch.setattr(app_module, 'course_status_service', CourseStatusService())
+    monkeypatch.setitem(app_module.app.config, 'WTF_CSRF_ENABLED', False)
+    client = app_module.app.test_client()
+    with client.session_transaction() as session:
+        session['logged_in'] = True
+        session['admin_username'] = 'admin'
+    return client
+
+
+def test_unknown_and_invalid_ids_are_rejected(client):
+    response = client.post('/course_status/bulk', data={'course_ids': '1, 2, 99, abc', 'action': 'mark_inserted'})
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'updated': [{'id': 1, 'is_inserted': True}, {'id': 2, 'is_inserted': True}],
+        'rejected': ['99', 'abc'],
+    }
+
+
+def test_one_action_per_id(client):
+    client.post('/course_status/bulk', data={'course_ids': '1,2', 'action': 'mark_inserted'})
+
+    response = client.post('/course_status/bulk', data={'course_ids': '1,2,3', 'action': 'unmark_inserted,mark_inserted,mark_inserted'})
+
+    assert response.get_json() == {
+        'updated': [{'id': 1, 'is_inserted': False}, {'id': 3, 'is_inserted': True}],
+        'rejected': [],
+    }
+
+
+def test_invalid_action_is_refused(client):
+    response = client.post('/course_status/bulk', data={'course_ids': '1', 'action': 'delete'})
+
+    assert response.status_code == 400
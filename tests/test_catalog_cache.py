@@ -0,0 +1,99 @@
+# test_catalog_cache.py
+# Testes do cache do catálogo (scripts/catalog_cache.py)
+
+import csv
+import os
+import time
+import scripts.sort_index as sort_index
+from scripts.catalog_cache import CatalogCache, RACY_WINDOW_NS
+
+
+def write_course(directory, course_id, titulo):
+    """Grava o CSV de um curso em um shard do diretório"""
+    shard = os.path.join(directory, f"{course_id // 1000:04d}")
+    os.makedirs(shard, exist_ok=True)
+    path = os.path.join(shard, f"20250101_{course_id}_{titulo}.csv")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['id', 'titulo', 'created_at_iso'])
+        writer.writeheader()
+        writer.writerow({'id': course_id, 'titulo': titulo, 'created_at_iso': f"2025-01-01T00:00:{course_id % 60:02d}"})
+    return path
+
+
+def age_directories(directory):
+    """Recua o mtime dos diretórios para fora da janela de mtime recente"""
+    past = time.time_ns() - 10 * RACY_WINDOW_NS
+    for path, _, _ in os.walk(directory):
+        os.utime(path, ns=(past, past))
+
+
+def test_unchanged_directories_are_not_listed_again(tmp_path, monkeypatch):
+    for course_id in range(1, 2501):
+        write_course(str(tmp_path), course_id, f"Curso{course_id}")
+    age_directories(str(tmp_path))
+    cache = CatalogCache(str(tmp_path))
+    assert len(cache.get_snapshot()) == 2500
+
+    stats = []
+    original = CatalogCache._add_fingerprint
+    monkeypatch.setattr(CatalogCache, '_add_fingerprint',
+                        staticmethod(lambda fingerprints, entry: (stats.append(entry.path), original(fingerprints, entry))))
+    generation = cache.generation
+    for _ in range(4):
+        cache.get_snapshot()
+    assert stats == []
+    assert cache.generation == generation
+
+
+def test_new_file_is_seen_by_listing_only_its_shard(tmp_path, monkeypatch):
+    for course_id in range(1, 2501):
+        write_course(str(tmp_path), course_id, f"Curso{course_id}")
+    age_directories(str(tmp_path))
+    cache = CatalogCache(str(tmp_path))
+    cache.get_snapshot()
+
+    stats = []
+    original = CatalogCache._add_fingerprint
+    monkeypatch.setattr(CatalogCache, '_add_fingerprint',
+                        staticmethod(lambda fingerprints, entry: (stats.append(entry.path), original(fingerprints, entry))))
+    write_course(str(tmp_path), 2501, 'Novo')
+    snapshot = cache.get_snapshot()
+
+    assert len(snapshot) == 2501
+    assert any(record['titulo'] == 'Novo' for record in snapshot)
+    assert len(stats) == 502  # apenas o shard 0002 (IDs 2000 a 2501)
+
+
+def test_snapshot_is_persisted_at_most_once_per_interval(tmp_path):
+    csv_dir = tmp_path / 'CSV'
+    write_course(str(csv_dir), 1, 'Primeiro')
+    snapshot_path = str(csv_dir / '.catalog_snapshot.pickle')
+    cache = CatalogCache(str(csv_dir), snapshot_path, persist_interval=3600)
+    cache.get_snapshot()
+    first = os.stat(snapshot_path).st_mtime_ns
+
+    write_course(str(csv_dir), 2, 'Segundo')
+    assert len(cache.get_snapshot()) == 2
+    assert os.stat(snapshot_path).st_mtime_ns == first
+
+    # Um novo processo parte do snapshot gravado e relê apenas o que mudou
+    restarted = CatalogCache(str(csv_dir), snapshot_path)
+    assert {record['titulo'] for record in restarted.get_snapshot()} == {'Primeiro', 'Segundo'}
+
+
+def test_new_generation_does_not_sort_the_catalog_again(tmp_path, monkeypatch):
+    for course_id in range(1, 51):
+        write_course(str(tmp_path), course_id, f"Curso{course_id}")
+    cache = CatalogCache(str(tmp_path))
+    cache.get_snapshot()
+
+    calls = []
+    original = sort_index.sort_key
+    monkeypatch.setattr(sort_index, 'sort_key', lambda record, field: (calls.append(record['id']), original(record, field))[1])
+    write_course(str(tmp_path), 51, 'Novo')
+    snapshot = cache.get_snapshot()
+
+    # Mais recente primeiro, com a chave calculada apenas para o curso novo
+    assert [record['id'] for record in snapshot[:3]] == ['51', '50', '49']
+    assert len(snapshot) == 51
+    assert calls == ['51']
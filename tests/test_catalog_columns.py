@@ -0,0 +1,33 @@
+# test_catalog_columns.py
+# Valores distintos do catálogo em colunas (scripts/catalog_columns.py)
+
+from scripts.catalog_columns import CatalogColumns
+from scripts.catalog_encoding import encode_record
+
+
+def make_course(course_id, orgao, bairros):
+    return encode_record({
+        'id': str(course_id),
+        'titulo': f"Curso {course_id}",
+        'orgao': orgao,
+        'bairro_unidade': bairros,
+        'source_file': f"20250101_{course_id}_Curso.csv",
+    })
+
+
+def test_values_follow_added_and_removed_courses():
+    first = make_course(1, 'SME', 'Centro| Lapa')
+    second = make_course(2, 'SMS', 'Lapa')
+    columns = CatalogColumns()
+    columns.rebuild([first, second])
+
+    assert columns.values('orgao') == ['SME', 'SMS']
+    assert columns.values('bairro') == ['Centro', 'Lapa']
+
+    # Editar o segundo curso troca o órgão; excluir o primeiro some com o Centro
+    edited = make_course(2, 'SMC', 'Lapa')
+    columns.apply_changes([first, second], [edited])
+
+    assert columns.values('orgao') == ['SMC']
+    assert columns.values('bairro') == ['Lapa']
+    assert columns.values('tema') == []
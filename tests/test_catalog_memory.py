@@ -0,0 +1,19 @@
+# test_catalog_memory.py
+# Memória do catálogo codificado (scripts/catalog_encoding.py), medida com tracemalloc
+
+from types import MappingProxyType
+from scripts.catalog_encoding import encode_record, measure_catalog
+
+CATALOG_SIZE = 5000
+
+# Fração máxima da memória do catálogo em dicionários ocupada pelo catálogo codificado
+MAX_ENCODED_RATIO = 0.6
+
+
+def test_encoded_catalog_uses_at_most_60_percent_of_plain_snapshot():
+    plain, plain_bytes = measure_catalog(lambda row: MappingProxyType(row), CATALOG_SIZE)
+    encoded, encoded_bytes = measure_catalog(encode_record, CATALOG_SIZE)
+
+    assert [dict(record) for record in encoded] == [dict(record) for record in plain]
+    assert encoded_bytes <= MAX_ENCODED_RATIO * plain_bytes, (
+        f"catálogo codificado: {encoded_bytes} bytes, em dicionários: {plain_bytes} bytes")
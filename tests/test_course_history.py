@@ -0,0 +1,54 @@
+# test_course_history.py
+# Histórico de versões dos cursos (scripts/course_history.py)
+
+import json
+import pytest
+from scripts.course_history import CourseHistory
+
+
+@pytest.fixture
+def history(tmp_path):
+    return CourseHistory(str(tmp_path), snapshot_interval=3)
+
+
+def stored_entries(history, course_id):
+    with open(history._path(course_id), encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_versions_are_stored_as_deltas_between_snapshots(history):
+    course = {'id': '7', 'titulo': 'Oficina', 'orgao': 'SME', 'descricao': 'Texto longo'}
+    assert history.record(7, course, 'create') == 1
+    for version in range(2, 6):
+        course = dict(course, titulo=f"Oficina v{version}")
+        assert history.record(7, course) == version
+
+    entries = stored_entries(history, 7)
+    # Snapshot na primeira versão e a cada snapshot_interval; deltas só com o título
+    assert ['snapshot' in entry for entry in entries] == [True, False, False, True, False]
+    assert entries[1]['changes'] == {'titulo': 'Oficina v2'}
+
+    assert history.get_version(7)['titulo'] == 'Oficina v5'
+    assert history.get_version(7, 3) == {'id': '7', 'titulo': 'Oficina v3', 'orgao': 'SME', 'descricao': 'Texto longo'}
+    assert history.get_version(7, 9) is None
+
+
+def test_unchanged_saves_are_not_recorded(history):
+    course = {'id': '7', 'titulo': 'Oficina', 'source_file': '20250101_7_Oficina.csv'}
+    history.record(7, course, 'create')
+
+    # source_file é derivado pelos leitores do catálogo e não conta como alteração
+    assert history.record(7, dict(course, source_file='20250102_7_Oficina.csv')) is None
+    assert len(history.versions(7)) == 1
+
+
+def test_removed_fields_deletes_and_diffs(history):
+    history.record(7, {'id': '7', 'titulo': 'Oficina', 'tema': 'Cultura'}, 'create')
+    history.record(7, {'id': '7', 'titulo': 'Oficina'})
+    history.record(7, None, 'delete')
+
+    assert history.get_version(7) is None
+    assert history.get_version(7, 2) == {'id': '7', 'titulo': 'Oficina'}
+    assert history.diff(7, 1, 2) == {'tema': ('Cultura', None)}
+    assert [version['action'] for version in history.versions(7)] == ['create', 'update', 'delete']
+    assert history.versions(7)[1]['changes'] == {'tema': ('Cultura', None)}
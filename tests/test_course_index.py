@@ -0,0 +1,60 @@
+# test_course_index.py
+# Testes do índice persistente ID -> manifesto (scripts/course_index.py)
+
+import multiprocessing
+import os
+import pytest
+import scripts.course_index as course_index
+import scripts.csv_reader as csv_reader
+from scripts.storage_layout import ARTIFACT_DIRS
+
+
+@pytest.fixture
+def index_file(tmp_path, monkeypatch):
+    path = str(tmp_path / 'course_index.json')
+    monkeypatch.setattr(course_index, 'INDEX_FILE', path)
+    monkeypatch.setattr(course_index, 'LOCK_FILE', f"{path}.lock")
+    monkeypatch.setattr(course_index, '_index', None)
+    return path
+
+
+def register_many(first_id, count):
+    for course_id in range(first_id, first_id + count):
+        course_index.register_course_artifacts(course_id, content={'csv': 'hash'}, csv=f"20250101_{course_id}_Curso.csv")
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='requer fork')
+def test_concurrent_workers_do_not_lose_updates(index_file):
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=register_many, args=(worker * 100 + 1, 25)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    for worker in range(4):
+        for course_id in range(worker * 100 + 1, worker * 100 + 26):
+            manifest = course_index.get_course_manifest(course_id)
+            assert manifest['csv'] == f"20250101_{course_id}_Curso.csv"
+            assert manifest['content'] == {'csv': 'hash'}
+
+
+def test_unknown_id_does_not_rewrite_the_index(tmp_path, index_file, monkeypatch):
+    csv_dir = tmp_path / 'CSV'
+    shard = csv_dir / '0000'
+    shard.mkdir(parents=True)
+    (shard / '20250101_1_Curso.csv').write_text('id,titulo\n1,Curso\n', encoding='utf-8')
+    monkeypatch.setitem(ARTIFACT_DIRS, 'csv', str(csv_dir))
+    monkeypatch.setattr(csv_reader, 'SNAPSHOT_FILE', None)
+    monkeypatch.setattr(csv_reader, '_indexed_generation', None)
+
+    # Arquivo copiado para a pasta por fora da aplicação: o índice é reconstruído uma vez
+    assert csv_reader.get_course_by_id(1)['titulo'] == 'Curso'
+    written = os.stat(index_file).st_mtime_ns
+
+    rebuilds = []
+    monkeypatch.setattr(csv_reader, 'rebuild_index', lambda courses: rebuilds.append(courses))
+    for _ in range(3):
+        assert csv_reader.get_course_by_id(999) is None
+    assert rebuilds == []
+    assert os.stat(index_file).st_mtime_ns == written
@@ -0,0 +1,52 @@
+# test_course_journal.py
+# Diário JSONL de cursos (scripts/course_journal.py)
+
+from scripts.course_journal import CourseJournal
+
+
+def write_history(journal):
+    """Grava versões, atualizações e exclusões, deixando linhas mortas no início do arquivo"""
+    for course_id in range(1, 11):
+        journal.append({'id': course_id, 'titulo': f"Curso {course_id}", 'created_at_iso': f"2026-10-17T10:00:{course_id:02d}"})
+    for version in range(2, 5):
+        journal.append({'id': 3, 'titulo': f"Curso 3 v{version}", 'created_at_iso': '2026-10-17T10:00:03'})
+    journal.delete(5)
+
+
+def test_journal_is_replayed_after_compaction(tmp_path):
+    path = str(tmp_path / 'courses.jsonl')
+    journal = CourseJournal(path, compact_min_records=1000)
+    write_history(journal)
+
+    assert journal.compact(force=True)
+    journal.append({'id': 11, 'titulo': 'Curso 11', 'created_at_iso': '2026-10-17T10:00:11'})
+
+    for reader in (journal, CourseJournal(path)):
+        assert reader.read(3)['titulo'] == 'Curso 3 v4'
+        assert reader.read(5) is None
+        assert reader.read(11)['titulo'] == 'Curso 11'
+        assert [record['id'] for record in reader.get_snapshot()] == [11, 10, 9, 8, 7, 6, 4, 3, 2, 1]
+    assert journal.dead_ratio() == 0
+
+
+def test_read_retries_when_the_file_is_replaced_after_catching_up(tmp_path, monkeypatch):
+    path = str(tmp_path / 'courses.jsonl')
+    writer = CourseJournal(path, compact_min_records=1000)
+    write_history(writer)
+    reader = CourseJournal(path)
+    assert reader.read(9)['titulo'] == 'Curso 9'
+
+    # Outro processo compacta o arquivo logo depois da sincronização do leitor
+    original = reader._catch_up
+    calls = []
+
+    def catch_up_then_compact():
+        original()
+        if not calls:
+            writer.compact(force=True)
+        calls.append(True)
+
+    monkeypatch.setattr(reader, '_catch_up', catch_up_then_compact)
+
+    assert reader.read(9)['titulo'] == 'Curso 9'
+    assert len(calls) == 2
@@ -0,0 +1,104 @@
+# test_course_model.py
+# Conversão entre o registro CSV e os modelos tipados (Course e Unit)
+
+from datetime import date
+import pytest
+from models.course import Course, parse_units, parse_vagas
+
+
+def make_row(**overrides):
+    row = {
+        'id': '7',
+        'titulo': 'Oficina de Python',
+        'inicio_inscricoes': '01/10/2026',
+        'fim_inscricoes': '2026/10/20',
+        'modalidade': 'Presencial',
+        'endereco_unidade': 'Rua A, 10',
+        'bairro_unidade': 'Centro',
+        'vagas_unidade': '1.000',
+        'inicio_aulas_data': '2026-11-01',
+        'fim_aulas_data': '2026-12-01',
+        'horario_inicio': '10:00',
+        'horario_fim': '12:00',
+        'dias_aula': 'Segunda-feira|Quarta-feira|Sexta-feira',
+        'carga_horaria': '20',
+        'created_at': '17-10-2026 10:00:00',
+    }
+    row.update(overrides)
+    return row
+
+
+def test_dias_aula_belongs_to_the_course_not_to_the_units():
+    course = Course.from_row(make_row())
+
+    assert len(course.units) == 1
+    assert course.dias_aula == 'Segunda-feira|Quarta-feira|Sexta-feira'
+    assert course.units[0].endereco == 'Rua A, 10'
+
+
+def test_unit_count_comes_from_the_addresses():
+    row = make_row(endereco_unidade='Rua A|Rua B', bairro_unidade='Centro', horario_inicio='10:00|14:00|18:00')
+
+    units = parse_units(row)
+
+    assert [unit.endereco for unit in units] == ['Rua A', 'Rua B']
+    assert [unit.bairro for unit in units] == ['Centro', '']
+
+
+def test_units_without_addresses_use_the_longest_column():
+    row = make_row(modalidade='Online', endereco_unidade='', bairro_unidade='', vagas_unidade='40')
+
+    units = parse_units(row)
+
+    assert len(units) == 1
+    assert units[0].vagas == 40
+
+
+def test_untouched_record_round_trips_verbatim():
+    row = make_row()
+
+    written = Course.from_row(row).to_row()
+
+    # Apenas a coluna ISO de created_at é acrescentada; o resto volta como estava
+    assert written.pop('created_at_iso') == '2026-10-17T10:00:00'
+    assert written == row
+    assert list(written) == list(row)
+
+
+def test_changed_fields_are_written_in_the_canonical_format():
+    course = Course.from_row(make_row())
+    course.units[0].vagas = 30
+    course.fim_inscricoes = date(2026, 10, 31)
+
+    written = course.to_row()
+
+    assert written['vagas_unidade'] == '30'
+    assert written['fim_inscricoes'] == '2026/10/31'
+    # Campos não alterados mantêm o formato antigo
+    assert written['inicio_inscricoes'] == '01/10/2026'
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('40', 40),
+    (' 40 ', 40),
+    ('1.000', 1000),
+    ('12,500', 12500),
+    ('1.234.567', 1234567),
+    ('1,5', '1,5'),
+    ('2.5', '2.5'),
+    ('1.00', '1.00'),
+    ('ilimitadas', 'ilimitadas'),
+    ('', None),
+])
+def test_parse_vagas_accepts_only_thousands_separators(text, expected):
+    assert parse_vagas(text) == expected
+
+
+def test_decimal_looking_vagas_are_not_rewritten():
+    row = make_row(vagas_unidade='1,5')
+
+    course = Course.from_row(row)
+
+    assert course.units[0].vagas == '1,5'
+    assert course.total_vagas == 0
+    assert course.to_row()['vagas_unidade'] == '1,5'
@@ -0,0 +1,102 @@
+# test_course_pagination.py
+# Paginação com filtros do CourseRepository sem percorrer o catálogo inteiro
+
+from datetime import date
+import pytest
+import scripts.sort_index as sort_index_module
+from repositories.course_repository import CourseRepository
+from scripts.catalog_encoding import encode_record
+
+CATALOG_SIZE = 3000
+
+
+class InMemoryCourseRepository(CourseRepository):
+    """Repositório sobre uma lista de registros em memória (sem arquivos)"""
+    
+    def __init__(self, courses):
+        self._snapshot = tuple(encode_record(course) for course in courses)
+        self._indexes = {}
+    
+    def _catalog_snapshot(self) -> tuple:
+        return self._snapshot
+    
+    def _catalog_index(self, name: str, factory):
+        index = self._indexes.get(name)
+        if index is None:
+            index = factory()
+            index.rebuild(self._snapshot)
+            self._indexes[name] = index
+        return index
+
+
+def make_course(course_id):
+    # Um curso a cada dez tem as inscrições encerradas em 2020; os demais, em 2099
+    end_year = 2020 if course_id % 10 == 0 else 2099
+    return {
+        'id': str(course_id),
+        'titulo': f"Curso {course_id:05d}",
+        'orgao': 'SME' if course_id % 2 else 'SMS',
+        'modalidade': 'Online',
+        'tema': 'Tecnologia',
+        'source_file': f"20250101_{course_id}_Curso.csv",
+        'created_at_iso': f"2025-01-01T{course_id // 3600:02d}:{course_id // 60 % 60:02d}:{course_id % 60:02d}",
+        'inicio_inscricoes': '01/01/2020',
+        'fim_inscricoes': f"31/12/{end_year}",
+    }
+
+
+@pytest.fixture
+def repository():
+    repository = InMemoryCourseRepository(make_course(course_id) for course_id in range(1, CATALOG_SIZE + 1))
+    # Construir os índices antes de medir
+    repository.find_page(filters={'orgao': 'SME', 'exclude_closed_before': date(2025, 1, 1)})
+    return repository
+
+
+@pytest.fixture
+def sort_key_calls(monkeypatch):
+    calls = []
+    original = sort_index_module.sort_key
+    monkeypatch.setattr(sort_index_module, 'sort_key', lambda record, field: (calls.append(record), original(record, field))[1])
+    return calls
+
+
+def expected_ids(predicate):
+    return [str(course_id) for course_id in range(CATALOG_SIZE, 0, -1) if predicate(course_id)]
+
+
+def test_default_public_filter_does_not_sort_the_catalog(repository, sort_key_calls):
+    result = repository.find_page(offset=40, limit=20, filters={'exclude_closed_before': date(2025, 1, 1)})
+    
+    open_ids = expected_ids(lambda course_id: course_id % 10 != 0)
+    assert [course['id'] for course in result['courses']] == open_ids[40:60]
+    assert result['total'] == len(open_ids)
+    assert result['has_next']
+    assert sort_key_calls == []
+
+
+def test_field_filter_page_touches_only_the_page(repository, sort_key_calls):
+    result = repository.find_page(limit=20, filters={'orgao': 'SME', 'exclude_closed_before': date(2025, 1, 1)})
+    
+    matching = expected_ids(lambda course_id: course_id % 2 and course_id % 10 != 0)
+    assert [course['id'] for course in result['courses']] == matching[:20]
+    assert result['total'] == len(matching)
+    assert sort_key_calls == []
+
+
+def test_small_result_sorts_only_the_matches(repository, sort_key_calls):
+    result = repository.find_page(limit=20, sort='titulo', filters={'ids': {'7', '3', '12'}})
+    
+    assert [course['id'] for course in result['courses']] == ['3', '7', '12']
+    assert result['total'] == 3
+    assert len(sort_key_calls) <= 3
+
+
+def test_cursor_continues_filtered_page(repository):
+    filters = {'orgao': 'SMS', 'exclude_closed_before': date(2025, 1, 1)}
+    first = repository.find_page(limit=20, filters=filters)
+    second = repository.find_page(limit=20, filters=filters, cursor=first['next_cursor'])
+    by_offset = repository.find_page(offset=20, limit=20, filters=filters)
+    
+    assert second['courses'] == by_offset['courses']
+    assert second['offset'] == 20
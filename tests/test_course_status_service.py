@@ -0,0 +1,81 @@
+# test_course_status_service.py
+# Status de inserção dos cursos (services/course_status_service.py)
+
+import json
+import multiprocessing
+import pytest
+import services.course_status_service as course_status_service
+from config import Config
+from services.course_status_service import CourseStatusService
+
+
+@pytest.fixture(autouse=True)
+def status_dir(tmp_path, monkeypatch):
+    # Os arquivos de status ficam no diretório pai de Config.CSV_DIR
+    monkeypatch.setattr(Config, 'CSV_DIR', str(tmp_path / 'CSV'))
+    return tmp_path
+
+
+def mark_many(first_id, count):
+    service = CourseStatusService()
+    for course_id in range(first_id, first_id + count):
+        service.mark_course_as_inserted(course_id)
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='requer fork')
+def test_concurrent_workers_do_not_lose_updates():
+    context = multiprocessing.get_context('fork')
+    workers = [context.Process(target=mark_many, args=(worker * 100 + 1, 20)) for worker in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    expected = {worker * 100 + offset for worker in range(4) for offset in range(1, 21)}
+    assert CourseStatusService().get_inserted_courses() == expected
+
+
+def test_changes_from_another_instance_are_seen():
+    first = CourseStatusService()
+    second = CourseStatusService()
+    assert second.get_inserted_courses() == set()
+
+    first.mark_course_as_inserted(7)
+    assert second.is_course_inserted(7)
+
+    assert second.toggle_course_status(7) is False
+    assert first.get_inserted_courses() == set()
+
+
+def test_status_is_replayed_from_the_snapshot_log_offset(status_dir, monkeypatch):
+    monkeypatch.setattr(Config, 'STATUS_SNAPSHOT_INTERVAL', 3)
+    service = CourseStatusService()
+    for course_id in (1, 2, 3):
+        service.mark_course_as_inserted(course_id, 'admin')
+    service.mark_course_as_inserted(4, 'admin')
+    service.unmark_course_as_inserted(1, 'admin')
+
+    # O snapshot parou no terceiro evento; os dois seguintes só estão no log
+    snapshot = json.loads((status_dir / 'course_status.json').read_text(encoding='utf-8'))
+    log = (status_dir / 'course_status.log').read_bytes()
+    assert snapshot['status'] == {'1': True, '2': True, '3': True}
+    assert snapshot['log_offset'] == len(b''.join(log.splitlines(keepends=True)[:3]))
+
+    restarted = CourseStatusService()
+    assert restarted.get_inserted_courses() == {2, 3, 4}
+
+
+def test_status_events_are_read_from_the_end_of_the_log(monkeypatch):
+    monkeypatch.setattr(course_status_service, 'EVENT_BLOCK_SIZE', 16)
+    service = CourseStatusService()
+    for course_id in range(1, 21):
+        service.toggle_course_status(course_id % 4, 'admin')
+    with open(service.log_file, 'ab') as f:
+        f.write(b'{"id": 99, "inserted"')  # linha ainda sendo gravada
+
+    events = service.get_status_events(limit=3)
+    assert [(event['id'], event['inserted']) for event in events] == [(0, True), (3, True), (2, True)]
+
+    events = service.get_status_events(course_id=1)
+    assert [event['inserted'] for event in events] == [True, False, True, False, True]
+    assert len(service.get_status_events()) == 20
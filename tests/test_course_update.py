@@ -0,0 +1,86 @@
+# test_course_update.py
+# Atualização de cursos sem alterações de conteúdo (CourseRepository.update_course)
+
+import pytest
+import repositories.course_repository as course_repository
+from repositories.course_repository import CourseRepository
+from scripts.content_hash import record_content_hash
+from scripts.pdf_cache import pdf_content_hash
+from scripts.pdf_jobs import PENDING, READY, FAILED, MISSING
+
+COURSE = {
+    'id': '7',
+    'titulo': 'Oficina de Python',
+    'orgao': 'SME',
+    'modalidade': 'Online',
+    'created_at': '17-10-2026 10:00:00',
+    'created_at_iso': '2026-10-17T10:00:00',
+    'source_file': '20261017_7_Oficina_de_Python.csv',
+}
+
+
+class FakeCourseRepository(CourseRepository):
+    """Repositório com um único curso e a fila de PDFs simulada"""
+
+    def __init__(self, status):
+        self.status = status
+        self.scheduled = []
+        self.artifacts = []
+
+    def find_by_id(self, course_id):
+        return dict(COURSE)
+
+    def _course_manifest(self, course_id):
+        return {
+            'csv': COURSE['source_file'],
+            'pdf': '20261017_7_Oficina_de_Python.pdf',
+            'content': {'csv': record_content_hash(COURSE), 'pdf': pdf_content_hash(COURSE)},
+        }
+
+    def pdf_status(self, course):
+        return self.status
+
+    def _schedule_pdf(self, course_data):
+        self.scheduled.append(course_data['pdf_file'])
+        return PENDING
+
+    def _update_artifacts(self, course_id, content=None, **artifacts):
+        self.artifacts.append((course_id, content, artifacts))
+
+    def _store_course(self, course_data):
+        raise AssertionError('uma atualização sem alterações não grava o curso')
+
+
+@pytest.fixture(autouse=True)
+def existing_csv(tmp_path, monkeypatch):
+    path = tmp_path / COURSE['source_file']
+    path.write_text('id\n7\n', encoding='utf-8')
+    monkeypatch.setattr(course_repository, 'locate_artifact', lambda kind, filename: str(tmp_path / filename))
+
+
+def unchanged_form():
+    return {key: value for key, value in COURSE.items() if key not in ('id', 'source_file')}
+
+
+@pytest.mark.parametrize('status', [READY, PENDING])
+def test_unchanged_course_keeps_files_and_pending_job(status):
+    repository = FakeCourseRepository(status)
+
+    course = repository.update_course(7, unchanged_form())
+
+    assert repository.scheduled == []
+    assert repository.artifacts == []
+    assert course['pdf_status'] == status
+    assert course['csv_file'] == COURSE['source_file']
+    assert course['pdf_file'] == '20261017_7_Oficina_de_Python.pdf'
+
+
+@pytest.mark.parametrize('status', [FAILED, MISSING])
+def test_unchanged_course_reschedules_failed_or_missing_pdf(status):
+    repository = FakeCourseRepository(status)
+
+    course = repository.update_course(7, unchanged_form())
+
+    assert repository.scheduled == ['20261017_7_Oficina_de_Python.pdf']
+    assert course['pdf_status'] == PENDING
+    assert course['csv_file'] == COURSE['source_file']
@@ -0,0 +1,64 @@
+# test_id_manager.py
+# Alocação de IDs (scripts/id_manager.py)
+
+import multiprocessing
+import threading
+import pytest
+import scripts.id_manager as id_manager
+
+
+@pytest.fixture(autouse=True)
+def id_file(tmp_path, monkeypatch):
+    path = str(tmp_path / 'last_id.json')
+    monkeypatch.setattr(id_manager, 'ID_FILE', path)
+    monkeypatch.setattr(id_manager, 'LOCK_FILE', f"{path}.lock")
+    return path
+
+
+def allocate(count, results):
+    for _ in range(count):
+        results.put(id_manager.get_next_id())
+
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='requer fork')
+def test_concurrent_workers_never_receive_the_same_id():
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    workers = [context.Process(target=allocate, args=(25, results)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    ids = [results.get(timeout=30) for _ in range(100)]
+    for worker in workers:
+        worker.join()
+
+    assert sorted(ids) == list(range(1, 101))
+    assert id_manager.get_current_id() == 100
+
+
+def test_concurrent_threads_never_receive_the_same_id():
+    ids = []
+    lock = threading.Lock()
+
+    def allocate_in_thread():
+        for _ in range(50):
+            course_id = id_manager.get_next_id()
+            with lock:
+                ids.append(course_id)
+
+    threads = [threading.Thread(target=allocate_in_thread) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(ids) == list(range(1, 201))
+
+
+def test_reconcile_moves_the_counter_past_existing_ids(monkeypatch):
+    monkeypatch.setattr(id_manager, 'get_existing_ids', lambda: {3, 42, 7})
+    assert id_manager.reconcile_last_id() == 42
+    assert id_manager.get_next_id() == 43
+
+    # Um contador à frente dos cursos existentes não volta atrás
+    monkeypatch.setattr(id_manager, 'get_existing_ids', lambda: {10})
+    assert id_manager.reconcile_last_id() == 43
@@ -0,0 +1,104 @@
+# test_mysql_repository.py
+# Pool de conexões do repositório MySQL (repositories/mysql_course_repository.py),
+# com um conector simulado: nenhum servidor MySQL é necessário
+
+import pytest
+import repositories.mysql_course_repository as mysql_repository
+import scripts.id_manager as id_manager
+from config import Config
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self._result = None
+
+    def execute(self, sql, params=()):
+        self.connection.pool.statements.append(' '.join(sql.split()))
+        if 'falha' in sql:
+            raise RuntimeError('erro simulado')
+        if 'LAST_INSERT_ID()' in sql:
+            self._result = (42,)
+        elif 'MAX(id)' in sql:
+            self._result = (0,)
+
+    def fetchone(self):
+        return self._result
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, pool):
+        self.pool = pool
+
+    def cursor(self, prepared=False):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.pool.events.append('commit')
+
+    def rollback(self):
+        self.pool.events.append('rollback')
+
+    def close(self):
+        self.pool.events.append('close')
+
+
+class FakePool:
+    def __init__(self, **options):
+        self.options = options
+        self.statements = []
+        self.events = []
+
+    def get_connection(self):
+        self.events.append('get')
+        return FakeConnection(self)
+
+
+class FakePooling:
+    MySQLConnectionPool = FakePool
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(id_manager, 'ID_FILE', str(tmp_path / 'last_id.json'))
+    monkeypatch.setattr(id_manager, 'LOCK_FILE', str(tmp_path / 'last_id.json.lock'), raising=False)
+    monkeypatch.setattr(mysql_repository, 'pooling', FakePooling)
+    monkeypatch.setattr(Config, 'MYSQL_POOL_TIMEOUT', 0.05)
+    repository = mysql_repository.MySQLCourseRepository(pool_size=2)
+    repository._pool.events.clear()
+    return repository
+
+
+def test_ids_come_from_the_database_sequence(repository):
+    assert repository._next_id() == 42
+    assert any('LAST_INSERT_ID(value + 1)' in sql for sql in repository._pool.statements)
+    # A conexão é devolvida ao pool depois da gravação
+    assert repository._pool.events == ['get', 'commit', 'close']
+
+
+def test_reads_end_their_snapshot_and_failures_roll_back(repository):
+    with repository._cursor() as cursor:
+        cursor.execute('SELECT 1')
+    with pytest.raises(RuntimeError):
+        with repository._cursor(write=True) as cursor:
+            cursor.execute('SELECT falha')
+
+    assert repository._pool.events == ['get', 'rollback', 'close', 'get', 'rollback', 'close']
+
+
+def test_exhausted_pool_times_out_instead_of_failing_immediately(repository):
+    with repository._cursor(), repository._cursor():
+        with pytest.raises(TimeoutError):
+            with repository._cursor():
+                pass
+
+    # As conexões liberadas voltam a ficar disponíveis
+    with repository._cursor() as cursor:
+        cursor.execute('SELECT 1')
@@ -0,0 +1,59 @@
+# test_pdf_cache.py
+# PDFs gerados sob demanda e guardados pelo conteúdo exibido (scripts/pdf_cache.py)
+
+import os
+import pytest
+import scripts.pdf_cache as pdf_cache
+from scripts.pdf_cache import PDFCache, get_pdf_cache, pdf_content_hash
+
+
+@pytest.fixture
+def generated(monkeypatch):
+    # O gerador real é substituído; a lista registra cada geração
+    generated = []
+
+    def fake_generate_pdf(course_data, filename):
+        generated.append(course_data['titulo'])
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(course_data['titulo'])
+        return filename
+
+    monkeypatch.setattr(pdf_cache, 'generate_pdf', fake_generate_pdf)
+    return generated
+
+
+def test_pdfs_are_generated_once_per_displayed_content(tmp_path, generated):
+    cache = PDFCache(str(tmp_path / 'cache'))
+    course = {'id': '7', 'titulo': 'Oficina', 'status': 'ativo', 'updated_at': '01-01-2025 09:00:00'}
+
+    path = cache.get(course)
+    assert path == cache.path_for(course)
+    assert os.path.basename(path) == f"{pdf_content_hash(course)}.pdf"
+    assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+
+    # Campos que não aparecem no PDF não invalidam o cache
+    assert cache.get(dict(course, status='inativo', updated_at='02-01-2025 09:00:00')) == path
+    assert generated == ['Oficina']
+
+    edited = cache.get(dict(course, titulo='Oficina de Python'))
+    assert edited != path
+    assert generated == ['Oficina', 'Oficina de Python']
+
+
+def test_generation_failures_leave_no_partial_file(tmp_path, monkeypatch):
+    def failing_generate_pdf(course_data, filename):
+        raise RuntimeError('erro simulado')
+
+    monkeypatch.setattr(pdf_cache, 'generate_pdf', failing_generate_pdf)
+    cache = PDFCache(str(tmp_path / 'cache'))
+    course = {'id': '7', 'titulo': 'Oficina'}
+
+    with pytest.raises(RuntimeError):
+        cache.get(course)
+    assert os.listdir(os.path.dirname(cache.path_for(course))) == []
+
+
+def test_one_cache_per_directory(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    assert get_pdf_cache(cache_dir) is get_pdf_cache(os.path.join(cache_dir, '.'))
+    assert get_pdf_cache(cache_dir) is not get_pdf_cache(str(tmp_path / 'outro'))
@@ -0,0 +1,72 @@
+# test_pdf_jobs.py
+# Fila de geração de PDFs em segundo plano (scripts/pdf_jobs.py)
+
+import os
+import pytest
+import scripts.pdf_jobs as pdf_jobs
+import scripts.storage_layout as storage_layout
+from scripts.pdf_jobs import PDFJobQueue, PENDING, READY, FAILED, MISSING
+
+
+@pytest.fixture(autouse=True)
+def pdf_dir(tmp_path, monkeypatch):
+    # PDFs e marcadores fora do projeto; o gerador real é substituído
+    pdf_dir = str(tmp_path / 'PDF')
+    monkeypatch.setitem(storage_layout.ARTIFACT_DIRS, 'pdf', pdf_dir)
+    monkeypatch.setattr(pdf_jobs, '_LOCK_FILE', os.path.join(pdf_dir, '.jobs.lock'))
+    monkeypatch.setattr(pdf_jobs, 'generate_pdf', fake_generate_pdf)
+    return pdf_dir
+
+
+def fake_generate_pdf(course_data, filename):
+    if course_data.get('falha'):
+        raise RuntimeError('erro simulado')
+    path = storage_layout.writable_path('pdf', filename)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(course_data['titulo'])
+    return path
+
+
+def read_pdf(filename):
+    with open(storage_layout.locate_artifact('pdf', filename), encoding='utf-8') as f:
+        return f.read()
+
+
+def test_synchronous_queue_publishes_and_notifies():
+    queue = PDFJobQueue(max_workers=0)
+    published = []
+
+    assert queue.status('1_Oficina.pdf') == MISSING
+    assert queue.submit({'titulo': 'Oficina'}, '1_Oficina.pdf', lambda: published.append(True)) == READY
+    assert published == [True]
+    assert read_pdf('1_Oficina.pdf') == 'Oficina'
+    # Nenhum marcador ou temporário fica para trás
+    shard = os.path.dirname(storage_layout.artifact_path('pdf', '1_Oficina.pdf'))
+    assert os.listdir(shard) == ['1_Oficina.pdf']
+
+
+def test_failures_are_reported_and_stale_jobs_expire():
+    queue = PDFJobQueue(max_workers=0, timeout=300)
+    assert queue.submit({'titulo': 'Oficina', 'falha': True}, '1_Oficina.pdf') == FAILED
+
+    # Um trabalho pendente além do timeout (processo encerrado) conta como falha
+    pdf_jobs._write_marker('2_Planilhas.pdf', {'status': PENDING, 'token': 'x', 'at': 0})
+    assert queue.status('2_Planilhas.pdf') == FAILED
+    assert queue.wait('2_Planilhas.pdf', timeout=0) == FAILED
+
+
+def test_superseded_jobs_are_not_published():
+    queue = PDFJobQueue(max_workers=0)
+    queue.submit({'titulo': 'Versão 1'}, '1_Oficina.pdf')
+
+    # Um trabalho mais recente troca o token: o resultado antigo é descartado
+    pdf_jobs._write_marker('1_Oficina.pdf', {'status': PENDING, 'token': 'novo', 'at': 9e12})
+    assert pdf_jobs.render_pdf({'titulo': 'Versão 2'}, '1_Oficina.pdf', 'antigo') is False
+    assert read_pdf('1_Oficina.pdf') == 'Versão 1'
+    assert queue.status('1_Oficina.pdf') == PENDING
+
+    # Cancelado (ex.: curso excluído), o trabalho também não publica
+    queue.cancel('1_Oficina.pdf')
+    assert pdf_jobs.render_pdf({'titulo': 'Versão 3'}, '1_Oficina.pdf', 'novo') is False
+    assert read_pdf('1_Oficina.pdf') == 'Versão 1'
+    assert queue.status('1_Oficina.pdf') == READY
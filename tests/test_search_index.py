@@ -0,0 +1,56 @@
+# test_search_index.py
+# Índice invertido da busca textual (scripts/search_index.py)
+
+import pytest
+from scripts.search_index import SearchIndex, fold_text, stem
+
+
+def make_course(course_id, titulo, descricao='', tema=''):
+    return {'id': str(course_id), 'titulo': titulo, 'descricao': descricao, 'tema': tema,
+            'source_file': f"20250101_{course_id}_Curso.csv"}
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.rebuild([
+        make_course(1, 'Introdução à Programação', 'Lógica e algoritmos', 'Tecnologia'),
+        make_course(2, 'Planilhas eletrônicas', 'Fórmulas e programação de macros', 'Tecnologia'),
+        make_course(3, 'Programações culturais do bairro', 'Agenda de eventos', 'Cultura'),
+        make_course(4, 'Python avançado', 'Programação orientada a objetos', 'Tecnologia'),
+    ])
+    return index
+
+
+def ids(records):
+    return [record['id'] for record in records]
+
+
+def test_accents_and_plurals_are_folded():
+    assert fold_text('Programação') == 'programacao'
+    assert stem('programacoes') == 'programacao'
+    assert stem('cursos') == 'curso'
+
+
+def test_terms_are_required_and_the_last_one_is_a_prefix(index):
+    assert set(ids(index.search('programacao'))) == {'1', '2', '3', '4'}
+    assert ids(index.search('programação pyt')) == ['4']
+    assert ids(index.search('python basico')) == []
+    assert index.search('') == []
+
+
+def test_title_matches_rank_first(index):
+    # O título pesa o dobro da descrição, e textos curtos pesam mais que longos
+    ranked = ids(index.search('programacao'))
+    assert set(ranked[:2]) == {'1', '3'}
+    assert set(ranked[2:]) == {'2', '4'}
+
+
+def test_changes_update_the_postings(index):
+    old = index.search('python')[0]
+    edited = make_course(4, 'Ruby avançado', 'Programação orientada a objetos', 'Tecnologia')
+    index.apply_changes([old], [edited])
+
+    assert index.search('python') == []
+    assert ids(index.search('ruby')) == ['4']
+    assert index.matching_keys('avancado') == {'20250101_4_Curso.csv'}
@@ -0,0 +1,53 @@
+# test_sqlite_repository.py
+# Mecanismo de armazenamento SQLite (repositories/sqlite_course_repository.py)
+
+import pytest
+import scripts.id_manager as id_manager
+from repositories.sqlite_course_repository import SQLiteCourseRepository
+
+
+@pytest.fixture
+def repository(tmp_path, monkeypatch):
+    # Diretórios de arquivos e contador de IDs fora do projeto
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(id_manager, 'ID_FILE', str(tmp_path / 'last_id.json'))
+    monkeypatch.setattr(id_manager, 'LOCK_FILE', str(tmp_path / 'last_id.json.lock'), raising=False)
+    return SQLiteCourseRepository(str(tmp_path / 'webciclo.db'))
+
+
+def make_course(course_id, titulo, orgao, created_at):
+    return {
+        'id': str(course_id),
+        'titulo': titulo,
+        'orgao': orgao,
+        'modalidade': 'Online',
+        'tema': 'Tecnologia',
+        'created_at': created_at,
+    }
+
+
+def test_imported_courses_keep_their_ids_and_sort_by_creation(repository):
+    imported = repository.import_courses([
+        make_course(3, 'Oficina de Python', 'SME', '31-12-2024 09:00:00'),
+        make_course(8, 'Planilhas', 'SMS', '01-02-2025 09:00:00'),
+        make_course('x', 'Sem ID', 'SME', '01-01-2025 09:00:00'),
+    ])
+
+    assert imported == 2
+    assert repository.find_by_id(3)['titulo'] == 'Oficina de Python'
+    assert repository.find_by_id(99) is None
+    # O timestamp de exibição (DD-MM-AAAA) ordena pelo valor em ISO
+    assert [course['id'] for course in repository.find_all()] == ['8', '3']
+    # A sequência continua após o maior ID importado
+    assert repository._next_id() == 9
+
+
+def test_queries_use_the_indexed_columns(repository):
+    repository.import_courses([
+        make_course(1, 'Oficina de Python', 'SME', '01-01-2025 09:00:00'),
+        make_course(2, 'Planilhas', 'SMS', '02-01-2025 09:00:00'),
+    ])
+
+    assert [course['id'] for course in repository.get_courses_by_orgao('SMS')] == ['2']
+    assert [course['id'] for course in repository.get_courses_by_modality('Online')] == ['2', '1']
+    assert [course['id'] for course in repository.search_courses('python')] == ['1']